@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""cache_dir — .j2/cache, the one directory for runner-generated state, git-ignored from inside."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+GITIGNORE = "*\n"
+
+
+def cache_dir(root):
+    # Create .j2/cache with a .gitignore of "*" so caches, logs and mirrors never reach a commit,
+    # whatever the project's own .gitignore says. .j2 itself is not created: OSError without it.
+    path = root / ".j2" / "cache"
+    ignore = path / ".gitignore"
+    if not ignore.exists():
+        path.mkdir(exist_ok=True)
+        ignore.write_text(GITIGNORE)
+    return path
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""context_loader — runs placeholder loaders concurrently, each waiting only on its own deps."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+MAX_WORKERS = 8
+
+
+def settle(loader, deps):
+    # Resolve a loader's dependencies and run it; a missing file becomes a placeholder note.
+    try:
+        return loader({name: fut.result() for name, fut in deps.items()})
+    except FileNotFoundError as e:
+        return f"(not yet available: {e.filename})"
+
+
+def run_loaders(loaders, resources):
+    # loaders: name -> (dep names, fn(resolved deps)); resources: name -> fn(), shared by loaders.
+    # Results are collected in sorted name order, so a raised error is the same on every run.
+    needed = sorted({dep for deps, _ in loaders.values() for dep in deps})
+    if len(loaders) + len(needed) <= 1:
+        # A single dependency-free loader (a loader with a dep makes two items) runs inline.
+        return {name: settle(fn, {}) for name, (_, fn) in loaders.items()}
+    # Imported only when there is more than one thing to load in parallel.
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # Resources are queued first, so loaders blocked on them can never starve the pool.
+        shared = {name: pool.submit(resources[name]) for name in needed}
+        futures = {
+            name: pool.submit(settle, fn, {d: shared[d] for d in deps})
+            for name, (deps, fn) in loaders.items()
+        }
+        return {name: futures[name].result() for name in sorted(futures)}
+
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""counting_file — file proxy that reports how many bytes are read through it."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+
+class CountingFile:
+    """Wraps an open file; every read reports its size in bytes to on_read."""
+
+    def __init__(self, f, on_read):
+        self.f = f
+        self.on_read = on_read
+
+    def count(self, data):
+        self.on_read(len(data) if isinstance(data, bytes) else len(data.encode()))
+        return data
+
+    def read(self, *args):
+        return self.count(self.f.read(*args))
+
+    def readline(self, *args):
+        return self.count(self.f.readline(*args))
+
+    def __iter__(self):
+        for line in self.f:
+            yield self.count(line)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""fan_install — install the j2 scaffold into many target directories on a bounded thread pool."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+
+from installer import OUTCOMES, SOURCE_ROOT, install_target, read_sources
+
+# Installs are small-file I/O, so threads overlap well; the cap keeps many
+# targets from flooding the disk.
+MAX_WORKERS = 8
+GLOB_CHARS = "*?["
+
+
+def expand_targets(patterns, cwd):
+    # A glob names existing directories (** allowed); a plain path is a target
+    # even if it does not exist yet.
+    targets = set()
+    for pattern in patterns:
+        path = os.path.join(cwd, pattern)
+        if not any(c in pattern for c in GLOB_CHARS):
+            targets.add(Path(path).resolve())
+            continue
+        matches = glob.glob(path, recursive=True)
+        targets.update(Path(m).resolve() for m in matches if os.path.isdir(m))
+    return sorted(targets)
+
+
+def install_one(target, sources, known_good):
+    # (target, counts or None, kept paths, seconds, error); a failed
+    # target is reported, never raised.
+    start = time.perf_counter()
+    try:
+        counts, kept, _ = install_target(target, sources, known_good)
+        return target, counts, kept, time.perf_counter() - start, None
+    except (OSError, ValueError) as e:
+        return target, None, [], time.perf_counter() - start, str(e)
+
+
+def install_many(patterns, cwd):
+    # Read the sources once, install into every target concurrently, return the summary table.
+    targets = expand_targets(patterns, cwd)
+    if not targets:
+        raise ValueError(f"no install targets match {', '.join(patterns)}")
+    start = time.perf_counter()
+    sources, warnings = read_sources(SOURCE_ROOT)
+    for warning in warnings:
+        print(warning, file=sys.stderr)
+    # Config content already parsed as valid is shared, so identical configs are checked once.
+    known_good = set()
+    # Imported here: only a multi-target install needs the pool.
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=min(len(targets), MAX_WORKERS)) as pool:
+        futures = [pool.submit(install_one, target, sources, known_good) for target in targets]
+        results = sorted(future.result() for future in as_completed(futures))
+    table = format_table(results, cwd, time.perf_counter() - start)
+    failed = sum(error is not None for *_, error in results)
+    if failed:
+        # The table still goes to stdout; the error makes the run exit 1.
+        print(table)
+        raise ValueError(f"{failed} of {len(results)} install targets failed")
+    return table
+
+
+def format_table(results, cwd, elapsed):
+    # One row per target: file counts and wall time, or the error;
+    # then kept paths and a totals line.
+    rows = [("target",) + OUTCOMES + ("time",)]
+    for target, counts, _, seconds, error in results:
+        name = os.path.relpath(target, cwd)
+        if error:
+            rows.append((name, f"FAILED: {error}"))
+        else:
+            rows.append((name,) + tuple(str(counts[k]) for k in OUTCOMES) + (f"{seconds:.3f}s",))
+    width = max(len(row[0]) for row in rows)
+    lines = [row[0].ljust(width) + "  " + (row[1] if len(row) == 2 else
+             "  ".join(cell.rjust(9) for cell in row[1:])) for row in rows]
+    failed = sum(len(row) == 2 for row in rows)
+    lines += [f"kept (your copy differs from master): {os.path.relpath(target / rel, cwd)}"
+              for target, _, kept, _, _ in results for rel in kept]
+    lines.append(f"{len(results)} targets ({failed} failed) in {elapsed:.2f}s")
+    return "\n".join(lines)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""feature_store — migrate features.md to one file per feature plus a manifest, and back."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+import re
+from collections import Counter
+
+from project_model import (
+    FEATURE_HEAD_RE,
+    MANIFEST_NAME,
+    PREAMBLE_NAME,
+    SECTION_PREFIX,
+    manifest_entries,
+)
+
+SHARD_NAME_RE = re.compile(rf"^(F\d+|{SECTION_PREFIX}\d+)\.md$", re.IGNORECASE)
+MANIFEST_HEADER = "# j2 feature manifest: one shard name per line, in order; each is <name>.md\n"
+
+
+def shard_features_file(root, settings):
+    # Split features.md at every `## ` heading, byte for byte, then remove it: `## F<n>` goes to
+    # <ID>.md, any other section to section-<n>.md, so nothing is folded into a feature.
+    path = root / settings["j2"]["features_file"]
+    raw = path.read_bytes()
+    heads = list(FEATURE_HEAD_RE.finditer(raw))
+    names = shard_names(heads)
+    ids = [name for name in names if not name.startswith(SECTION_PREFIX)]
+    dupes = sorted(fid for fid, n in Counter(ids).items() if n > 1)
+    if dupes:
+        raise ValueError(f"Duplicate feature IDs in {path.name}: {', '.join(dupes)}")
+    shard_dir = path.parent
+    bounds = [m.start() for m in heads] + [len(raw)]
+    write_atomic(shard_dir / PREAMBLE_NAME, raw[:bounds[0]])
+    for name, start, end in zip(names, bounds, bounds[1:]):
+        write_atomic(shard_dir / f"{name}.md", raw[start:end])
+    for stale in stale_shards(shard_dir, set(names)):
+        stale.unlink()
+    manifest = MANIFEST_HEADER + "".join(f"{name}\n" for name in names)
+    write_atomic(shard_dir / MANIFEST_NAME, manifest.encode())
+    path.unlink()
+    return f"Sharded {len(ids)} features into {rel(root, shard_dir)}/<ID>.md ({MANIFEST_NAME})."
+
+
+def unshard_features_file(root, settings):
+    # Concatenate the preamble and shards in manifest order back into features.md.
+    path = root / settings["j2"]["features_file"]
+    if path.exists():
+        raise ValueError(f"{rel(root, path)} already exists beside the shards; "
+                         "run features-shard to re-split it.")
+    shard_dir = path.parent
+    names = manifest_entries(shard_dir)
+    preamble = shard_dir / PREAMBLE_NAME
+    parts = [preamble.read_bytes() if preamble.exists() else b""]
+    parts += [(shard_dir / f"{name}.md").read_bytes() for name in names]
+    write_atomic(path, b"".join(parts))
+    for name in names:
+        (shard_dir / f"{name}.md").unlink()
+    (shard_dir / MANIFEST_NAME).unlink()
+    preamble.unlink(missing_ok=True)
+    features = sum(not name.startswith(SECTION_PREFIX) for name in names)
+    return f"Merged {features} feature files into {rel(root, path)}."
+
+
+def shard_names(heads):
+    # Shard name per `## ` heading: the feature ID, else section-1, section-2, ... in order.
+    names, sections = [], 0
+    for head in heads:
+        if head.group(1):
+            names.append(head.group(1).upper().decode())
+        else:
+            sections += 1
+            names.append(f"{SECTION_PREFIX}{sections}")
+    return names
+
+
+def stale_shards(shard_dir, keep):
+    return [p for p in shard_dir.iterdir() if SHARD_NAME_RE.match(p.name) and p.stem not in keep]
+
+
+def write_atomic(path, data):
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def rel(root, path):
+    return os.path.relpath(path, root)
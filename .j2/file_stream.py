@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""file_stream — placeholder values copied from disk to the output in chunks."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import io
+import os
+
+CHUNK_CHARS = 64 * 1024
+
+
+class FileStream:
+    """One or more files joined by a separator, streamed at render time, never held in memory."""
+
+    def __init__(self, paths, separator):
+        # Stat now so a missing file is reported while loading context, not halfway through output.
+        for path in paths:
+            os.stat(path)
+        self.paths = paths
+        self.separator = separator
+
+    def write_to(self, out):
+        for i, path in enumerate(self.paths):
+            if i:
+                out.write(self.separator)
+            with open(path) as f:
+                while chunk := f.read(CHUNK_CHARS):
+                    out.write(chunk)
+
+    def size(self):
+        # Size on disk plus separators, without reading the files.
+        separators = len(self.separator) * (len(self.paths) - 1)
+        return sum(os.stat(p).st_size for p in self.paths) + separators
+
+    def __str__(self):
+        buf = io.StringIO()
+        self.write_to(buf)
+        return buf.getvalue()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""installer — copy the j2 scaffold, runner, templates, config and commands into a project."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import hashlib
+import json
+import os
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from cache_dir import cache_dir
+
+# The j2 source repo this installer belongs to: .j2/installer.py -> repo root.
+SOURCE_ROOT = Path(__file__).resolve().parent.parent
+SKIP_NAMES = {"__pycache__", ".DS_Store", ".claude"}
+SOURCE_EXTS = (".py", ".js", ".ts", ".rs", ".go", ".java", ".cpp", ".c")
+MANIFEST_PATH = os.path.join(".j2", "cache", "install.json")
+OUTCOMES = ("added", "updated", "unchanged", "kept")
+# Policies: "replace" is always brought up to date, "upgrade" only while the project's copy is
+# unmodified since the last install, "keep" is only ever added when missing (user-owned files).
+GROUPS = [
+    ("scaffold", "", "keep"),
+    (".j2/templates", ".j2/templates", "upgrade"),
+    (".j2/config", ".j2/config", "upgrade"),
+    (".claude/commands", ".claude/commands", "keep"),
+]
+NEXT_STEPS = """Next steps:
+  1. Edit .j2/config/settings.yaml with your project name.
+  2. Edit .j2/rules.md with your project's coding principles (language, testing rules, style, etc.).
+  3. Add your project spec to .j2/specs/
+  4. Run /refresh in Claude Code to begin."""
+ADOPT_STEP = ("  5. Run /adopt in Claude Code to scan your existing codebase and generate a spec "
+              "and feature list.")
+
+# A namedtuple rather than a dataclass, as in project_model: dataclasses is slow to import.
+SourceFile = namedtuple("SourceFile", ["rel", "policy", "data", "digest", "mode", "mtime_ns"])
+
+
+def read_sources(source_root):
+    # Every file an install may write, read and hashed once; returns (sources, warnings).
+    sources, warnings = [], []
+    for folder, dest, policy in GROUPS:
+        if not (source_root / folder).is_dir():
+            warnings.append(f"WARNING: {folder} not found in {source_root}; copy it manually.")
+            continue
+        for rel in walk_files(source_root / folder):
+            sources.append(source_file(source_root / folder / rel, os.path.join(dest, rel), policy))
+    code = sorted((source_root / ".j2").glob("*.py"))
+    if not any(p.name == "runner.py" for p in code):
+        warnings.append(f"WARNING: runner.py not found in {source_root / '.j2'}; copy it manually.")
+    sources += [source_file(p, os.path.join(".j2", p.name), "replace") for p in code]
+    claude_md = source_root / ".claude" / "CLAUDE.md"
+    if claude_md.is_file():
+        sources.append(source_file(claude_md, os.path.join(".claude", "CLAUDE.md"), "keep"))
+    else:
+        warnings.append(f"WARNING: .claude/CLAUDE.md not found in {source_root}.")
+    return sources, warnings
+
+
+def walk_files(folder):
+    # Relative paths of files under folder, skipping caches, compiled files and .DS_Store.
+    found = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_NAMES)
+        rel_dir = os.path.relpath(dirpath, folder)
+        found += [os.path.normpath(os.path.join(rel_dir, f)) for f in sorted(filenames)
+                  if f not in SKIP_NAMES and not f.endswith(".pyc")]
+    return found
+
+
+def source_file(path, rel, policy):
+    data = path.read_bytes()
+    st = path.stat()
+    return SourceFile(rel, policy, data, digest(data), st.st_mode & 0o777, st.st_mtime_ns)
+
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def install(target, sources):
+    # Write sources into target by policy; returns a count per outcome (see OUTCOMES).
+    manifest = read_manifest(target)
+    counts = dict.fromkeys(OUTCOMES, 0)
+    installed, kept = {}, []
+    for src in sources:
+        outcome = place(target / src.rel, src, manifest.get(src.rel))
+        counts[outcome] += 1
+        if outcome == "kept":
+            kept.append(src.rel)
+        else:
+            installed[src.rel] = src.digest
+    write_manifest(target, installed)
+    return counts, kept
+
+
+def place(dst, src, recorded):
+    # One file: added if missing, replaced per policy, otherwise left as the project has it.
+    try:
+        current = digest(dst.read_bytes())
+    except FileNotFoundError:
+        write_file(dst, src)
+        return "added"
+    if current == src.digest:
+        return "unchanged"
+    upgrade = src.policy == "upgrade" and upgradable(dst, src, current, recorded)
+    if src.policy == "replace" or upgrade:
+        write_file(dst, src)
+        return "updated"
+    return "kept"
+
+
+def upgradable(dst, src, current, recorded):
+    # Unmodified since the last install; with no record (e.g. installed by the old install.sh),
+    # the old rsync --update rule: master wins when it is newer than the project's copy.
+    if recorded is not None:
+        return current == recorded
+    return src.mtime_ns > dst.stat().st_mtime_ns
+
+
+def write_file(dst, src):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(src.data)
+    os.chmod(tmp, src.mode)
+    os.replace(tmp, dst)
+
+
+def read_manifest(target):
+    # Hashes of what the last install wrote; files without one are upgraded only by mtime.
+    try:
+        return json.loads((target / MANIFEST_PATH).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(target, installed):
+    path = target / MANIFEST_PATH
+    cache_dir(target)
+    path.write_text(json.dumps(installed, indent=0, sort_keys=True))
+
+
+def validate_configs(target, known_good):
+    # Parse every .j2/config/*.yaml in this interpreter; content
+    # already seen valid is not re-parsed.
+    import yaml
+    checked = []
+    for path in sorted((target / ".j2" / "config").glob("*.yaml")):
+        data = path.read_bytes()
+        if digest(data) not in known_good:
+            try:
+                yaml.load(data, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+            except yaml.YAMLError as e:
+                raise ValueError(f"{path} is invalid YAML: {e}") from None
+            known_good.add(digest(data))
+        checked.append(path)
+    return checked
+
+
+def has_existing_source(target):
+    # Stop at the first source file; .j2 and scaffold at the top level are not the project's code.
+    stack = [str(target)]
+    while stack:
+        folder = stack.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if folder != str(target) or entry.name not in (".j2", "scaffold"):
+                        stack.append(entry.path)
+                elif entry.name.endswith(SOURCE_EXTS):
+                    return True
+    return False
+
+
+def install_target(target, sources, known_good):
+    # Install, validate and scan one target; returns (counts, kept
+    # paths, whether it has source code).
+    target.mkdir(parents=True, exist_ok=True)
+    counts, kept = install(target, sources)
+    validate_configs(target, known_good)
+    return counts, kept, has_existing_source(target)
+
+
+def check_python():
+    # Python 3.10+ and PyYAML (installed with pip when missing).
+    if sys.version_info < (3, 10):
+        found = f"{sys.version_info[0]}.{sys.version_info[1]}"
+        raise SystemExit(f"ERROR: Python 3.10+ required, found {found}.")
+    print(f"Python {sys.version_info[0]}.{sys.version_info[1]} ... OK")
+    try:
+        import yaml  # noqa: F401
+    except ImportError:
+        import subprocess
+        print("Installing PyYAML...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "--quiet", "pyyaml"], check=True)
+    print("PyYAML ... OK")
+
+
+def main(argv):
+    target = Path(argv[0] if argv else ".").resolve()
+    print("j2 installer\n============")
+    check_python()
+    sources, warnings = read_sources(SOURCE_ROOT)
+    for warning in warnings:
+        print(warning, file=sys.stderr)
+    print(f"Installing into {target} ...")
+    try:
+        counts, kept, existing = install_target(target, sources, set())
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    print("  " + ", ".join(f"{counts[k]} {k}" for k in OUTCOMES))
+    for rel in kept:
+        print(f"  kept (your copy differs from master): {rel}")
+    print("Config files ... OK\n\nInstallation complete.")
+    print(NEXT_STEPS + ("\n" + ADOPT_STEP if existing else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
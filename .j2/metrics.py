@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""metrics — append-only invocation log in .j2/cache/metrics.jsonl, rolled up per step."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import time
+
+from cache_dir import cache_dir
+from token_budget import CHARS_PER_TOKEN
+
+MAX_LOG_BYTES = 1024 * 1024
+LOG_NAME = "metrics.jsonl"
+# One compacted generation is kept, so the log never exceeds about twice MAX_LOG_BYTES.
+ROTATED_NAME = "metrics.1.jsonl"
+
+
+def metrics_record(args, prof, code):
+    # One compact line per invocation, built from the run's profiler.
+    return {
+        "ts": round(time.time(), 3),
+        "command": args.command,
+        "feature": args.feature,
+        "task": args.task,
+        "ms": round((time.perf_counter() - prof.started) * 1000, 3),
+        "bytes": prof.prompt_bytes,
+        "tokens": prof.prompt_bytes // CHARS_PER_TOKEN,
+        "files": prof.files_read(),
+        "exit": code,
+    }
+
+
+def append_record(root, record):
+    # A single O_APPEND write per record, so parallel runners never interleave lines.
+    # Telemetry is best-effort: an unwritable log (or no .j2 dir) never fails the command.
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+    try:
+        log_dir = cache_dir(root)
+        fd = os.open(log_dir / LOG_NAME, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size > MAX_LOG_BYTES:
+            rotate(log_dir)
+    except OSError:
+        return
+
+
+def rotate(log_dir):
+    # Move the live log aside and compact it (drop per-file lists) into the rotated generation.
+    # flock keeps concurrent runners from rotating at once; fcntl is only needed here.
+    import fcntl
+    with open(log_dir / "metrics.lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+        live = log_dir / LOG_NAME
+        if not live.exists() or live.stat().st_size <= MAX_LOG_BYTES:
+            return
+        rotating = log_dir / "metrics.rotating.jsonl"
+        os.replace(live, rotating)
+        compacted = log_dir / "metrics.1.tmp"
+        with open(rotating) as src, open(compacted, "w") as dst:
+            for line in src:
+                record = json.loads(line)
+                record.pop("files", None)
+                dst.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(compacted, log_dir / ROTATED_NAME)
+        rotating.unlink()
+
+
+def read_records(log_dir):
+    # Stream records oldest first: the rotated generation, then the live log.
+    for name in (ROTATED_NAME, LOG_NAME):
+        path = log_dir / name
+        if not path.exists():
+            continue
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile of an already sorted list.
+    return values[max(0, -(-len(values) * pct // 100) - 1)]
+
+
+def trend(samples):
+    # Median latency of the newer half of runs relative to the older half, as a signed percent.
+    if len(samples) < 4:
+        return "n/a"
+    half = len(samples) // 2
+    old, new = sorted(samples[:half]), sorted(samples[half:])
+    change = (percentile(new, 50) / max(percentile(old, 50), 0.001) - 1) * 100
+    return f"{change:+.0f}%"
+
+
+def metrics_report(root):
+    # p50/p95 render latency and prompt size per workflow step, from the log.
+    steps = {}
+    for record in read_records(root / ".j2" / "cache"):
+        step = steps.setdefault(record["command"], {"ms": [], "bytes": [], "tokens": []})
+        step["ms"].append(record["ms"])
+        step["bytes"].append(record["bytes"])
+        step["tokens"].append(record["tokens"])
+    if not steps:
+        return f"No metrics yet — {LOG_NAME} is written on every runner invocation."
+    lines = [
+        f"{'Step':<20}{'Runs':>6}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p50 KB':>10}{'p95 KB':>10}{'p95 tok':>10}{'trend':>8}",
+    ]
+    for name, step in sorted(steps.items()):
+        ms, size, tokens = sorted(step["ms"]), sorted(step["bytes"]), sorted(step["tokens"])
+        lines.append(
+            f"{name:<20}{len(ms):>6}{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}"
+            f"{percentile(size, 50) / 1024:>10.1f}{percentile(size, 95) / 1024:>10.1f}"
+            f"{percentile(tokens, 95):>10,}{trend(step['ms']):>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""multi_root — run one runner command across many j2 projects on a process pool."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+from warm_cache import WarmCache
+
+SETTINGS_PATH = os.path.join(".j2", "config", "settings.yaml")
+SUMMARY_COUNTS = ("done", "in progress", "not started")
+
+
+def discover_roots(patterns, cwd):
+    # Directories matching any glob pattern (relative to cwd, ** allowed) that hold a j2 project.
+    roots = set()
+    for pattern in patterns:
+        for match in glob.glob(os.path.join(cwd, pattern), recursive=True):
+            if os.path.isfile(os.path.join(match, SETTINGS_PATH)):
+                roots.add(Path(match).resolve())
+    return sorted(roots)
+
+
+def strip_roots(argv):
+    # The per-project command line: argv without any --roots options.
+    kept = []
+    skip = False
+    for arg in argv:
+        if skip or arg.startswith("--roots="):
+            skip = False
+            continue
+        skip = arg == "--roots"
+        if not skip:
+            kept.append(arg)
+    return kept
+
+
+def run_root(root, argv):
+    # One project in a worker, through the same invocation path as main (metrics included).
+    import runner
+    args = runner.build_parser().parse_args(argv)
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        code = runner.run_invocation(root, args, WarmCache(), argv)
+    return root, code, out.getvalue(), err.getvalue()
+
+
+def run_all(roots, argv, emit):
+    # Run argv in every root, calling emit(result) as each finishes; one root runs inline.
+    if len(roots) == 1:
+        emit(run_root(roots[0], argv))
+        return
+    # Imported only for real fan-out. Workers import runner in
+    # run_root, so fork and spawn both work.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=min(len(roots), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(run_root, root, argv): root for root in roots}
+        for future in as_completed(futures):
+            try:
+                emit(future.result())
+            except (ValueError, OSError) as e:  # a broken project is reported, the rest still run
+                emit((futures[future], 1, "", f"Error: {e}\n"))
+
+
+def run_roots(patterns, argv, cwd):
+    # Stream each project's result as it finishes, then an aggregate summary; exit 1 if any failed.
+    import runner
+    roots = discover_roots(patterns, cwd)
+    if not roots:
+        print(f"Error: no j2 projects match {', '.join(patterns)}", file=sys.stderr)
+        return 1
+    command = runner.build_parser().parse_args(strip_roots(argv))
+    is_status = command.command == "status"
+    # Status always travels as JSON so the parent can both print and total it.
+    worker_argv = strip_roots(argv) + (["--json"] if is_status and not command.json else [])
+    summary = {"projects": len(roots), "failed": 0}
+    if is_status:
+        summary.update(features=dict.fromkeys(SUMMARY_COUNTS, 0), missing_task_files=0,
+                       pending_tasks=0)
+
+    def emit(result):
+        root, code, out, err = result
+        data = json.loads(out) if is_status and code == 0 else None
+        summary["failed"] += code != 0
+        if data:
+            add_status(summary, data)
+        print_result(result, os.path.relpath(root, cwd), data, command.json)
+
+    run_all(roots, worker_argv, emit)
+    print_summary(summary, command.json)
+    return 1 if summary["failed"] else 0
+
+
+def add_status(summary, data):
+    for key in SUMMARY_COUNTS:
+        summary["features"][key] += data["features"][key]
+    summary["missing_task_files"] += len(data["missing_task_files"])
+    summary["pending_tasks"] += data["pending_tasks"]
+
+
+def print_result(result, name, data, as_json):
+    # JSON: one line per project, keyed by absolute root.
+    # Text: a `==> project <==` header, then its output.
+    root, code, out, err = result
+    if as_json:
+        record = {"root": str(root), "exit": code, "output": out, "error": err.strip()}
+        line = out.strip() if data else json.dumps(record, separators=(",", ":"))
+        print(line, flush=True)
+        return
+    from project_state import format_status
+    print(f"==> {name} <==")
+    print(format_status(data) if data else out.rstrip("\n"), flush=True)
+    if err:
+        sys.stderr.write(err)
+
+
+def print_summary(summary, as_json):
+    if as_json:
+        print(json.dumps({"summary": summary}, separators=(",", ":")), flush=True)
+        return
+    line = f"{summary['projects']} projects ({summary['failed']} failed)"
+    if "features" in summary:
+        counts = summary["features"]
+        line += (f": {counts['done']} done / {counts['in progress']} in progress / "
+                 f"{counts['not started']} not started features, "
+                 f"{summary['missing_task_files']} missing task files, "
+                 f"{summary['pending_tasks']} pending tasks")
+    print(f"==> summary <==\n{line}")
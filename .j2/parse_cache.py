@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""parse_cache — parsed file structure persisted in .j2/cache/<name>.json, keyed by file stamp."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import time
+from pathlib import Path
+
+from cache_dir import cache_dir
+from warm_cache import RACY_NS
+
+CACHE_VERSION = 2
+SHARED = {}
+
+
+class ParseCache:
+    """Per-file parse results reused while a file's size, mtime and inode are unchanged."""
+
+    def __init__(self, root, name):
+        # Separate names keep small, hot caches (config) from loading large ones (project parse).
+        self.root = root
+        self.prefix = os.path.join(root, "")
+        self.path = root / ".j2" / "cache" / f"{name}.json"
+        self.entries = read_entries(self.path)
+        self.dirty = False
+
+    @classmethod
+    def shared(cls, root, name):
+        # One instance per root and name per process, so a long-lived daemon keeps parses in memory.
+        if (root, name) not in SHARED:
+            SHARED[root, name] = cls(root, name)
+        return SHARED[root, name]
+
+    def get(self, path, parser):
+        # Return (parsed, raw) for path, re-parsing only when its stamp changed; raw is None on a
+        # hit. path may be a str; slicing off the root prefix is much cheaper than os.path.relpath.
+        path = os.fspath(path)
+        st = os.stat(path)
+        stamp = [st.st_size, st.st_mtime_ns, st.st_ino]
+        if path.startswith(self.prefix):
+            key = path[len(self.prefix):]
+        else:
+            key = os.path.relpath(path, self.root)
+        entry = self.entries.get(key)
+        if entry and entry["stamp"] == stamp:
+            return entry["data"], None
+        raw = Path(path).read_bytes()
+        data = parser(raw)
+        # A file modified within the mtime resolution window could change again unnoticed.
+        if time.time_ns() - st.st_mtime_ns > RACY_NS:
+            self.entries[key] = {"stamp": stamp, "data": data}
+            self.dirty = True
+        return data, raw
+
+    def save(self):
+        # Write the cache atomically, dropping entries whose files have been deleted.
+        if not self.dirty:
+            return
+        self.entries = {k: v for k, v in self.entries.items() if (self.root / k).exists()}
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_dir(self.root)
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": self.entries}))
+            os.replace(tmp, self.path)
+        except OSError:
+            # A read-only checkout still works; it just parses cold every time.
+            return
+        self.dirty = False
+
+
+def read_entries(path):
+    try:
+        cached = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cached["entries"] if cached.get("version") == CACHE_VERSION else {}
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""profiler — --profile report: phase and loader timings, bytes read per file, placeholder sizes."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import builtins
+import contextlib
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from counting_file import CountingFile
+from file_stream import FileStream
+from token_budget import CHARS_PER_TOKEN
+
+
+class Profiler:
+    """Collects one invocation's profile for --profile and metrics.jsonl; root None disables it."""
+
+    active = None
+
+    def __init__(self, root):
+        self.root = root
+        self.enabled = root is not None
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.files = {}
+        self.sources = set()
+        self.placeholders = {}
+        self.prompt_bytes = 0
+        self.lock = threading.Lock()
+        self.real_open = None
+
+    @classmethod
+    def current(cls):
+        # The profiler started by main(), or a disabled one so callers never need to check.
+        return cls.active if cls.active else cls(None)
+
+    def start(self, count_reads):
+        # With count_reads (--profile only), route builtins.open (and io.open, which pathlib uses)
+        # through CountingFile; that patch is process-wide, so ordinary runs never install it.
+        Profiler.active = self
+        if count_reads:
+            self.real_open = builtins.open
+            builtins.open = io.open = self.counting_open
+
+    def stop(self):
+        if self.real_open:
+            builtins.open = io.open = self.real_open
+            self.real_open = None
+        Profiler.active = None
+
+    def counting_open(self, file, *args, **kwargs):
+        key = self.file_key(file)
+        return CountingFile(self.real_open(file, *args, **kwargs), lambda n: self.add_read(key, n))
+
+    def file_key(self, file):
+        path = Path(file) if isinstance(file, (str, Path)) else Path(str(file))
+        with contextlib.suppress(ValueError):
+            return str(path.resolve().relative_to(self.root))
+        return str(path)
+
+    def add_read(self, key, size):
+        with self.lock:
+            self.files[key] = self.files.get(key, 0) + size
+
+    def add_time(self, name, started):
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0) + (time.perf_counter() - started) * 1000
+
+    def phase(self, name):
+        return self.timer(name) if self.enabled else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, started)
+
+    def timed(self, name, fn):
+        # fn wrapped to record its wall time under name; fn itself when disabled.
+        if not self.enabled:
+            return fn
+
+        def run(*args):
+            with self.timer(name):
+                return fn(*args)
+        return run
+
+    def record_placeholders(self, segment_lists, context):
+        # Rendered UTF-8 size of each placeholder (times its uses) and of the whole prompt.
+        if not self.enabled:
+            return
+        names = [name for segs in segment_lists for name in segs[1::2]]
+        self.prompt_bytes = sum(len(seg.encode()) for segs in segment_lists for seg in segs[0::2])
+        for name in dict.fromkeys(names):
+            value = context.get(name, f"{{{{{name}}}}}")
+            if isinstance(value, FileStream):
+                self.sources.update(self.file_key(path) for path in value.paths)
+            size = rendered_bytes(value) * names.count(name)
+            self.placeholders[name] = {"bytes": size, "tokens": size // CHARS_PER_TOKEN}
+            self.prompt_bytes += size
+
+    def files_read(self):
+        # Files streamed into the prompt, plus every file opened when reads were counted.
+        return sorted(self.sources.union(self.files))
+
+    def report(self, argv):
+        return {
+            "argv": argv,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "bytes_read": dict(sorted(self.files.items())),
+            "placeholders": dict(sorted(self.placeholders.items())),
+            "prompt_bytes": self.prompt_bytes,
+            "prompt_tokens": self.prompt_bytes // CHARS_PER_TOKEN,
+        }
+
+    def write_report(self, argv, target):
+        # Write the JSON report to stderr ("-") or to the file target.
+        text = json.dumps(self.report(argv), indent=2) + "\n"
+        if target == "-":
+            sys.stderr.write(text)
+        else:
+            Path(target).write_text(text)
+
+
+def rendered_bytes(value):
+    return value.size() if isinstance(value, FileStream) else len((value or "").encode())
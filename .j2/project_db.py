@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""project_db — optional SQLite mirror of features and tasks in .j2/cache/j2.db."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+import threading
+
+from cache_dir import cache_dir
+from project_model import (
+    MANIFEST_NAME,
+    PRIORITY_ORDER,
+    check_single_layout,
+    feature_records,
+    next_task_text,
+    read_manifest,
+    task_records,
+)
+from status_index import settled_stamp
+from task_archive import TaskArchive
+
+DB_NAME = "j2.db"
+SCHEMA_VERSION = 1
+# Which task file wins when a feature has several: the same order load_tasks checks.
+LOCATIONS = {"active": 0, "done": 1, "pack": 2}
+SCHEMA = """
+CREATE TABLE files (source TEXT PRIMARY KEY, kind TEXT NOT NULL, stamp TEXT);
+CREATE TABLE features (fid TEXT PRIMARY KEY, source TEXT NOT NULL, ord INTEGER,
+                       priority TEXT, status TEXT, section TEXT);
+CREATE TABLE task_files (source TEXT PRIMARY KEY, fid TEXT NOT NULL, location TEXT,
+                         rank INTEGER, pending INTEGER);
+CREATE TABLE tasks (source TEXT NOT NULL, fid TEXT NOT NULL, tid TEXT NOT NULL, ord INTEGER,
+                    status TEXT, section TEXT, PRIMARY KEY (source, tid));
+CREATE INDEX features_status ON features (status);
+CREATE INDEX features_source ON features (source);
+CREATE INDEX task_files_fid ON task_files (fid, rank);
+CREATE INDEX tasks_status ON tasks (status);
+"""
+
+
+class ProjectDB:
+    """Features and tasks mirrored into SQLite; the markdown stays authoritative."""
+
+    def __init__(self, root, settings):
+        self.root = root
+        self.path = root / ".j2" / "cache" / DB_NAME
+        self.features_path = root / settings["j2"]["features_file"]
+        self.tasks_dir = root / settings["j2"]["tasks_dir"]
+        self.conn = None
+        # Filled while listing sources: shard name -> manifest position,
+        # task source -> (location, ID).
+        self.shard_order = {}
+        self.task_owner = {}
+        # Loaders run on a thread pool; one lock serializes use of the shared connection.
+        self.lock = threading.Lock()
+
+    @classmethod
+    def existing(cls, root, settings):
+        # The mirror is opt-in: None unless `runner.py db-sync` has created .j2/cache/j2.db.
+        if not (root / ".j2" / "cache" / DB_NAME).exists():
+            return None
+        return cls(root, settings)
+
+    def connect(self):
+        # sqlite3 is imported only when the mirror is in use; it is too slow for every startup.
+        import sqlite3
+        self.conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            tables = self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            for (name,) in tables.fetchall():
+                self.conn.execute(f"DROP TABLE {name}")
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def refresh(self):
+        # Re-read only the feature and task sources whose stamps changed since the last sync.
+        if self.conn is None:
+            self.connect()
+        with self.lock:
+            self.sync("feature", self.feature_sources(), self.load_features)
+            self.sync("task", self.task_sources(), self.load_task_file)
+            self.conn.commit()
+
+    def save(self):
+        # refresh() commits; kept so ProjectDB and StatusIndex are used the same way.
+        return
+
+    def sync(self, kind, sources, loader):
+        # sources: name -> (stamp or None, fn() -> bytes). A None stamp is re-read on every sync.
+        stored = dict(self.conn.execute("SELECT source, stamp FROM files WHERE kind = ?", (kind,)))
+        for gone in stored.keys() - sources.keys():
+            self.forget(gone)
+        changed = [name for name, (stamp, _) in sources.items()
+                   if stamp is None or stored.get(name) != stamp]
+        for name in changed:
+            stamp, read = sources[name]
+            self.forget(name)
+            loader(name, read())
+            self.conn.execute("INSERT INTO files VALUES (?, ?, ?)", (name, kind, stamp))
+        return changed
+
+    def forget(self, source):
+        for table in ("files", "features", "task_files", "tasks"):
+            self.conn.execute(f"DELETE FROM {table} WHERE source = ?", (source,))
+
+    def feature_sources(self):
+        # features.md when present, else each manifest-listed shard (ordered by the manifest).
+        if self.features_path.exists():
+            check_single_layout(self.features_path)
+            return {self.rel(self.features_path): file_source(self.features_path)}
+        shard_dir = self.features_path.parent
+        if not (shard_dir / MANIFEST_NAME).exists():
+            return {}
+        sources = {}
+        for i, fid in enumerate(read_manifest(shard_dir)):
+            name = self.rel(shard_dir / f"{fid}.md")
+            stamp, read = file_source(shard_dir / f"{fid}.md")
+            # The manifest position is part of the stamp, so reordering re-syncs the order.
+            sources[name] = (stamp and f"{i}:{stamp}", read)
+            self.shard_order[name] = i
+        return sources
+
+    def load_features(self, source, raw):
+        # features.md rows are ordered by byte offset; a shard holds one
+        # feature at its manifest position.
+        records = feature_records(raw)
+        if source in self.shard_order:
+            records = records[:1]
+        rows = [(fid, source, self.shard_order.get(source, start), priority, status,
+                 raw[start:end].decode().strip())
+                for fid, priority, status, start, end in records]
+        self.conn.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def task_sources(self):
+        # Active and loose done task files by stamp, and packed entries by their index position.
+        sources = {}
+        for location, folder in (("active", self.tasks_dir), ("done", self.tasks_dir / "done")):
+            for name in md_names(folder):
+                sources[self.rel(folder / name)] = file_source(folder / name)
+                self.task_owner[self.rel(folder / name)] = (location, name[:-3])
+        archive = TaskArchive(self.tasks_dir)
+        for fid, (offset, length) in archive.index().items():
+            name = f"{self.rel(archive.pack)}:{fid}"
+            sources[name] = (f"{offset}:{length}", lambda fid=fid: archive.read(fid))
+            self.task_owner[name] = ("pack", fid)
+        return sources
+
+    def load_task_file(self, source, raw):
+        location, fid = self.task_owner[source]
+        records = task_records(raw)
+        self.conn.execute("INSERT INTO task_files VALUES (?, ?, ?, ?, ?)",
+                          (source, fid, location, LOCATIONS[location], records["pending"]))
+        rows = [(source, fid, tid, i, status, raw[start:end].decode().strip())
+                for i, (tid, status, start, end) in enumerate(records["tasks"])]
+        # A repeated task ID keeps its first section, as ProjectModel.task_section does.
+        self.conn.executemany("INSERT OR IGNORE INTO tasks VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def query(self, sql, params):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def status_counts(self):
+        counts = {"done": 0, "in progress": 0, "not started": 0}
+        for status, n in self.query("SELECT status, COUNT(*) FROM features GROUP BY status", ()):
+            if status in counts:
+                counts[status] = n
+        return counts
+
+    def default_feature(self):
+        # First in-progress feature, else first not-started feature, else F01.
+        for status in ("in progress", "not started"):
+            row = self.query(
+                "SELECT fid FROM features WHERE status = ? ORDER BY ord LIMIT 1", (status,))
+            if row:
+                return row[0][0]
+        return "F01"
+
+    def missing_features(self):
+        # (id, priority) of not-done features lacking any task file, sorted by priority.
+        rows = self.query(
+            "SELECT fid, priority FROM features WHERE priority != '' AND status != 'done' "
+            "AND fid NOT IN (SELECT fid FROM task_files)", ())
+        missing = sorted((PRIORITY_ORDER.get(pri.lower(), 9), fid, pri) for fid, pri in rows)
+        return [(fid, pri) for _, fid, pri in missing]
+
+    def missing_tasks(self):
+        # Same text as ProjectModel.missing_tasks.
+        return ", ".join(f"{fid} ({pri})" for fid, pri in self.missing_features()) or "none"
+
+    def pending_count(self):
+        rows = self.query(
+            "SELECT COALESCE(SUM(pending), 0) FROM task_files WHERE location = 'active'", ())
+        return rows[0][0]
+
+    def pending_by_feature(self):
+        return dict(self.query(
+            "SELECT fid, pending FROM task_files WHERE location = 'active' AND pending > 0 "
+            "ORDER BY fid", ()))
+
+    def next_task(self, feature_id):
+        # Same text as ProjectModel.next_task, from the feature's active task file.
+        active = self.query(
+            "SELECT source FROM task_files WHERE fid = ? AND location = 'active'", (feature_id,))
+        if not active:
+            return next_task_text(feature_id, None)
+        return next_task_text(feature_id, self.query(
+            "SELECT tid, status, section FROM tasks WHERE source = ? ORDER BY ord",
+            (active[0][0],)))
+
+    def task_section(self, feature_id, task_id):
+        # The task from the feature's winning task file (active, then done/, then the pack).
+        rows = self.query(
+            "SELECT section FROM tasks WHERE tid = ? AND source = "
+            "(SELECT source FROM task_files WHERE fid = ? ORDER BY rank LIMIT 1)",
+            (task_id.upper(), feature_id))
+        if not rows:
+            raise ValueError(f"Task {task_id.upper()!r} not found in tasks file.")
+        return rows[0][0]
+
+    def summary(self):
+        features = self.query("SELECT COUNT(*) FROM features", ())[0][0]
+        tasks = self.query("SELECT COUNT(*) FROM tasks", ())[0][0]
+        return f"Synced {self.rel(self.path)}: {features} features, {tasks} tasks."
+
+    def rel(self, path):
+        return os.path.relpath(path, self.root)
+
+
+def sync_db(root, settings):
+    # Create (or bring up to date) .j2/cache/j2.db; its existence opts the
+    # runner in to answering from it.
+    cache_dir(root)
+    db = ProjectDB(root, settings)
+    db.refresh()
+    return db.summary()
+
+
+def file_source(path):
+    # (stamp, reader) for a markdown file; files modified within the racy window get no stamp.
+    stamp = settled_stamp(os.stat(path))
+    return (stamp and ":".join(map(str, stamp))), path.read_bytes
+
+
+def md_names(folder):
+    try:
+        with os.scandir(folder) as entries:
+            return sorted(e.name for e in entries if e.name.endswith(".md") and e.is_file())
+    except FileNotFoundError:
+        return []
+
+
+def run_query(root, sql):
+    # Read-only ad-hoc SQL against the mirror: a header line, then tab-separated rows.
+    import sqlite3
+    path = root / ".j2" / "cache" / DB_NAME
+    if not path.exists():
+        raise ValueError(f"No {DB_NAME}; run `runner.py db-sync` first.")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(sql)
+        rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        raise ValueError(f"SQL error: {e}") from None
+    finally:
+        conn.close()
+    header = "\t".join(d[0] for d in cursor.description or [])
+    return "\n".join([header] + ["\t".join(str(v) for v in row) for row in rows])
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""project_model — single-pass parse of features (features.md or per-feature shards) and tasks."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import errno
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from task_archive import TaskArchive
+
+FEATURE_HEAD_RE = re.compile(rb"^## (?:(F\d+)\b)?", re.MULTILINE | re.IGNORECASE)
+TASK_HEAD_RE = re.compile(rb"^### (?:(T\d+)\b)?", re.MULTILINE | re.IGNORECASE)
+PRIORITY_RE = re.compile(rb"^\*\*Priority\*\*:\s*(\w+)", re.MULTILINE)
+STATUS_RE = re.compile(rb"^\*\*Status\*\*:\s*([^\n|]+)", re.MULTILINE)
+PENDING_MARK = b"**Status**: not started"
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+# Sharded layout: <ID>.md per feature beside features.md, ordered by the manifest.
+MANIFEST_NAME = "manifest.txt"
+PREAMBLE_NAME = "preamble.md"
+# Any other `## ` section keeps its place as section-<n>.md, listed in the manifest by that name.
+SECTION_PREFIX = "section-"
+# {{next_task}} lists at most this many of the other not-started task titles.
+NEXT_TITLES = 10
+
+
+# A namedtuple rather than a dataclass: dataclasses pulls in inspect and dominates startup.
+Feature = namedtuple("Feature", ["fid", "priority", "status", "start", "end"])
+
+
+class ProjectModel:
+    """Features keyed by ID with priority, status and byte offsets, plus task-file presence."""
+
+    def __init__(self, path, features, tasks_dir, cache):
+        # features is None when the features file does not exist, or until shards are loaded.
+        self.path = path
+        self.features = features
+        self.tasks_dir = tasks_dir
+        self.cache = cache
+        self.raw = None
+        self.shard_dir = None
+        self.task_ids = scan_task_ids(tasks_dir) if tasks_dir else set()
+
+    @classmethod
+    def load(cls, root, settings, cache):
+        path = root / settings["j2"]["features_file"]
+        tasks_dir = root / settings["j2"]["tasks_dir"]
+        try:
+            records, raw = cache.get(path, feature_records)
+        except FileNotFoundError:
+            # No features.md: a manifest selects shards (both at once is an error).
+            model = cls(path, None, tasks_dir, cache)
+            if (path.parent / MANIFEST_NAME).exists():
+                model.shard_dir = path.parent
+            return model
+        check_single_layout(path)
+        model = cls(path, {r[0]: Feature(*r) for r in records}, tasks_dir, cache)
+        model.raw = raw
+        return model
+
+    @classmethod
+    def from_text(cls, text):
+        raw = text.encode()
+        model = cls(None, {r[0]: Feature(*r) for r in feature_records(raw)}, None, None)
+        model.raw = raw
+        return model
+
+    def all_features(self):
+        # Features by ID in file (or manifest) order; shards are only parsed on first use.
+        if self.features is None and self.shard_dir:
+            self.features = shard_features(self.shard_dir, self.cache)
+        return self.features or {}
+
+    def require_features(self):
+        if self.features is None and not self.shard_dir:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(self.path))
+        return self.all_features()
+
+    def section(self, feature_id):
+        # Return the markdown section for one feature: its shard, or only its byte span.
+        if self.shard_dir:
+            return read_shard(self.shard_dir, feature_id.upper()).decode().strip()
+        feat = self.require_features().get(feature_id.upper())
+        if feat is None:
+            raise ValueError(f"Feature {feature_id.upper()!r} not found in features file.")
+        if self.raw is not None:
+            return self.raw[feat.start:feat.end].decode().strip()
+        return read_span(self.path, feat.start, feat.end).strip()
+
+    def filtered(self):
+        # Features text with done sections removed and replaced by a count summary.
+        features = self.require_features()
+        if self.shard_dir:
+            return self.filtered_shards(features)
+        if self.raw is None:
+            self.raw = self.path.read_bytes()
+        kept = []
+        pos = 0
+        done = [f for f in features.values() if f.status == "done"]
+        for feat in sorted(done, key=lambda f: f.start):
+            kept.append(self.raw[pos:feat.start])
+            pos = feat.end
+        kept.append(self.raw[pos:])
+        return with_done_summary(b"".join(kept), len(done))
+
+    def filtered_shards(self, features):
+        # Same text as features.md mode: non-feature sections stay where they are.
+        preamble = self.shard_dir / PREAMBLE_NAME
+        kept = [preamble.read_bytes() if preamble.exists() else b""]
+        done = {f.fid for f in features.values() if f.status == "done"}
+        names = manifest_entries(self.shard_dir)
+        kept += [read_shard(self.shard_dir, name) for name in names if name not in done]
+        return with_done_summary(b"".join(kept), len(done))
+
+    def status_counts(self):
+        counts = {"done": 0, "in progress": 0, "not started": 0}
+        for feat in self.all_features().values():
+            if feat.status in counts:
+                counts[feat.status] += 1
+        return counts
+
+    def default_feature(self):
+        # First in-progress feature, else first not-started feature, else F01.
+        in_progress = not_started = None
+        for feat in self.all_features().values():
+            if feat.status == "in progress" and in_progress is None:
+                in_progress = feat.fid
+            elif feat.status == "not started" and not_started is None:
+                not_started = feat.fid
+        return in_progress or not_started or "F01"
+
+    def missing_features(self):
+        # (id, priority) of not-done features lacking a task file (active or archived), by priority.
+        missing = [
+            (PRIORITY_ORDER.get(f.priority.lower(), 9), f.fid, f.priority)
+            for f in self.all_features().values()
+            if f.priority and f.status != "done" and f.fid not in self.task_ids
+        ]
+        missing.sort()
+        return [(fid, pri) for _, fid, pri in missing]
+
+    def missing_tasks(self):
+        return ", ".join(f"{fid} ({pri})" for fid, pri in self.missing_features()) or "none"
+
+    def pending_count(self):
+        # Count `not started` tasks across active task files, using cached per-file counts.
+        if not self.tasks_dir.exists():
+            return 0
+        files = self.tasks_dir.glob("*.md")
+        return sum(self.cache.get(tf, task_records)[0]["pending"] for tf in files)
+
+    def next_task(self, feature_id):
+        # The first not-started task of the feature's active task file,
+        # plus its other pending titles.
+        path = self.tasks_dir / f"{feature_id}.md"
+        try:
+            records, raw = self.cache.get(path, task_records)
+        except FileNotFoundError:
+            return next_task_text(feature_id, None)
+        raw = raw if raw is not None else path.read_bytes()
+        return next_task_text(feature_id, [(tid, status, raw[start:end].decode())
+                                           for tid, status, start, end in records["tasks"]])
+
+    def task_path(self, feature_id):
+        active = self.tasks_dir / f"{feature_id}.md"
+        return active if active.exists() else self.tasks_dir / "done" / f"{feature_id}.md"
+
+    def task_section(self, feature_id, task_id):
+        # Return one task's markdown section, reading only its byte span (or its packed entry).
+        path = self.task_path(feature_id)
+        packed = None if path.exists() else TaskArchive(self.tasks_dir).read(feature_id)
+        if packed is not None:
+            start, end = task_span(task_records(packed), task_id)
+            return packed[start:end].decode().strip()
+        start, end = task_span(self.cache.get(path, task_records)[0], task_id)
+        return read_span(path, start, end).strip()
+
+
+def with_done_summary(raw, done):
+    result = raw.decode().rstrip()
+    if done:
+        result += f"\n\n--- {done} completed features omitted ---\n"
+    return result
+
+
+def check_single_layout(features_path):
+    # features.md beside a shard manifest means one layout was written over
+    # the other; refuse to pick one.
+    if (features_path.parent / MANIFEST_NAME).exists():
+        raise ValueError(
+            f"Both {features_path.name} and the {MANIFEST_NAME} shards exist in "
+            f"{features_path.parent}. "
+            "Run `runner.py features-shard` to re-split features.md over the shards, "
+            "or delete features.md to keep the shards."
+        )
+
+
+def manifest_entries(shard_dir):
+    # Shard names in order, feature IDs and section-<n> alike; blanks and # comments are ignored.
+    lines = (shard_dir / MANIFEST_NAME).read_text().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def read_manifest(shard_dir):
+    # Feature IDs in order.
+    return [name for name in manifest_entries(shard_dir) if not name.startswith(SECTION_PREFIX)]
+
+
+def read_shard(shard_dir, feature_id):
+    try:
+        return (shard_dir / f"{feature_id}.md").read_bytes()
+    except FileNotFoundError:
+        raise ValueError(f"Feature {feature_id!r} not found in features file.") from None
+
+
+def shard_features(shard_dir, cache):
+    # Feature records from each manifest-listed shard, parsed through the cache by file stamp.
+    features = {}
+    base = os.path.join(shard_dir, "")
+    for fid in read_manifest(shard_dir):
+        records = cache.get(f"{base}{fid}.md", feature_records)[0]
+        features[fid] = Feature(fid, *records[0][1:]) if records else Feature(fid, "", "", 0, 0)
+    return features
+
+
+def feature_records(raw):
+    # One scan over `## ` headings; each feature spans to the next heading. JSON-friendly rows.
+    heads = list(FEATURE_HEAD_RE.finditer(raw))
+    records = {}
+    for i, head in enumerate(heads):
+        end = heads[i + 1].start() if i + 1 < len(heads) else len(raw)
+        if head.group(1) and head.group(1).upper() not in records:
+            body = raw[head.end():end]
+            records[head.group(1).upper()] = [
+                head.group(1).upper().decode(),
+                field(PRIORITY_RE, body),
+                field(STATUS_RE, body).strip().lower(),
+                head.start(),
+                end,
+            ]
+    return list(records.values())
+
+
+def task_records(raw):
+    # Pending count plus [id, status, start, end] for every `### T` section of a task file.
+    heads = list(TASK_HEAD_RE.finditer(raw))
+    tasks = []
+    for i, head in enumerate(heads):
+        end = heads[i + 1].start() if i + 1 < len(heads) else len(raw)
+        if head.group(1):
+            status = field(STATUS_RE, raw[head.end():end]).strip().lower()
+            tasks.append([head.group(1).upper().decode(), status, head.start(), end])
+    return {"pending": raw.count(PENDING_MARK), "tasks": tasks}
+
+
+def next_task_text(feature_id, tasks):
+    # tasks: (id, status, section) in file order, or None without an active task file.
+    if tasks is None:
+        return f"(no active task file for {feature_id})"
+    pending = [section.strip() for _, status, section in tasks if status == "not started"]
+    if not pending:
+        return f"(no task for {feature_id} has **Status** `not started`)"
+    titles = [section.split("\n", 1)[0].lstrip("#").strip() for section in pending[1:]]
+    if not titles:
+        return pending[0]
+    listing = "\n".join(f"- {title}" for title in titles[:NEXT_TITLES])
+    more = f"\n- … and {len(titles) - NEXT_TITLES} more" if len(titles) > NEXT_TITLES else ""
+    return f"{pending[0]}\n\nStill not started after it:\n{listing}{more}"
+
+
+def task_span(records, task_id):
+    for tid, _, start, end in records["tasks"]:
+        if tid == task_id.upper():
+            return start, end
+    raise ValueError(f"Task {task_id.upper()!r} not found in tasks file.")
+
+
+def field(pattern, body):
+    match = pattern.search(body)
+    return match.group(1).decode() if match else ""
+
+
+def read_span(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode()
+
+
+def scan_task_ids(tasks_dir):
+    # Feature IDs with a task file in tasks/, tasks/done/ or the packed archive.
+    ids = set(TaskArchive(Path(tasks_dir)).index())
+    for folder in (Path(tasks_dir), Path(tasks_dir) / "done"):
+        try:
+            with os.scandir(folder) as entries:
+                ids.update(e.name[:-3] for e in entries if e.name.endswith(".md"))
+        except FileNotFoundError:
+            continue
+    return ids
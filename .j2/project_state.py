@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""project_state — status figures and .j2/state.md: read, recounted and written by the runner."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import re
+
+from project_db import ProjectDB
+from status_index import StatusIndex
+
+STATE_NAME = "state.md"
+IDLE_NEXT = "/features-update (to add new features) or /deploy (to ship)"
+
+
+def prev_spec_gaps(root):
+    # Read spec gap count from the last state.md; default to 0 if missing or unparseable.
+    state_path = root / ".j2" / "state.md"
+    try:
+        match = re.search(r"(\d+)\s+spec gaps", state_path.read_text())
+        return match.group(1) if match else "0"
+    except FileNotFoundError:
+        return "0"
+
+
+def status_data(root, settings):
+    # Status fields from the incremental index (or the SQLite mirror) and state.md; None = unknown.
+    specs_dir = root / ".j2" / "specs"
+    spec_count = len(list(specs_dir.glob("*.md"))) if specs_dir.exists() else 0
+
+    index = ProjectDB.existing(root, settings) or StatusIndex(root, settings)
+    index.refresh()
+    index.save()
+
+    state_path = root / ".j2" / "state.md"
+    last_completed = next_cmd = None
+    if state_path.exists():
+        state_text = state_path.read_text()
+        m = re.search(r"^completed:\s*(.+)", state_text, re.MULTILINE)
+        if m:
+            last_completed = m.group(1).strip()
+        m = re.search(r"^next:\s*(.+)", state_text, re.MULTILINE)
+        if m:
+            next_cmd = m.group(1).strip()
+
+    return {
+        "root": str(root),
+        "specs": spec_count,
+        "features": index.status_counts(),
+        "missing_task_files": [{"id": fid, "priority": pri}
+                               for fid, pri in index.missing_features()],
+        "pending_tasks": index.pending_count(),
+        "pending_by_feature": index.pending_by_feature(),
+        "last_completed": last_completed,
+        "next": next_cmd,
+    }
+
+
+def format_status(data):
+    counts = data["features"]
+    missing = ", ".join(f"{m['id']} ({m['priority']})" for m in data["missing_task_files"])
+    lines = [
+        "Project Status",
+        "==============",
+        f"Specs:      {data['specs']}",
+        f"Features:   {counts['done']} done / {counts['in progress']} in progress / {counts['not started']} not started",
+        f"Missing task files: {missing or 'none'}",
+        f"Pending tasks: {data['pending_tasks']}",
+        f"Last completed: {data['last_completed'] or '(unknown)'}",
+        f"Next:       {data['next'] or '(unknown)'}",
+    ]
+    return "\n".join(lines)
+
+
+def compute_status(root, settings):
+    # Compute and return the final formatted status text directly.
+    return format_status(status_data(root, settings))
+
+
+def status_json(root, settings):
+    # One compact JSON object on one line, so a stream of them is also valid NDJSON.
+    return json.dumps(status_data(root, settings), separators=(",", ":"))
+
+
+def next_command(spec_gaps, missing, pending):
+    # The footer's priority order: spec gaps, then features without task files, then pending tasks.
+    if spec_gaps > 0:
+        return "/refresh"
+    if missing:
+        return f"/tasks-gen {missing[0]['id']}"
+    return "/task-next" if pending else IDLE_NEXT
+
+
+def state_text(completed, spec_gaps, data):
+    # The three state.md lines, from status_data's counts.
+    missing, pending = data["missing_task_files"], data["pending_tasks"]
+    return (f"completed: {completed}\n"
+            f"state: {spec_gaps} spec gaps | {len(missing)} features need tasks | "
+            f"{pending} tasks pending\n"
+            f"next: {next_command(spec_gaps, missing, pending)}\n")
+
+
+def write_state(root, text):
+    # Written beside state.md and renamed over it, so /continue never reads a half-written file.
+    path = root / ".j2" / STATE_NAME
+    tmp = path.with_name(f"{STATE_NAME}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def state_report(root, settings, args):
+    # `runner.py state`: recount and print the state lines; --sync also writes them to state.md.
+    # Unless given, spec gaps and the completed line carry over from the current state.md.
+    data = status_data(root, settings)
+    gaps = int(prev_spec_gaps(root)) if args.spec_gaps is None else args.spec_gaps
+    text = state_text(args.completed or data["last_completed"] or "(not recorded)", gaps, data)
+    if args.sync:
+        write_state(root, text)
+    return text.rstrip("\n")
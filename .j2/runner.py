@@ -3,41 +3,83 @@
 # Author: Pito Salas and Claude Code
 # Open Source Under MIT license
 
-import argparse
-import re
-import subprocess
 import sys
+
+import runner_client
+
+if __name__ == "__main__":
+    # As a script, hand the command to a running daemon before importing the rest of the runner.
+    runner_client.forward_main()
+
+import re
 from pathlib import Path
 
-import yaml
+from context_loader import run_loaders
+from feature_store import shard_features_file, unshard_features_file
+from file_stream import FileStream
+from metrics import append_record, metrics_record, metrics_report
+from parse_cache import ParseCache
+from profiler import Profiler
+from project_db import ProjectDB, run_query, sync_db
+from project_model import MANIFEST_NAME, PREAMBLE_NAME, ProjectModel
+from project_state import compute_status, prev_spec_gaps, state_report, status_json
+from spec_delta import ack_spec_delta, record_delivery, spec_delta
+from status_sync import sync_statuses
+from task_archive import TaskArchive, archive_tasks, pack_done, unpack_done
+from token_budget import apply_budget
+from warm_cache import WarmCache
 
 FOOTER = """
 ---
-End your response with exactly these three lines, formatted with markdown bold labels to make them visually distinct (nothing after them):
-\033[32mcompleted:\033[0m <one sentence: what was just done>
-\033[33mstate:\033[0m <N> spec gaps | <N> features need tasks | <N> tasks pending   ← replace each <N> with an actual integer count
-\033[36mnext:\033[0m <slash command — determined by this priority order:
-  1. If spec gaps > 0 (previous run reported {{prev_spec_gaps}} gaps) → /refresh
-  2. Else if not-done features lack task files ({{missing_tasks}}) → /tasks-gen <first listed>
-  3. Else if any tasks are pending → /task-next
-  4. Else (all features done, no pending tasks) → /features-update (to add new features) or /deploy (to ship)>
-
-Also write these three lines to .j2/state.md (overwriting it), without ANSI codes and without the markdown bold.
+When the work is done, record it with one command (it counts, so do not count yourself; before
+this step {{missing_count}} features needed tasks and {{pending_count}} tasks were pending):
+
+python3 .j2/runner.py state --sync --root . --completed - <<'J2_DONE'
+<one sentence: what was just done>
+J2_DONE
+
+Keep the quoted heredoc exactly as shown, so the shell never expands anything in the sentence.
+
+Add `--spec-gaps <N>` only if this step counted spec gaps (the previous run reported
+{{prev_spec_gaps}}). The runner recounts features needing task files and pending tasks, picks the
+next command (spec gaps > 0 → /refresh, else features lacking task files → /tasks-gen <first
+listed>, else pending tasks → /task-next, else /features-update or /deploy), and writes
+.j2/state.md itself, without ANSI codes. Do not edit state.md yourself.
+
+End your response with exactly the three lines it prints, formatted with markdown bold labels to
+make them visually distinct (nothing after them):
+\033[32mcompleted:\033[0m <as printed>
+\033[33mstate:\033[0m <as printed>
+\033[36mnext:\033[0m <as printed>
 """
 
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+FOOTER_SEGMENTS = PLACEHOLDER_RE.split(FOOTER)
+FOOTER_PLACEHOLDERS = set(FOOTER_SEGMENTS[1::2])
+
+
+def parse_yaml(raw):
+    # PyYAML is imported only on a config cache miss; the C loader is used when available.
+    import yaml
+    return yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def load_cached(root, path, parser):
+    # Parse a config or template file through the small "config" cache, persisting any miss.
+    cache = ParseCache.shared(root, "config")
+    data = cache.get(path, parser)[0]
+    cache.save()
+    return data
+
 
 def load_config(root):
-    # Read settings.yaml from the project's .j2/config directory.
-    path = root / ".j2" / "config" / "settings.yaml"
-    with open(path) as f:
-        return yaml.safe_load(f)
+    # Read settings.yaml, reusing the parsed snapshot in .j2/cache while the file is unchanged.
+    return load_cached(root, root / ".j2" / "config" / "settings.yaml", parse_yaml)
 
 
 def load_workflow(root):
-    # Read workflow.yaml and return the list of step definitions.
-    path = root / ".j2" / "config" / "workflow.yaml"
-    with open(path) as f:
-        return yaml.safe_load(f)["steps"]
+    # Read workflow.yaml and return the list of step definitions (snapshot-backed like settings).
+    return load_cached(root, root / ".j2" / "config" / "workflow.yaml", parse_yaml)["steps"]
 
 
 def find_step(workflow, command_id):
@@ -55,57 +97,128 @@ def load_template(root, settings, template_name):
     return (root / settings["j2"]["templates_dir"] / template_name).read_text()
 
 
+def compile_template(template):
+    # Pre-split into segments [literal, name, literal, ..., literal]: names sit at odd indices.
+    return PLACEHOLDER_RE.split(template)
+
+
+def load_segments(root, settings, template_name):
+    # Compiled template from .j2/cache, recompiled only when the template file changes.
+    path = root / settings["j2"]["templates_dir"] / template_name
+    return load_cached(root, path, lambda raw: compile_template(raw.decode()))
+
+
 def find_placeholders(template):
-    return set(re.findall(r"\{\{(\w+)\}\}", template))
+    return set(compile_template(template)[1::2])
+
+
+def render_segments(segments, context):
+    # Single join over segments; names missing from context are left
+    # as {{name}}, None renders empty.
+    parts = list(segments)
+    values = (context.get(name, f"{{{{{name}}}}}") for name in segments[1::2])
+    parts[1::2] = [str(v) if isinstance(v, FileStream) else v or "" for v in values]
+    return "".join(parts)
+
+
+def write_segments(segments, context, out):
+    # Streaming form of render_segments: FileStream values are copied to out from disk in chunks.
+    for i, seg in enumerate(segments):
+        value = seg if i % 2 == 0 else context.get(seg, f"{{{{{seg}}}}}")
+        if isinstance(value, FileStream):
+            value.write_to(out)
+        elif value:
+            out.write(value)
+
+
+def spec_source(root, settings):
+    # All .md files in the specs directory as one stream, separated by horizontal rules.
+    paths = sorted((root / settings["j2"]["specs_dir"]).glob("*.md"))
+    if not paths:
+        return "(no spec files found — add .md files to .j2/specs/ before running this command)"
+    return FileStream(paths, "\n\n---\n\n")
 
 
 def load_spec(root, settings):
     # Concatenate all .md files in the specs directory, separated by horizontal rules.
-    specs_dir = root / settings["j2"]["specs_dir"]
-    parts = [f.read_text() for f in sorted(specs_dir.glob("*.md"))]
-    if not parts:
-        return "(no spec files found — add .md files to .j2/specs/ before running this command)"
-    return "\n\n---\n\n".join(parts)
+    return str(spec_source(root, settings))
+
+
+def load_project(root, settings):
+    # Parse features.md (or reuse .j2/cache) and list the task directories once; loaders share it.
+    # It runs on the loader pool, so the shared cache is saved by the caller, never here.
+    return ProjectModel.load(root, settings, ParseCache.shared(root, "parse"))
+
+
+def features_store(project, settings):
+    # Where agents should read and edit features: features.md, or the per-feature shards.
+    if not project.shard_dir:
+        return f"`{settings['j2']['features_file']}`"
+    shards = Path(settings["j2"]["features_file"]).parent
+    return f"`{shards}/<ID>.md` (one file per feature, ordered by `{shards}/{MANIFEST_NAME}`)"
+
+
+def features_write(project, settings):
+    # How a step that rewrites the whole feature list must save it, so
+    # it never mixes the two layouts.
+    if not project.shard_dir:
+        return f"Write the complete feature list to `{settings['j2']['features_file']}`."
+    shards = Path(settings["j2"]["features_file"]).parent
+    return (
+        "This project stores one feature per file. Write each feature's `## <ID>` section "
+        f"to `{shards}/<ID>.md`, the status legend to `{shards}/{PREAMBLE_NAME}`, and every ID "
+        f"in order, one per line, to `{shards}/{MANIFEST_NAME}` (keep its `#` header line). "
+        "Any other `## ` section goes to its own `section-<n>.md`, listed in the manifest where "
+        "it belongs. Delete the files of removed features. Never create "
+        f"`{settings['j2']['features_file']}`: the runner refuses to run while both layouts exist."
+    )
 
 
-def load_features(root, settings):
-    # Read and return the full features file.
-    path = root / settings["j2"]["features_file"]
-    return path.read_text()
+def archive_command(root, settings, feature_id):
+    # Shell command /milestone runs to archive a task file: mv, or append to the packed archive.
+    tasks = settings["j2"]["tasks_dir"]
+    if TaskArchive(root / tasks).enabled():
+        return f"python3 .j2/runner.py tasks-archive --feature {feature_id} --root ."
+    return f"mv {tasks}/{feature_id}.md {tasks}/done/{feature_id}.md"
+
+
+def required_feature(args):
+    if not args.feature:
+        raise ValueError(f"{args.command} needs --feature")
+    return args.feature.upper()
+
+
+def required_target(args):
+    if not args.target:
+        raise ValueError(f"{args.command} needs --target")
+    return args.target
+
+
+def required_sql(args):
+    if not args.sql:
+        raise ValueError("db-query needs --sql")
+    return args.sql
 
 
 def filter_done_features(features_text):
     # Strip done feature sections, replace with a count summary.
-    sections = re.split(r"(?=^## F)", features_text, flags=re.MULTILINE)
-    kept = []
-    done_count = 0
-    for section in sections:
-        if section.startswith("## F") and re.search(r"\*\*Status\*\*:\s*done", section, re.IGNORECASE):
-            done_count += 1
-            continue
-        kept.append(section)
-    result = "".join(kept).rstrip()
-    if done_count > 0:
-        result += f"\n\n--- {done_count} completed features omitted ---\n"
-    return result
+    return ProjectModel.from_text(features_text).filtered()
 
 
 def load_tasks(root, settings, feature_id):
-    # Read and return the task file for a given feature ID; check done/ if not in active tasks.
+    # Stream the task file for a given feature ID; check done/, then the packed archive.
     tasks_dir = root / settings["j2"]["tasks_dir"]
     active = tasks_dir / f"{feature_id}.md"
     archived = tasks_dir / "done" / f"{feature_id}.md"
-    path = active if active.exists() else archived
-    return path.read_text()
+    if active.exists() or archived.exists():
+        return FileStream([active if active.exists() else archived], "")
+    packed = TaskArchive(tasks_dir).read(feature_id)
+    return packed.decode() if packed is not None else FileStream([archived], "")
 
 
 def extract_feature(features_text, feature_id):
     # Extract the markdown section for a single feature (e.g. ## F01 —) from the features file.
-    pattern = rf"(^## {re.escape(feature_id.upper())}\b.*?)(?=^## |\Z)"
-    match = re.search(pattern, features_text, re.MULTILINE | re.DOTALL | re.IGNORECASE)
-    if not match:
-        raise ValueError(f"Feature {feature_id.upper()!r} not found in features file.")
-    return match.group(1).strip()
+    return ProjectModel.from_text(features_text).section(feature_id)
 
 
 def extract_task(tasks_text, task_id):
@@ -117,152 +230,109 @@ def extract_task(tasks_text, task_id):
     return match.group(1).strip()
 
 
-def prev_spec_gaps(root):
-    # Read spec gap count from the last state.md; default to 0 if missing or unparseable.
-    state_path = root / ".j2" / "state.md"
-    try:
-        match = re.search(r"(\d+)\s+spec gaps", state_path.read_text())
-        return match.group(1) if match else "0"
-    except FileNotFoundError:
-        return "0"
+def project_queries(root, settings):
+    # The synced SQLite mirror when .j2/cache/j2.db exists, else the parsed markdown.
+    db = ProjectDB.existing(root, settings)
+    if db is None:
+        return load_project(root, settings)
+    return synced(db)
+
+
+def synced(db):
+    # Bring the mirror up to date with the markdown before answering from it.
+    db.refresh()
+    return db
 
 
 def missing_tasks_summary(root, settings):
     # Return comma-separated not-done features missing task files, sorted by priority.
-    priority_order = {"high": 0, "medium": 1, "low": 2}
-    try:
-        features_text = load_features(root, settings)
-    except FileNotFoundError:
-        return "none"
-    tasks_dir = root / settings["j2"]["tasks_dir"]
-    pattern = r"^## (F\d+) —.*?\n\*\*Priority\*\*: (\w+)\n\*\*Status\*\*: ([^\n|]+)"
-    missing = []
-    for fid, priority, status in re.findall(pattern, features_text, re.MULTILINE):
-        if status.strip().lower() == "done":
-            continue
-        if not (tasks_dir / f"{fid}.md").exists() and not (tasks_dir / "done" / f"{fid}.md").exists():
-            missing.append((priority_order.get(priority.lower(), 9), fid, priority))
-    missing.sort()
-    return ", ".join(f"{fid} ({pri})" for _, fid, pri in missing) or "none"
+    summary = project_queries(root, settings).missing_tasks()
+    ParseCache.shared(root, "parse").save()
+    return summary
 
 
 def find_default_feature(root, settings):
     # Return the first in-progress feature ID, or the first not-started feature ID.
-    try:
-        features_text = load_features(root, settings)
-    except FileNotFoundError:
-        return "F01"
-    pattern = r"^## (F\d+) —.*?\n\*\*Priority\*\*: \w+\n\*\*Status\*\*: ([^\n|]+)"
-    in_progress = None
-    not_started = None
-    for fid, status in re.findall(pattern, features_text, re.MULTILINE):
-        s = status.strip().lower()
-        if s == "in progress" and in_progress is None:
-            in_progress = fid
-        elif s == "not started" and not_started is None:
-            not_started = fid
-    return in_progress or not_started or "F01"
-
-
-def compute_status(root, settings):
-    # Compute and return the final formatted status text directly.
-    specs_dir = root / ".j2" / "specs"
-    spec_count = len(list(specs_dir.glob("*.md"))) if specs_dir.exists() else 0
+    feature_id = project_queries(root, settings).default_feature()
+    ParseCache.shared(root, "parse").save()
+    return feature_id
 
-    try:
-        features_text = load_features(root, settings)
-    except FileNotFoundError:
-        features_text = ""
 
-    pattern = r"^## (F\d+) —.*?\n\*\*Priority\*\*: \w+\n\*\*Status\*\*: ([^\n|]+)"
-    counts = {"done": 0, "in progress": 0, "not started": 0}
-    for _, status in re.findall(pattern, features_text, re.MULTILINE):
-        s = status.strip().lower()
-        if s in counts:
-            counts[s] += 1
+def clean_export(root, target):
+    # Copy the project to target, excluding all j2 infrastructure, then remove runner.py.
+    from tree_export import export_tree
+    return export_tree(root, target, False)[0]
 
-    missing = missing_tasks_summary(root, settings)
 
-    tasks_dir = root / settings["j2"]["tasks_dir"]
-    pending = 0
-    if tasks_dir.exists():
-        for tf in tasks_dir.glob("*.md"):
-            pending += tf.read_text().count("**Status**: not started")
+def export_command(root, args):
+    # `export`; imported here so other commands never load hashlib, shutil or tarfile.
+    from tree_export import run_export
+    return run_export(root, required_target(args), args.archive, args.link)
 
-    state_path = root / ".j2" / "state.md"
-    last_completed = next_cmd = "(unknown)"
-    if state_path.exists():
-        state_text = state_path.read_text()
-        m = re.search(r"^completed:\s*(.+)", state_text, re.MULTILINE)
-        if m:
-            last_completed = m.group(1).strip()
-        m = re.search(r"^next:\s*(.+)", state_text, re.MULTILINE)
-        if m:
-            next_cmd = m.group(1).strip()
-
-    lines = [
-        "Project Status",
-        "==============",
-        f"Specs:      {spec_count}",
-        f"Features:   {counts['done']} done / {counts['in progress']} in progress / {counts['not started']} not started",
-        f"Missing task files: {missing}",
-        f"Pending tasks: {pending}",
-        f"Last completed: {last_completed}",
-        f"Next:       {next_cmd}",
-    ]
-    return "\n".join(lines)
 
+def install_command(args):
+    # `install`; imported here since only installs need hashlib and a thread pool.
+    from fan_install import install_many
+    return install_many(args.targets or [required_target(args)], Path.cwd())
 
-def clean_export(root, target):
-    # Copy the project to target, excluding all j2 infrastructure, then remove runner.py.
-    target_path = Path(target).resolve()
-    target_path.mkdir(parents=True, exist_ok=True)
-    excludes = ["--exclude=.j2", "--exclude=scaffold", "--exclude=.claude", "--exclude=.coverage"]
-    subprocess.run(
-        ["rsync", "-a", *excludes, f"{root}/", f"{target_path}/"],
-        check=True,
-    )
-    residual = target_path / "runner.py"
-    if residual.exists():
-        residual.unlink()
-    return target_path
+
+def binary_stdout(args):
+    return args.command == "export" and args.target == "-"
 
 
 def fill_template(template, context):
     # Replace all {{key}} tokens in a single pass so substituted values are not re-scanned.
-    def replacer(match):
-        return context.get(match.group(1), match.group(0))
-    return re.sub(r"\{\{(\w+)\}\}", replacer, template)
+    return render_segments(compile_template(template), context)
 
 
 def build_context(root, settings, placeholders, args):
-    # Load each context value needed by the template, based on which placeholders are present.
+    # Load each context value the template needs; loaders name the shared resources they depend on.
+    prof = Profiler.current()
+    resources = {"project": prof.timed("resource:project", lambda: load_project(root, settings))}
+    p = ("project",)
+    # Feature/task lookups come from the SQLite mirror when it exists ("q"), else from the project.
+    q = p
+    db = ProjectDB.existing(root, settings)
+    if db:
+        resources["db"] = prof.timed("resource:db", lambda: synced(db))
+        q = ("db",)
+    none = "(not provided)"
     loaders = {
-        "spec":       lambda: load_spec(root, settings),
-        "rules":      lambda: (root / settings["j2"]["rules_file"]).read_text(),
-        "features":   lambda: filter_done_features(load_features(root, settings)),
-        "feature":    lambda: extract_feature(load_features(root, settings), args.feature) if args.feature else "(not provided)",
-        "tasks":      lambda: load_tasks(root, settings, args.feature) if args.feature else "(not provided)",
-        "task":       lambda: extract_task(load_tasks(root, settings, args.feature), args.task) if args.feature and args.task else "(not provided)",
-        "feature_id":       lambda: args.feature if args.feature else find_default_feature(root, settings),
-        "feature_arg_provided": lambda: "yes" if args.feature else "no",
-        "request":          lambda: args.request,
-        "target":           lambda: args.target,
-        "default_feature":  lambda: find_default_feature(root, settings),
-        "prev_spec_gaps": lambda: prev_spec_gaps(root),
-        "missing_tasks":  lambda: missing_tasks_summary(root, settings),
-        "state":          lambda: (root / ".j2" / "state.md").read_text(),
-        "deploy_mode":    lambda: "dev-repo" if (root / "scaffold").is_dir() else "export",
+        "spec":       ((), lambda r: spec_source(root, settings)),
+        "spec_delta": ((), lambda r: spec_delta(root, settings)),
+        "rules":      ((), lambda r: FileStream([root / settings["j2"]["rules_file"]], "")),
+        "features":   (p, lambda r: r["project"].filtered()),
+        "feature":    (p, lambda r: r["project"].section(args.feature) if args.feature else none),
+        "tasks":      ((), lambda r: load_tasks(root, settings, args.feature) if args.feature
+                             else none),
+        "task":       (q, lambda r: (r[q[0]].task_section(args.feature, args.task)
+                                     if args.feature and args.task else none)),
+        "feature_id":       (q, lambda r: args.feature or r[q[0]].default_feature()),
+        "feature_arg_provided": ((), lambda r: "yes" if args.feature else "no"),
+        "request":          ((), lambda r: args.request),
+        "target":           ((), lambda r: args.target),
+        "default_feature":  (q, lambda r: r[q[0]].default_feature()),
+        "next_task":        (q, lambda r: r[q[0]].next_task(r[q[0]].default_feature())),
+        "prev_spec_gaps": ((), lambda r: prev_spec_gaps(root)),
+        "missing_tasks":  (q, lambda r: r[q[0]].missing_tasks()),
+        "missing_count":  (q, lambda r: str(len(r[q[0]].missing_features()))),
+        "pending_count":  (q, lambda r: str(r[q[0]].pending_count())),
+        "state":          ((), lambda r: (root / ".j2" / "state.md").read_text()),
+        "deploy_mode":    ((), lambda r: "dev-repo" if (root / "scaffold").is_dir() else "export"),
+        "features_store": (p, lambda r: features_store(r["project"], settings)),
+        "features_write": (p, lambda r: features_write(r["project"], settings)),
+        "archive_command": (q, lambda r: archive_command(
+            root, settings, args.feature or r[q[0]].default_feature())),
     }
-    context = {}
-    for placeholder in placeholders:
-        if placeholder not in loaders:
-            print(f"Warning: no loader for placeholder {{{{{placeholder}}}}}", file=sys.stderr)
-            continue
-        try:
-            context[placeholder] = loaders[placeholder]()
-        except FileNotFoundError as e:
-            context[placeholder] = f"(not yet available: {e.filename})"
+    for placeholder in sorted(placeholders - loaders.keys()):
+        print(f"Warning: no loader for placeholder {{{{{placeholder}}}}}", file=sys.stderr)
+    selected = {k: (deps, prof.timed(f"loader:{k}", fn))
+                for k, (deps, fn) in loaders.items() if k in placeholders}
+    context = run_loaders(selected, resources)
+    # Shared caches are written here, after the loader pool has finished with them.
+    if "spec_delta" in context:
+        context["spec_delta"] = record_delivery(root, context["spec_delta"])
+    ParseCache.shared(root, "parse").save()
     return context
 
 
@@ -278,36 +348,148 @@ def resolve_next_command(root, args):
         args.feature = match.group(2)
 
 
-def main():
+def run_command(root, args, warm, out):
+    # Write the prompt (or status text) for one parsed command line to out.
+    if args.command == "continue":
+        resolve_next_command(root, args)
+    config_dir = root / ".j2" / "config"
+    prof = Profiler.current()
+    with prof.phase("config"):
+        settings = warm.get("settings", [config_dir / "settings.yaml"], lambda: load_config(root))
+    utilities = {
+        "status": lambda: (status_json if args.json else compute_status)(root, settings),
+        "state": lambda: state_report(root, settings, args),
+        "metrics": lambda: metrics_report(root),
+        "features-shard": lambda: shard_features_file(root, settings),
+        "features-unshard": lambda: unshard_features_file(root, settings),
+        "tasks-pack": lambda: pack_done(root, settings),
+        "tasks-unpack": lambda: unpack_done(root, settings),
+        "tasks-archive": lambda: archive_tasks(root, settings, required_feature(args)),
+        "export": lambda: export_command(root, args),
+        "install": lambda: install_command(args),
+        "db-sync": lambda: sync_db(root, settings),
+        "sync-status": lambda: sync_statuses(root, settings),
+        "spec-ack": lambda: ack_spec_delta(root),
+        "db-query": lambda: run_query(root, required_sql(args)),
+    }
+    if args.command in utilities:
+        with prof.phase(args.command):
+            text = utilities[args.command]()
+        prof.record_placeholders([[text]], {})
+        out.write(text)
+        return
+    with prof.phase("workflow"):
+        workflow = warm.get("workflow", [config_dir / "workflow.yaml"], lambda: load_workflow(root))
+        step = find_step(workflow, args.command)
+    template_path = root / settings["j2"]["templates_dir"] / step["template"]
+    with prof.phase("template"):
+        segments = warm.get(template_path, [template_path],
+                            lambda: load_segments(root, settings, step["template"]))
+    placeholders = set(segments[1::2]) | FOOTER_PLACEHOLDERS
+    with prof.phase("context"):
+        context = build_context(root, settings, placeholders, args)
+    if "max_tokens" in step:
+        with prof.phase("budget"):
+            context, report = apply_budget(step, [segments, FOOTER_SEGMENTS], context)
+        for line in report:
+            print(line, file=sys.stderr)
+    prof.record_placeholders([segments, FOOTER_SEGMENTS], context)
+    with prof.phase("output"):
+        write_segments(segments, context, out)
+        write_segments(FOOTER_SEGMENTS, context, out)
+
+
+def run_invocation(root, args, warm, argv):
+    # Run one parsed command under the profiler, log it to metrics.jsonl, return the exit code.
+    # Only --profile counts every file read; that patches open for the whole process.
+    prof = Profiler(root)
+    prof.start(bool(args.profile))
+    code = 0
+    try:
+        run_command(root, args, warm, sys.stdout)
+        if not binary_stdout(args):
+            print()
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        code = 1
+    finally:
+        prof.stop()
+    if args.profile:
+        prof.write_report(argv, args.profile)
+    append_record(root, metrics_record(args, prof, code))
+    return code
+
+
+def build_parser():
+    # argparse is imported here so commands forwarded to the daemon never load it.
+    import argparse
     parser = argparse.ArgumentParser(description="j2 template runner")
-    parser.add_argument("command", help="Workflow command ID (e.g. task-next), or 'continue' to read from state.md")
+    parser.add_argument("command", help=(
+        "Workflow command ID (e.g. task-next), 'continue' to read from state.md, 'state' to "
+        "recount it (--sync writes it), 'metrics' for the telemetry rollup, "
+        "'features-shard'/'features-unshard' to change the features layout, "
+        "'tasks-pack'/'tasks-unpack'/'tasks-archive' for the packed tasks/done archive, "
+        "'db-sync'/'db-query' for the SQLite mirror, 'sync-status' to mark features with all "
+        "tasks done, 'spec-ack' after a {{spec_delta}} step, 'export' for a clean copy or tar "
+        "archive at --target, 'install' to install the scaffold into --targets, or 'serve' to "
+        "start the daemon"))
     parser.add_argument("--feature", default=None, help="Feature ID (e.g. F01)")
     parser.add_argument("--task", default=None, help="Task ID (e.g. T01)")
     parser.add_argument("--request", default=None, help="Refinement request text")
     parser.add_argument("--target", default=None, help="Target directory (for deploy)")
+    parser.add_argument("--completed", default=None,
+                        help="state: one-sentence summary of the step just done ('-' reads stdin)")
+    parser.add_argument("--spec-gaps", type=int, default=None,
+                        help="state: spec gaps counted by this step (default: keep)")
+    parser.add_argument("--sync", action="store_true",
+                        help="state: also write the lines to .j2/state.md")
+    parser.add_argument("--json", action="store_true",
+                        help="status: print one JSON object instead of text")
+    parser.add_argument("--sql", default=None, help="Read-only SQL for db-query")
+    parser.add_argument("--archive", choices=["tar", "tar.gz", "tar.xz"], default=None,
+                        help="export: write a tar archive (default: from the --target suffix; "
+                             "needed for -)")
+    parser.add_argument("--link", action="store_true",
+                        help="export: hardlink files into the target instead of copying")
+    parser.add_argument("--targets", action="append", default=None,
+                        help="install: target directory or glob (repeatable, ** allowed); "
+                             "installs run in parallel")
     parser.add_argument("--root", default=".", help="Project root directory (default: cwd)")
-    args = parser.parse_args()
+    parser.add_argument("--roots", action="append", default=None,
+                        help="Glob of project roots (repeatable, ** allowed); "
+                             "runs the command in each in parallel")
+    parser.add_argument("--profile", nargs="?", const="-", default=None,
+                        help="Write a JSON profile (timings, bytes read, placeholder sizes) "
+                             "to stderr or FILE")
+    return parser
+
+
+def main():
+    runner_client.forward_main()
+    local_main()
+
 
+def local_main():
+    # Run the command in this process; main and the script entry have already tried the daemon.
+    argv = sys.argv[1:]
+    args = build_parser().parse_args(argv)
     root = Path(args.root).resolve()
 
-    try:
-        if args.command == "continue":
-            resolve_next_command(root, args)
-        settings = load_config(root)
-        if args.command == "status":
-            print(compute_status(root, settings))
-            return
-        workflow = load_workflow(root)
-        step = find_step(workflow, args.command)
-        template = load_template(root, settings, step["template"])
-        placeholders = find_placeholders(template)
-        footer_placeholders = find_placeholders(FOOTER)
-        context = build_context(root, settings, placeholders | footer_placeholders, args)
-        print(fill_template(template, context) + fill_template(FOOTER, context))
-    except (FileNotFoundError, KeyError, ValueError) as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+    if args.roots:
+        # Imported here: only batch runs need the process pool.
+        import multi_root
+        sys.exit(multi_root.run_roots(args.roots, argv, Path.cwd()))
+
+    if args.command == "serve":
+        # Imported here: runner_daemon imports runner, and only `serve` needs it.
+        import runner_daemon
+        runner_daemon.serve(root)
+        return
+
+    code = run_invocation(root, args, WarmCache(), argv)
+    if code:
+        sys.exit(code)
 
 
 if __name__ == "__main__":
-    main()
+    local_main()
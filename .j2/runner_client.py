@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""runner_client — thin client that forwards runner argv to a `runner.py serve` daemon."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import stat
+import sys
+import zlib
+from pathlib import Path
+
+# runner.py options that take no value (build_parser's store_true flags, plus help).
+FLAG_OPTIONS = {"--sync", "--json", "--link", "-h", "--help"}
+# Always run in the calling process: a daemon serves a single root, so --roots fans out here; a
+# profile must cover the whole invocation; exports may stream binary; installs resolve their
+# targets against this process's cwd.
+LOCAL_COMMANDS = ("serve", "export", "install")
+LOCAL_OPTIONS = ("--profile", "--roots")
+
+
+def socket_path(root):
+    # Per-user directory keeps the socket short (AF_UNIX limit) and private to this user:
+    # $XDG_RUNTIME_DIR is already private; a shared TMPDIR gets checked by private_dir.
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        base = Path(runtime) / "j2"
+    else:
+        base = Path(os.environ.get("TMPDIR", "/tmp")) / f"j2-{os.getuid()}"
+    return base / f"{zlib.crc32(str(root).encode()):08x}.sock"
+
+
+def private_dir(path):
+    # A real directory owned by this user that nobody else can enter; another user could have
+    # created a predictable /tmp name first and serve forged prompts from it.
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def root_from_argv(argv):
+    # Find --root without importing argparse; mirrors runner.py's default of cwd.
+    for i, arg in enumerate(argv):
+        if arg == "--root" and i + 1 < len(argv):
+            return Path(argv[i + 1]).resolve()
+        if arg.startswith("--root="):
+            return Path(arg.split("=", 1)[1]).resolve()
+    return Path.cwd()
+
+
+def command_from_argv(argv):
+    # The positional command as argparse would find it, without importing argparse: every other
+    # option takes a value, as the next argument unless written --opt=value.
+    takes_value = False
+    for arg in argv:
+        if takes_value:
+            takes_value = False
+        elif arg.startswith("-"):
+            takes_value = "=" not in arg and arg not in FLAG_OPTIONS
+        else:
+            return arg
+    return None
+
+
+def stdin_values(argv):
+    # `--completed -` takes the text from stdin (the footer's quoted heredoc), read here before any
+    # forwarding, so model-written text never goes through shell expansion or quoting.
+    return [sys.stdin.read().strip() if arg == "-" and argv[i - 1:i] == ["--completed"] else arg
+            for i, arg in enumerate(argv)]
+
+
+def forward(root, argv):
+    # Send argv to the daemon serving root and stream its reply; None if no daemon answers.
+    path = socket_path(root)
+    if not path.exists() or not private_dir(path.parent):
+        return None
+    # Imported only once a daemon socket exists, keeping the no-daemon path cheap.
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        sock.close()
+        return None
+    with sock, sock.makefile("rb") as reply:
+        sock.sendall(json.dumps({"argv": argv, "cwd": os.getcwd()}).encode() + b"\n")
+        meta = read_reply(reply, sys.stdout.buffer)
+    sys.stdout.flush()
+    if meta is None:
+        return None
+    sys.stderr.write(meta["err"])
+    return meta["code"]
+
+
+def read_reply(reply, out):
+    # Copy the daemon's output frames ("<hex length>\n<bytes>", ended by "0\n") to
+    # out as they arrive, then return the trailer {"code", "err"}; None if the daemon
+    # hung up before sending anything.
+    started = False
+    while True:
+        line = reply.readline()
+        if not line:
+            if not started:
+                return None
+            return {"code": 1, "err": "Error: the runner daemon closed the connection mid-reply\n"}
+        started = True
+        size = int(line, 16)
+        if not size:
+            return json.loads(reply.readline())
+        out.write(reply.read(size))
+
+
+def forward_main():
+    # Entry point for both scripts: exits with the daemon's code if one ran the command, else
+    # returns so the caller runs it locally. Reads any `-` value from stdin first, exactly once.
+    sys.argv[1:] = stdin_values(sys.argv[1:])
+    argv = sys.argv[1:]
+    if command_from_argv(argv) in LOCAL_COMMANDS or any(a.startswith(LOCAL_OPTIONS) for a in argv):
+        return
+    code = forward(root_from_argv(argv), argv)
+    if code is not None:
+        sys.exit(code)
+
+
+if __name__ == "__main__":
+    forward_main()
+    import runner
+    runner.local_main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""runner_daemon — resident runner serving rendered prompts over a Unix domain socket."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+from pathlib import Path
+
+import runner
+from runner_client import private_dir, socket_path
+from warm_cache import WarmCache
+
+FRAME_BYTES = 64 * 1024
+
+
+class RunnerDaemon(socketserver.UnixStreamServer):
+    """Keeps config, workflow, templates and the parse cache warm across requests for one root."""
+
+    def __init__(self, root):
+        self.root = root
+        self.warm = WarmCache()
+        path = socket_path(root)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not private_dir(path.parent):
+            raise PermissionError(
+                f"{path.parent} must be a directory owned by this user with mode 0700")
+        path.unlink(missing_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def execute(self, argv, cwd, wfile):
+        # Run one command line as runner.main would, streaming stdout to wfile in frames as it is
+        # produced (so memory stays bounded); return (exit code, stderr) for the trailer.
+        out = io.TextIOWrapper(io.BufferedWriter(FrameWriter(wfile), FRAME_BYTES), encoding="utf-8")
+        err = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = self.run_argv(argv, cwd)
+        out.flush()
+        return code, err.getvalue()
+
+    def run_argv(self, argv, cwd):
+        try:
+            args = runner.build_parser().parse_args(argv)
+        except SystemExit as e:
+            return e.code
+        root = (Path(cwd) / args.root).resolve()
+        if root != self.root:
+            print(f"Error: daemon serves {self.root}, not {root}", file=sys.stderr)
+            return 1
+        return runner.run_invocation(root, args, self.warm, argv)
+
+    def server_close(self):
+        super().server_close()
+        socket_path(self.root).unlink(missing_ok=True)
+
+
+class FrameWriter(io.RawIOBase):
+    """Raw stream that sends each buffered write as one "<hex length>\\n<bytes>" frame."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        # An empty frame would end the reply, so it is never sent.
+        if data:
+            self.wfile.write(b"%x\n" % len(data))
+            self.wfile.write(data)
+        return len(data)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Output frames, then "0\n" and a JSON trailer with the exit code and stderr.
+        request = json.loads(self.rfile.readline())
+        code, err = self.server.execute(request["argv"], request["cwd"], self.wfile)
+        self.wfile.write(b"0\n" + json.dumps({"code": code, "err": err}).encode() + b"\n")
+
+
+def serve(root):
+    # Serve requests until interrupted or terminated; requests are handled one at a time.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        daemon = RunnerDaemon(root)
+    except PermissionError as e:
+        sys.exit(f"Error: {e}")
+    with daemon:
+        print(f"j2 runner serving {root} on {socket_path(root)}", file=sys.stderr)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""spec_delta — spec sections changed since the last acknowledged {{spec_delta}}, plus a TOC."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import re
+
+from cache_dir import cache_dir
+from parse_cache import ParseCache
+from project_model import read_span
+
+BASELINE_NAME = "spec_delta.json"
+# What the last render delivered; `runner.py spec-ack` promotes it to the baseline.
+PENDING_NAME = "spec_delta.pending.json"
+HEADING_RE = re.compile(rb"^#{1,6} [^\n]*", re.MULTILINE)
+
+
+def section_records(raw):
+    # [heading, sha1, start, end] per heading-delimited section; text
+    # before any heading is the preamble.
+    import hashlib  # only spec_delta needs hashing; keep it off the common startup path
+    bounds = [0] + [m.start() for m in HEADING_RE.finditer(raw) if m.start()] + [len(raw)]
+    records = []
+    for start, end in zip(bounds, bounds[1:]):
+        head = HEADING_RE.match(raw, start)
+        heading = head.group().decode().strip() if head else "(preamble)"
+        records.append([heading, hashlib.sha1(raw[start:end]).hexdigest(), start, end])
+    return records
+
+
+def section_keys(path, records):
+    # "spec.md: ## Goals", with a #n suffix when a heading repeats within the file.
+    seen = {}
+    for heading, digest, start, end in records:
+        seen[heading] = seen.get(heading, 0) + 1
+        suffix = f" #{seen[heading]}" if seen[heading] > 1 else ""
+        yield f"{path.name}: {heading}{suffix}", digest, start, end
+
+
+def spec_delta(root, settings):
+    # (text, section hashes) compared with the acknowledged baseline. Runs on the loader pool, so it
+    # writes nothing: build_context records the hashes once every loader has finished.
+    paths = sorted((root / settings["j2"]["specs_dir"]).glob("*.md"))
+    if not paths:
+        return "(no spec files found — add .md files to .j2/specs/ before running this command)", {}
+    previous = read_baseline(root / ".j2" / "cache" / BASELINE_NAME)
+    cache = ParseCache.shared(root, "parse")
+    current, changed, unchanged = {}, [], []
+    for path in paths:
+        for key, digest, start, end in section_keys(path, cache.get(path, section_records)[0]):
+            current[key] = digest
+            if previous.get(key) == digest:
+                unchanged.append(key)
+            else:
+                label = "changed" if key in previous else "added"
+                body = read_span(path, start, end).rstrip()
+                changed.append(f"<!-- {key} ({label}) -->\n{body}\n")
+    removed = [key for key in previous if key not in current]
+    return format_delta(changed, unchanged, removed), current
+
+
+def format_delta(changed, unchanged, removed):
+    lines = [
+        f"Spec delta since the last spec-ack: {len(changed)} changed or added, "
+        f"{len(unchanged)} unchanged, {len(removed)} removed sections.",
+    ]
+    if changed:
+        lines += ["", "### Changed and added sections", "", *changed]
+    if unchanged:
+        lines += ["", "### Unchanged sections (read the spec files if you need them)", ""]
+        lines += [f"- {key}" for key in unchanged]
+    if removed:
+        lines += ["", "### Removed sections", ""] + [f"- {key}" for key in removed]
+    return "\n".join(lines)
+
+
+def record_delivery(root, result):
+    # Keep the hashes of a rendered delta as pending and return its text; a loader's
+    # "(not yet available ...)" note is passed through and records nothing.
+    if not isinstance(result, tuple):
+        return result
+    text, hashes = result
+    if hashes:
+        write_baseline(root, PENDING_NAME, hashes)
+    return text
+
+
+def ack_spec_delta(root):
+    # Promote the last rendered delta to the baseline, once the model has actually worked on it.
+    cache = root / ".j2" / "cache"
+    try:
+        os.replace(cache / PENDING_NAME, cache / BASELINE_NAME)
+    except FileNotFoundError:
+        raise ValueError("No rendered spec delta to acknowledge; "
+                         "run a step that uses {{spec_delta}} first.")
+    delivered = len(read_baseline(cache / BASELINE_NAME))
+    return f"Spec delta acknowledged: {delivered} sections recorded as delivered."
+
+
+def read_baseline(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_baseline(root, name, hashes):
+    path = cache_dir(root) / name
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(hashes))
+    os.replace(tmp, path)
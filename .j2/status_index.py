@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""status_index — /status counts kept in .j2/cache/status.json and refreshed from file stamps."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import time
+
+from cache_dir import cache_dir
+from project_model import (
+    MANIFEST_NAME,
+    PENDING_MARK,
+    PRIORITY_ORDER,
+    check_single_layout,
+    feature_records,
+    read_manifest,
+)
+from task_archive import TaskArchive
+from warm_cache import RACY_NS
+
+INDEX_VERSION = 1
+NO_FEATURES = {"stamp": None, "counts": {"done": 0, "in progress": 0, "not started": 0}, "open": []}
+
+
+class StatusIndex:
+    """Feature counts, open features and pending counts per task file; reads only changed files."""
+
+    def __init__(self, root, settings):
+        self.root = root
+        self.path = root / ".j2" / "cache" / "status.json"
+        self.features_path = root / settings["j2"]["features_file"]
+        self.tasks_dir = root / settings["j2"]["tasks_dir"]
+        data = read_index(self.path)
+        self.features = data.get("features", NO_FEATURES)
+        self.tasks = data.get("tasks", {})
+        self.task_ids = set()
+        self.dirty = False
+
+    def refresh(self):
+        # Re-read features.md (or changed shards) if stamps changed, then rescan task files.
+        self.refresh_features()
+        self.refresh_tasks()
+
+    def refresh_features(self):
+        try:
+            st = os.stat(self.features_path)
+        except FileNotFoundError:
+            self.refresh_missing_features()
+            return
+        check_single_layout(self.features_path)
+        if self.features["stamp"] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+            return
+        rows = [r[:3] for r in feature_records(self.features_path.read_bytes())]
+        self.features = dict(summarize(rows), stamp=settled_stamp(st))
+        self.dirty = True
+
+    def refresh_missing_features(self):
+        # No features.md: use the sharded layout if a manifest exists, else report no features.
+        if (self.features_path.parent / MANIFEST_NAME).exists():
+            self.refresh_shards()
+            return
+        self.dirty = self.dirty or self.features != NO_FEATURES
+        self.features = NO_FEATURES
+
+    def refresh_shards(self):
+        # One stamp per shard, so editing a feature re-reads only its file.
+        shard_dir = self.features_path.parent
+        base = os.path.join(shard_dir, "")
+        old = self.features.get("shards", {})
+        shards = {}
+        for fid in read_manifest(shard_dir):
+            st = os.stat(f"{base}{fid}.md")
+            cached = old.get(fid)
+            if cached and cached[:3] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+                shards[fid] = cached
+                continue
+            with open(f"{base}{fid}.md", "rb") as f:
+                records = feature_records(f.read())
+            fields = records[0][1:3] if records else ["", ""]
+            shards[fid] = (settled_stamp(st) or [None, None, None]) + fields
+            self.dirty = True
+        self.dirty = self.dirty or shards.keys() != old.keys()
+        rows = [(fid, entry[3], entry[4]) for fid, entry in shards.items()]
+        self.features = dict(summarize(rows), stamp=None, shards=shards)
+
+    def refresh_tasks(self):
+        # Active files are stamped and recounted only when changed; archives only contribute IDs.
+        tasks = {}
+        for entry in scan_md(self.tasks_dir):
+            st = entry.stat()
+            cached = self.tasks.get(entry.name)
+            if cached and cached[:3] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+                tasks[entry.name] = cached
+                continue
+            with open(entry.path, "rb") as f:
+                pending = f.read().count(PENDING_MARK)
+            tasks[entry.name] = (settled_stamp(st) or [None, None, None]) + [pending]
+            self.dirty = True
+        self.dirty = self.dirty or tasks.keys() != self.tasks.keys()
+        self.tasks = tasks
+        self.task_ids = {name[:-3] for name in tasks}
+        self.task_ids.update(e.name[:-3] for e in scan_md(self.tasks_dir / "done"))
+        self.task_ids.update(TaskArchive(self.tasks_dir).index())
+
+    def status_counts(self):
+        return self.features["counts"]
+
+    def missing_features(self):
+        # (id, priority) of open features without a task file, by priority.
+        return [(fid, pri) for _, fid, pri in self.features["open"] if fid not in self.task_ids]
+
+    def missing_tasks(self):
+        # Same text as ProjectModel.missing_tasks.
+        return ", ".join(f"{fid} ({pri})" for fid, pri in self.missing_features()) or "none"
+
+    def pending_count(self):
+        return sum(entry[3] for entry in self.tasks.values())
+
+    def pending_by_feature(self):
+        # Not-started task count per active task file that has any.
+        return {name[:-3]: entry[3] for name, entry in sorted(self.tasks.items()) if entry[3]}
+
+    def save(self):
+        # Atomic write; a read-only checkout just rescans every time.
+        if not self.dirty:
+            return
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_dir(self.root)
+            tmp.write_text(json.dumps(
+                {"version": INDEX_VERSION, "features": self.features, "tasks": self.tasks}))
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self.dirty = False
+
+
+def summarize(rows):
+    # Status counts and priority-sorted open features from (id, priority, status) rows.
+    counts = dict(NO_FEATURES["counts"])
+    open_features = []
+    for fid, priority, status in rows:
+        if status in counts:
+            counts[status] += 1
+        if priority and status != "done":
+            open_features.append([PRIORITY_ORDER.get(priority.lower(), 9), fid, priority])
+    open_features.sort()
+    return {"counts": counts, "open": open_features}
+
+
+def settled_stamp(st):
+    # None for a file modified within the racy window, so it is re-read next time.
+    if time.time_ns() - st.st_mtime_ns <= RACY_NS:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def scan_md(folder):
+    # *.md entries of folder, as Path.glob("*.md") would list them; empty if it does not exist.
+    try:
+        with os.scandir(folder) as entries:
+            return [e for e in entries if e.name.endswith(".md") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def read_index(path):
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == INDEX_VERSION else {}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""status_sync — mark features done whose tasks are all done, in one pass over the project."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+
+from feature_store import write_atomic
+from parse_cache import ParseCache
+from project_model import (
+    MANIFEST_NAME,
+    STATUS_RE,
+    check_single_layout,
+    feature_records,
+    read_manifest,
+    task_records,
+)
+from task_archive import TaskArchive
+
+
+def sync_statuses(root, settings):
+    # Rewrite the Status of each not-done feature whose tasks are finished; returns a compact diff.
+    features_path = root / settings["j2"]["features_file"]
+    tasks_dir = root / settings["j2"]["tasks_dir"]
+    cache = ParseCache.shared(root, "parse")
+    packed = TaskArchive(tasks_dir).index()
+
+    def finished(fid):
+        return tasks_finished(tasks_dir, fid, cache, packed)
+
+    changes = []
+    for path, single in feature_files(features_path):
+        changes += sync_file(root, path, single, finished)
+    cache.save()
+    if not changes:
+        return "Status sync: no changes."
+    marked = sum(line.startswith("+") for line in changes)
+    return "\n".join([f"Status sync: {marked} features marked done"] + changes)
+
+
+def feature_files(features_path):
+    # (path, whether it holds a single feature): features.md, else each manifest-listed shard.
+    if features_path.exists():
+        check_single_layout(features_path)
+        return [(features_path, False)]
+    shard_dir = features_path.parent
+    if not (shard_dir / MANIFEST_NAME).exists():
+        return []
+    return [(shard_dir / f"{fid}.md", True) for fid in read_manifest(shard_dir)]
+
+
+def tasks_finished(tasks_dir, fid, cache, packed):
+    # An active task file counts only when every task in it is done; an archived one always counts.
+    active = tasks_dir / f"{fid}.md"
+    if active.exists():
+        tasks = cache.get(active, task_records)[0]["tasks"]
+        return bool(tasks) and all(status == "done" for _, status, _, _ in tasks)
+    return (tasks_dir / "done" / f"{fid}.md").exists() or fid in packed
+
+
+def sync_file(root, path, single, finished):
+    # Edit the Status words in place, byte for byte elsewhere; written atomically only if changed.
+    raw = path.read_bytes()
+    records = feature_records(raw)
+    edits, changes = [], []
+    for fid, _, status, start, end in records[:1] if single else records:
+        match = STATUS_RE.search(raw, start, end)
+        if match is None or status == "done" or not finished(fid):
+            continue
+        # Keep the spacing before any `| Tests written` fields that follow the status word.
+        value = match.group(1)
+        new = b"done" + value[len(value.rstrip()):]
+        edits.append((match.start(1), match.end(1), new))
+        line_end = raw.find(b"\n", match.start())
+        line_end = line_end if line_end >= 0 else len(raw)
+        old_line = raw[match.start():line_end]
+        new_line = raw[match.start():match.start(1)] + new + raw[match.end(1):line_end]
+        changes += [f"{fid} ({os.path.relpath(path, root)})",
+                    f"-{old_line.decode()}", f"+{new_line.decode()}"]
+    for start, end, new in reversed(edits):
+        raw = raw[:start] + new + raw[end:]
+    if edits:
+        write_atomic(path, raw)
+    return changes
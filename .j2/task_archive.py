@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""task_archive — opt-in packed tasks/done: one append-only file plus a feature ID offset index."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+
+PACK_NAME = "done.pack"
+INDEX_NAME = "done.idx"
+
+
+class TaskArchive:
+    """Archived task files appended to tasks/done.pack; done.idx lines are `FID offset length`."""
+
+    def __init__(self, tasks_dir):
+        self.tasks_dir = tasks_dir
+        self.pack = tasks_dir / PACK_NAME
+        self.index_path = tasks_dir / INDEX_NAME
+        self.entries = None
+
+    def enabled(self):
+        return self.pack.exists()
+
+    def index(self):
+        # Latest (offset, length) per feature ID; a later line for the
+        # same ID supersedes earlier ones.
+        if self.entries is None:
+            self.entries = {}
+            if self.index_path.exists():
+                for line in self.index_path.read_text().splitlines():
+                    parts = line.split()
+                    if len(parts) == 3:
+                        self.entries[parts[0]] = (int(parts[1]), int(parts[2]))
+        return self.entries
+
+    def read(self, feature_id):
+        # One entry by seek; None if the feature is not in the pack.
+        entry = self.index().get(feature_id)
+        if entry is None:
+            return None
+        with open(self.pack, "rb") as f:
+            f.seek(entry[0])
+            return f.read(entry[1])
+
+    def append(self, feature_id, data):
+        # Data first, then its index line, under an exclusive lock so offsets never collide.
+        import fcntl  # only archiving needs the lock
+        with open(self.pack, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+            f.flush()
+            with open(self.index_path, "a") as idx:
+                idx.write(f"{feature_id} {offset} {len(data)}\n")
+        if self.entries is not None:
+            self.entries[feature_id] = (offset, len(data))
+
+
+def pack_done(root, settings):
+    # Move every loose tasks/done/*.md into the pack; creating the pack opts the project in.
+    archive = TaskArchive(root / settings["j2"]["tasks_dir"])
+    archive.pack.touch()
+    loose = sorted((archive.tasks_dir / "done").glob("*.md"))
+    for path in loose:
+        archive.append(path.stem, path.read_bytes())
+        path.unlink()
+    return f"Packed {len(loose)} archived task files into {os.path.relpath(archive.pack, root)}."
+
+
+def unpack_done(root, settings):
+    # Write the latest entry for every feature back to tasks/done/<ID>.md, then drop the pack.
+    archive = TaskArchive(root / settings["j2"]["tasks_dir"])
+    if not archive.enabled():
+        raise ValueError(f"No packed archive at {os.path.relpath(archive.pack, root)}.")
+    done_dir = archive.tasks_dir / "done"
+    done_dir.mkdir(exist_ok=True)
+    for fid in archive.index():
+        (done_dir / f"{fid}.md").write_bytes(archive.read(fid))
+    archive.pack.unlink()
+    archive.index_path.unlink(missing_ok=True)
+    return f"Unpacked {len(archive.index())} task files into {os.path.relpath(done_dir, root)}/."
+
+
+def archive_tasks(root, settings, feature_id):
+    # /milestone's archive step: into the pack when enabled, else tasks/done/<ID>.md.
+    archive = TaskArchive(root / settings["j2"]["tasks_dir"])
+    active = archive.tasks_dir / f"{feature_id}.md"
+    if not active.exists():
+        return f"{feature_id} has no active task file; nothing to archive."
+    if archive.enabled():
+        archive.append(feature_id, active.read_bytes())
+        active.unlink()
+        return f"Archived {feature_id} into {os.path.relpath(archive.pack, root)}."
+    (archive.tasks_dir / "done").mkdir(exist_ok=True)
+    os.replace(active, archive.tasks_dir / "done" / f"{feature_id}.md")
+    return f"Archived {feature_id} to {os.path.relpath(archive.tasks_dir, root)}/done/."
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""token_budget — approximate token counts and per-placeholder trimming to fit a step's budget."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import re
+
+from file_stream import FileStream
+from project_model import PRIORITY_ORDER
+
+CHARS_PER_TOKEN = 4
+SECTION_SPLIT_RE = re.compile(r"(?=^#{2,3} )", re.MULTILINE)
+PRIORITY_RE = re.compile(r"^\*\*Priority\*\*:\s*(\w+)", re.MULTILINE)
+DONE_RE = re.compile(r"^\*\*Status\*\*:\s*done\b", re.MULTILINE | re.IGNORECASE)
+
+
+def value_size(value):
+    # Rendered length of a context value; file-backed values are sized
+    # with stat instead of being read.
+    return value.size() if isinstance(value, FileStream) else len(value or "")
+
+
+def estimate_tokens(value):
+    # ~4 characters per token.
+    return value_size(value) // CHARS_PER_TOKEN
+
+
+def trim_marker(tokens, what):
+    return f"\n\n[... ~{tokens:,} tokens trimmed: {what} ...]\n"
+
+
+def keep_head(text, tokens):
+    cut = tokens * CHARS_PER_TOKEN
+    return text[:cut] + trim_marker(estimate_tokens(text[cut:]), "tail")
+
+
+def keep_tail(text, tokens):
+    cut = max(len(text) - tokens * CHARS_PER_TOKEN, 0)
+    return trim_marker(estimate_tokens(text[:cut]), "head").lstrip() + text[cut:]
+
+
+def section_priority(text, tokens):
+    # Keep whole `##`/`###` sections, highest **Priority** first then document order, until full.
+    head, *sections = SECTION_SPLIT_RE.split(text)
+    ranked = sorted(range(len(sections)), key=lambda i: (section_rank(sections[i]), i))
+    used = estimate_tokens(head)
+    keep = set()
+    for i in ranked:
+        size = estimate_tokens(sections[i])
+        if used + size <= tokens:
+            keep.add(i)
+            used += size
+    kept = "".join(s for i, s in enumerate(sections) if i in keep)
+    dropped = len(sections) - len(keep)
+    if not dropped:
+        return head + kept
+    return head + kept + trim_marker(estimate_tokens(text) - used, f"{dropped} sections")
+
+
+def section_rank(section):
+    match = PRIORITY_RE.search(section)
+    return PRIORITY_ORDER.get(match.group(1).lower(), 9) if match else 9
+
+
+def drop_done(text, tokens):
+    # Remove every section whose **Status** is done, whatever the budget.
+    head, *sections = SECTION_SPLIT_RE.split(text)
+    kept = [s for s in sections if not DONE_RE.search(s)]
+    dropped = len(sections) - len(kept)
+    result = head + "".join(kept)
+    if not dropped:
+        return result
+    saved = estimate_tokens(text) - estimate_tokens(result)
+    return result + trim_marker(saved, f"{dropped} done sections")
+
+
+POLICIES = {
+    "keep-head": keep_head,
+    "keep-tail": keep_tail,
+    "section-priority": section_priority,
+    "drop-done": drop_done,
+}
+
+
+def apply_budget(step, segment_lists, context):
+    # Trim placeholders listed in the step's `trim` map (in order) until the prompt fits
+    # `max_tokens`. Returns the new context and report lines for stderr (empty if it fit).
+    names = [name for segs in segment_lists for name in segs[1::2]]
+    literal = sum(len(seg) for segs in segment_lists for seg in segs[0::2]) // CHARS_PER_TOKEN
+    sizes = {name: estimate_tokens(value) for name, value in context.items()}
+    total = literal + sum(sizes.get(name, 0) for name in names)
+    budget = step["max_tokens"]
+    if total <= budget:
+        return context, []
+    report = [f"Token budget for {step['id']}: ~{total:,} tokens > max_tokens {budget:,}"]
+    trimmed = dict(context)
+    for name, policy in step.get("trim", {}).items():
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown trim policy {policy!r}. Valid policies: {list(POLICIES)}")
+        uses = names.count(name)
+        excess = total - budget
+        if excess <= 0 or not uses or not sizes.get(name):
+            continue
+        target = max(sizes[name] - (excess + uses - 1) // uses, 0)
+        trimmed[name] = POLICIES[policy](str(context[name]), target)
+        after = estimate_tokens(trimmed[name])
+        report.append(f"  {name}: ~{sizes[name]:,} -> ~{after:,} tokens ({policy})")
+        total -= (sizes[name] - after) * uses
+    if total > budget:
+        report.append(f"  still over budget by ~{total - budget:,} tokens")
+    return trimmed, report
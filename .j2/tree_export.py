@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""tree_export — in-process incremental clean export: copies only files changed since the last."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import tarfile
+import time
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+from cache_dir import cache_dir
+from warm_cache import RACY_NS
+
+# Same rules as the old `rsync --exclude=NAME`: a matching name is skipped at any depth.
+EXCLUDED_NAMES = {".j2", "scaffold", ".claude", ".coverage"}
+RESIDUAL = "runner.py"
+MANIFEST_VERSION = 1
+# Below this many files to copy, a thread pool costs more than it saves.
+PARALLEL_MIN = 64
+MAX_WORKERS = 8
+# Manifests are per target; only the most recently written ones are kept, so
+# scratch exports don't pile up.
+MAX_MANIFESTS = 8
+FICLONE = 0x40049409
+CHUNK = 1024 * 1024
+# Pipe ("w|") modes: tarfile writes strictly forward, so the archive streams with no staging copy.
+ARCHIVE_MODES = {"tar": "w|", "tar.gz": "w|gz", "tgz": "w|gz", "tar.xz": "w|xz"}
+# One export run: source and target roots, the previous manifest's records, and whether to hardlink.
+ExportOptions = namedtuple("ExportOptions", ["root", "target", "old", "use_links"])
+
+
+def export_tree(root, target, use_links):
+    # Mirror root into target minus j2 infrastructure; returns (target,
+    # files written, files unchanged).
+    target = Path(target).resolve()
+    fresh = not target.exists()
+    target.mkdir(parents=True, exist_ok=True)
+    old = {} if fresh else read_manifest(manifest_file(root, target), target)
+    files, todo = {}, []
+    for rel, st in walk(root, {str(target)}):
+        if stat.S_ISDIR(st.st_mode):
+            os.makedirs(target / rel, exist_ok=True)
+        elif unchanged(old.get(rel), st, target / rel, bool(old)):
+            files[rel] = old.get(rel) or record_for(st, None)
+        else:
+            todo.append((rel, st))
+    written = 0
+    for rel, (copied, record) in copy_all(ExportOptions(root, target, old, use_links), todo):
+        files[rel] = record
+        written += copied
+    residual = target / RESIDUAL
+    if residual.is_file():
+        residual.unlink()
+    write_manifest(root, target, files)
+    return target, written, len(files) - written
+
+
+def run_export(root, target, fmt, use_links):
+    # `runner.py export`: a tar archive streamed to a file or stdout (-), else
+    # an incremental directory copy.
+    mode = archive_mode(target, fmt)
+    if mode is None:
+        target_path, copied, kept = export_tree(root, target, use_links)
+        return f"Exported to {target_path}: {copied} files copied, {kept} unchanged."
+    if target != "-":
+        path, count = export_archive_file(root, target, mode)
+        return f"Exported {count} entries to {path}."
+    sys.stdout.flush()
+    count = export_archive(root, set(), mode, sys.stdout.buffer)
+    sys.stdout.buffer.flush()
+    # stdout carries the archive, so the summary goes to stderr.
+    print(f"Exported {count} entries to stdout.", file=sys.stderr)
+    return ""
+
+
+def walk(root, skip):
+    # (relative path, lstat) for every exported entry in name order, each directory
+    # before its contents. skip holds absolute paths never to export: the target
+    # itself when it lies inside root.
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                rel = os.path.join(rel_dir, entry.name)
+                if entry.name in EXCLUDED_NAMES or rel == RESIDUAL or entry.path in skip:
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                yield rel, st
+                if stat.S_ISDIR(st.st_mode):
+                    stack.append(rel)
+
+
+def archive_mode(target, fmt):
+    # tarfile pipe mode from --archive, else from the target's suffix;
+    # None means a directory export.
+    if fmt:
+        return ARCHIVE_MODES[fmt]
+    name = os.path.basename(target)
+    for suffix in sorted(ARCHIVE_MODES, key=len, reverse=True):
+        if name.endswith(f".{suffix}"):
+            return ARCHIVE_MODES[suffix]
+    if target == "-":
+        raise ValueError("exporting to stdout needs --archive tar, tar.gz or tar.xz")
+    return None
+
+
+def export_archive(root, target, mode, out):
+    # Stream the cleaned tree as a tar archive into out; returns the number of members written.
+    count = 0
+    with tarfile.open(fileobj=out, mode=mode, format=tarfile.PAX_FORMAT) as tar:
+        for rel, _ in walk(root, target):
+            tar.add(os.path.join(root, rel), arcname=rel, recursive=False)
+            count += 1
+    return count
+
+
+def export_archive_file(root, target, mode):
+    # Archive to a path: written under a temp name and renamed, so a
+    # failed export leaves nothing behind.
+    path = Path(target).resolve()
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as out:
+            count = export_archive(root, {str(path), str(tmp)}, mode, out)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path, count
+
+
+def unchanged(record, st, dst, have_manifest):
+    # rsync's quick check against the target itself (size + mtime), so a file deleted or edited in
+    # the export is restored; with a manifest, the recorded stamp must also match the source.
+    if have_manifest and (record is None or record[:2] != [st.st_size, st.st_mtime_ns]):
+        return False
+    return target_stamp(dst) == [st.st_size, st.st_mtime_ns]
+
+
+def target_stamp(dst):
+    try:
+        dst_st = os.lstat(dst)
+    except FileNotFoundError:
+        return None
+    return [dst_st.st_size, dst_st.st_mtime_ns]
+
+
+def copy_all(options, todo):
+    # Small batches are copied inline; large trees fan out over a thread pool.
+    if len(todo) < PARALLEL_MIN:
+        return [(rel, sync_file(options, rel, st)) for rel, st in todo]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        records = pool.map(lambda job: sync_file(options, *job), todo)
+        return list(zip((rel for rel, _ in todo), records))
+
+
+def sync_file(options, rel, st):
+    # Bring one file up to date; returns (whether it was written, manifest
+    # record [size, mtime_ns, hash]).
+    src, dst, record = options.root / rel, options.target / rel, options.old.get(rel)
+    digest = None
+    copied = True
+    if stat.S_ISLNK(st.st_mode):
+        place(dst, lambda tmp: copy_link(src, tmp, st))
+    else:
+        digest = file_hash(src)
+        if record and record[2] == digest and target_stamp(dst) == record[:2]:
+            # Same content with a new mtime (e.g. a checkout), and the target is as last exported:
+            # refresh the times, skip the copy.
+            shutil.copystat(src, dst)
+            copied = False
+        else:
+            place(dst, lambda tmp: link_or_copy(src, tmp, options.use_links))
+    return copied, record_for(st, digest)
+
+
+def record_for(st, digest):
+    # Manifest record [size, mtime_ns, hash]; a file still being written
+    # gets no stamp, so it is rechecked.
+    if time.time_ns() - st.st_mtime_ns <= RACY_NS:
+        return [None, None, digest]
+    return [st.st_size, st.st_mtime_ns, digest]
+
+
+def place(dst, make):
+    # Build beside dst, then rename over it, so a hardlinked old copy is never written through.
+    tmp = f"{dst}.{os.getpid()}.export-tmp"
+    make(tmp)
+    os.replace(tmp, dst)
+
+
+def copy_link(src, dst, st):
+    # Symlinks keep their own mtime too, as with rsync -a, so the quick
+    # check can skip them next time.
+    os.symlink(os.readlink(src), dst)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns), follow_symlinks=False)
+
+
+def link_or_copy(src, dst, use_links):
+    if use_links:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # other filesystem, or links not supported: copy instead
+    copy_data(src, dst)
+    shutil.copystat(src, dst)
+
+
+def copy_data(src, dst):
+    # Reflink when the filesystem can share extents, else copy_file_range in
+    # the kernel, else a plain copy.
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        try:
+            fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+            return
+        except OSError:
+            pass
+        try:
+            while os.copy_file_range(fin.fileno(), fout.fileno(), CHUNK):
+                pass
+            return
+        except (AttributeError, OSError):
+            fin.seek(0)
+            fout.seek(0)
+            fout.truncate()
+        shutil.copyfileobj(fin, fout, CHUNK)
+
+
+def file_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def manifest_file(root, target):
+    # Kept in the source's .j2/cache (never in the export), one per target directory.
+    return root / ".j2" / "cache" / f"export-{zlib.crc32(str(target).encode()):08x}.json"
+
+
+def read_manifest(path, target):
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION or data.get("target") != str(target):
+        return {}
+    return data["files"]
+
+
+def write_manifest(root, target, files):
+    # Best-effort: without a writable .j2/cache the next export just compares against the target.
+    data = {"version": MANIFEST_VERSION, "target": str(target), "files": files}
+    path = manifest_file(root, target)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_dir(root)
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp, path)
+        prune_manifests(path.parent)
+    except OSError:
+        return
+
+
+def prune_manifests(cache):
+    # Drop all but the newest MAX_MANIFESTS; an evicted target just falls
+    # back to the target quick check.
+    stamped = []
+    for path in cache.glob("export-*.json"):
+        try:
+            stamped.append((path.stat().st_mtime_ns, path))
+        except FileNotFoundError:
+            continue  # pruned by a concurrent export
+    for _, path in sorted(stamped, reverse=True)[MAX_MANIFESTS:]:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""warm_cache — in-process memo of file-derived values, invalidated by file stamps."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+import time
+
+RACY_NS = 2_000_000_000
+
+
+class WarmCache:
+    """Values (config, workflow, templates) kept while their source files' stamps are unchanged."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key, paths, loader):
+        # Return the memoized loader() result for key, reloading if any path's stamp changed.
+        stamps = [file_stamp(p) for p in paths]
+        entry = self.entries.get(key)
+        if entry and entry[0] == stamps:
+            return entry[1]
+        value = loader()
+        # Same racy-write guard as ParseCache: a just-written file may change again unnoticed.
+        now = time.time_ns()
+        if all(s and now - s[1] > RACY_NS for s in stamps):
+            self.entries[key] = (stamps, value)
+        return value
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""run_bench — time the runner on synthetic projects and compare against a stored baseline."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / ".j2"))
+# The synthetic project builder is a test fixture; the benchmark borrows it from tests/.
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+import runner  # noqa: E402
+from synth_project import SCALES, feature_id, make_project  # noqa: E402
+
+BENCH_DIR = Path(__file__).parent
+# Timings below this many milliseconds are noise; never report them as regressions.
+MIN_DELTA_MS = 5.0
+
+
+def time_call(fn, repeat):
+    # Min and median of repeat timed runs in ms, after one untimed run that pays lazy imports.
+    # GC is off while timing, as in timeit, so collections don't land on random samples.
+    fn()
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    return {"min_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)}
+
+
+def run_main(argv):
+    # One full main() render with output discarded, as a slash command would run it.
+    saved = sys.argv
+    sys.argv = ["runner.py", *argv]
+    try:
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), \
+                contextlib.redirect_stderr(sink):
+            runner.main()
+    finally:
+        sys.argv = saved
+
+
+def context_call(root, settings, step, args):
+    segments = runner.load_segments(root, settings, step["template"])
+    placeholders = set(segments[1::2]) | runner.FOOTER_PLACEHOLDERS
+    return lambda: runner.build_context(root, settings, placeholders, args)
+
+
+def bench_project(root, repeat):
+    # Time compute_status, then build_context and main() for every workflow step.
+    settings = runner.load_config(root)
+    results = {"compute_status": time_call(lambda: runner.compute_status(root, settings), repeat)}
+    for step in runner.load_workflow(root):
+        argv = [step["id"], "--root", str(root), "--feature", feature_id(2), "--task", "T01"]
+        if step["id"] != "status":
+            args = runner.build_parser().parse_args(argv)
+            results[f"build_context:{step['id']}"] = time_call(
+                context_call(root, settings, step, args), repeat)
+        results[f"main:{step['id']}"] = time_call(lambda: run_main(argv), repeat)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Timings whose best run grew by more than tolerance (a fraction); min is steadier than median.
+    regressions = []
+    for scale, timings in results["scales"].items():
+        old = baseline.get("scales", {}).get(scale, {})
+        for name, now in timings.items():
+            if name not in old:
+                continue
+            before, after = old[name]["min_ms"], now["min_ms"]
+            if after > before * (1 + tolerance) and after - before > MIN_DELTA_MS:
+                regressions.append(f"{scale} {name}: {before:.1f} ms -> {after:.1f} ms")
+    return regressions
+
+
+def run_scales(scales, repeat, workdir):
+    results = {"python": platform.python_version(), "platform": platform.platform(), "scales": {}}
+    for scale in scales:
+        root = make_project(Path(workdir) / scale, scale)
+        started = time.perf_counter()
+        results["scales"][scale] = bench_project(root, repeat)
+        print(f"{scale}: benchmarked in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark runner.py on synthetic j2 projects")
+    parser.add_argument("--scales", nargs="+", default=["10", "1k"], choices=list(SCALES),
+                        help="Project sizes to generate (default: 10 1k)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--out", default=None, help="Write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", default=str(BENCH_DIR / "baseline.json"),
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown of the best run as a fraction (default: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Overwrite the baseline with these results instead of comparing")
+    parser.add_argument("--workdir", default=None,
+                        help="Generate projects here and keep them (default: a temp dir)")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_scales(args.scales, args.repeat, args.workdir or tmp)
+    text = json.dumps(results, indent=2) + "\n"
+    if args.out:
+        Path(args.out).write_text(text)
+    else:
+        sys.stdout.write(text)
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(text)
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+        return
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline", file=sys.stderr)
+        return
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
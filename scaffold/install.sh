@@ -1,123 +1,16 @@
 #!/usr/bin/env bash
 # j2 installer
-# Copies the scaffold into the current directory and validates the setup.
+# Copies the scaffold into the target directory and validates the setup.
+# The work is done in one Python process by .j2/installer.py in the j2 source repo.
 
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 TARGET_DIR="${1:-.}"
 
-echo "j2 installer"
-echo "============"
-
-# --- Python version check ---
 if ! command -v python3 &>/dev/null; then
   echo "ERROR: python3 not found. Install Python 3.10 or later." >&2
   exit 1
 fi
 
-PYTHON_VERSION=$(python3 -c 'import sys; print(f"{sys.version_info.major}.{sys.version_info.minor}")')
-REQUIRED="3.10"
-
-if ! python3 -c "import sys; sys.exit(0 if sys.version_info >= (3,10) else 1)"; then
-  echo "ERROR: Python $REQUIRED+ required, found $PYTHON_VERSION." >&2
-  exit 1
-fi
-echo "Python $PYTHON_VERSION ... OK"
-
-# --- PyYAML check ---
-if ! python3 -c "import yaml" 2>/dev/null; then
-  echo "Installing PyYAML..."
-  pip3 install --quiet pyyaml
-fi
-echo "PyYAML ... OK"
-
-# --- Create target directory ---
-mkdir -p "$TARGET_DIR"
-
-# --- Copy scaffold (user-customizable files only: specs, features, tasks, rules) ---
-echo "Copying scaffold to $TARGET_DIR ..."
-rsync -a --ignore-existing \
-  --exclude='__pycache__' \
-  --exclude='*.pyc' \
-  --exclude='.DS_Store' \
-  --exclude='.claude' \
-  "$SCRIPT_DIR/" "$TARGET_DIR/"
-echo "Scaffold copied."
-
-# --- Copy runner.py from j2 source repo ---
-RUNNER_SRC="$(dirname "$SCRIPT_DIR")/.j2/runner.py"
-if [ -f "$RUNNER_SRC" ]; then
-  cp "$RUNNER_SRC" "$TARGET_DIR/.j2/runner.py"
-  echo "runner.py installed."
-else
-  echo "WARNING: runner.py not found at $RUNNER_SRC — copy it manually to $TARGET_DIR/.j2/runner.py" >&2
-fi
-
-# --- Copy templates from j2 source repo ---
-TEMPLATES_SRC="$(dirname "$SCRIPT_DIR")/.j2/templates"
-if [ -d "$TEMPLATES_SRC" ]; then
-  rsync -a --ignore-existing "$TEMPLATES_SRC/" "$TARGET_DIR/.j2/templates/"
-  echo "Templates installed."
-else
-  echo "WARNING: templates not found at $TEMPLATES_SRC — copy them manually to $TARGET_DIR/.j2/templates/" >&2
-fi
-
-# --- Copy config from j2 source repo ---
-CONFIG_SRC="$(dirname "$SCRIPT_DIR")/.j2/config"
-if [ -d "$CONFIG_SRC" ]; then
-  rsync -a --ignore-existing "$CONFIG_SRC/" "$TARGET_DIR/.j2/config/"
-  echo "Config installed."
-else
-  echo "WARNING: config not found at $CONFIG_SRC — copy it manually to $TARGET_DIR/.j2/config/" >&2
-fi
-
-# --- Copy .claude/commands and CLAUDE.md from j2 source repo ---
-COMMANDS_SRC="$(dirname "$SCRIPT_DIR")/.claude/commands"
-if [ -d "$COMMANDS_SRC" ]; then
-  mkdir -p "$TARGET_DIR/.claude/commands"
-  rsync -a --ignore-existing "$COMMANDS_SRC/" "$TARGET_DIR/.claude/commands/"
-  echo "Slash commands installed."
-else
-  echo "WARNING: .claude/commands not found at $COMMANDS_SRC — copy them manually to $TARGET_DIR/.claude/commands/" >&2
-fi
-
-CLAUDE_MD_SRC="$(dirname "$SCRIPT_DIR")/.claude/CLAUDE.md"
-if [ -f "$CLAUDE_MD_SRC" ]; then
-  mkdir -p "$TARGET_DIR/.claude"
-  cp -n "$CLAUDE_MD_SRC" "$TARGET_DIR/.claude/CLAUDE.md" 2>/dev/null || true
-  echo "CLAUDE.md installed."
-else
-  echo "WARNING: .claude/CLAUDE.md not found at $CLAUDE_MD_SRC" >&2
-fi
-
-# --- Validate YAML configs ---
-echo "Validating config files..."
-for f in "$TARGET_DIR/.j2/config/"*.yaml; do
-  python3 -c "import yaml, sys; yaml.safe_load(open('$f'))" \
-    && echo "  $f ... OK" \
-    || { echo "  ERROR: $f is invalid YAML" >&2; exit 1; }
-done
-
-echo ""
-echo "Installation complete."
-
-# --- Detect existing source files ---
-EXISTING_CODE=false
-if find "$TARGET_DIR" \
-    -path "$TARGET_DIR/.j2" -prune -o \
-    -path "$TARGET_DIR/scaffold" -prune -o \
-    \( -name '*.py' -o -name '*.js' -o -name '*.ts' -o -name '*.rs' \
-       -o -name '*.go' -o -name '*.java' -o -name '*.cpp' -o -name '*.c' \) \
-    -print -quit 2>/dev/null | grep -q .; then
-  EXISTING_CODE=true
-fi
-
-echo "Next steps:"
-echo "  1. Edit .j2/config/settings.yaml with your project name."
-echo "  2. Edit .j2/rules.md with your project's coding principles (language, testing rules, style, etc.)."
-echo "  3. Add your project spec to .j2/specs/"
-echo "  4. Run /refresh in Claude Code to begin."
-if [ "$EXISTING_CODE" = true ]; then
-  echo "  5. Run /adopt in Claude Code to scan your existing codebase and generate a spec and feature list."
-fi
+exec python3 "$(dirname "$SCRIPT_DIR")/.j2/installer.py" "$TARGET_DIR"
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
-"""Shared constants and sys.path setup for the runner test suite."""
+"""Shared constants, helpers and sys.path setup for the runner test suite."""
 # Author: Pito Salas and Claude Code
 # Open Source Under MIT license
 
+import os
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / ".j2"))
@@ -86,3 +88,11 @@ SETTINGS_FOR_F23 = {
         "rules_file": ".j2/rules.md",
     }
 }
+
+
+def write_aged(path, text):
+    # Backdate the mtime so the file is outside the racy window and its stamp is cached.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    old = time.time() - 60
+    os.utime(path, (old, old))
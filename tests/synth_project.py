@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""synth_project — build synthetic j2 projects at benchmark scale: features, tasks, done archive."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+J2_ROOT = Path(__file__).parent.parent / ".j2"
+
+# features: feature sections in features.md; task_files: features that get a task file (done ones go
+# to tasks/done/); max_tasks: task counts cycle 1..max_tasks; spec_sections: ## sections.
+SCALES = {
+    "10":  {"features": 10, "task_files": 10, "max_tasks": 20, "spec_sections": 20},
+    "1k":  {"features": 1000, "task_files": 300, "max_tasks": 200, "spec_sections": 200},
+    "10k": {"features": 10000, "task_files": 1000, "max_tasks": 200, "spec_sections": 1000},
+}
+PRIORITIES = ["High", "Medium", "Low"]
+STATUSES = ["done", "in progress", "not started"]
+
+
+def feature_id(i):
+    return f"F{i:02d}"
+
+
+def feature_status(i):
+    return STATUSES[i % len(STATUSES)]
+
+
+def features_text(count):
+    parts = ["# Feature List\n"]
+    for i in range(1, count + 1):
+        status = feature_status(i)
+        tests = "yes" if status == "done" else "no"
+        parts.append(
+            f"\n## {feature_id(i)} — Synthetic Feature {i}\n"
+            f"**Priority**: {PRIORITIES[i % len(PRIORITIES)]}\n"
+            f"**Status**: {status} | Tests written: {tests} | Tests passing: {tests}\n"
+            f"**Description**: Synthetic feature {i} for benchmarking the runner.\n\n---\n"
+        )
+    return "".join(parts)
+
+
+def tasks_text(fid, count, all_done):
+    parts = [f"# Tasks for {fid}\n"]
+    for j in range(1, count + 1):
+        status = "done" if all_done or j % 2 else "not started"
+        parts.append(
+            f"\n### T{j:02d} — Synthetic task {j}\n"
+            f"**Status**: {status}\n"
+            f"**Description**: Step {j} of {fid}; touches one module and its tests.\n"
+        )
+    return "".join(parts)
+
+
+def spec_text(sections):
+    parts = ["# Synthetic Spec\n\nGenerated for runner benchmarks.\n"]
+    for i in range(1, sections + 1):
+        parts.append(
+            f"\n## Section {i}\n**Priority**: {PRIORITIES[i % len(PRIORITIES)]}\n\n"
+            + f"The system shall handle synthetic requirement number {i} reliably.\n" * 8
+        )
+    return "".join(parts)
+
+
+def make_project(root, scale):
+    # Write a complete project under root: live config and templates, plus synthetic content.
+    shape = SCALES[scale]
+    j2 = Path(root) / ".j2"
+    for name in ("config", "templates"):
+        shutil.copytree(J2_ROOT / name, j2 / name, dirs_exist_ok=True)
+    shutil.copy(J2_ROOT / "rules.md", j2 / "rules.md")
+    (j2 / "specs").mkdir(parents=True, exist_ok=True)
+    (j2 / "specs" / "synthetic.md").write_text(spec_text(shape["spec_sections"]))
+    (j2 / "features").mkdir(exist_ok=True)
+    (j2 / "features" / "features.md").write_text(features_text(shape["features"]))
+    (j2 / "tasks" / "done").mkdir(parents=True, exist_ok=True)
+    for i in range(1, shape["task_files"] + 1):
+        done = feature_status(i) == "done"
+        folder = j2 / "tasks" / "done" if done else j2 / "tasks"
+        count = (i - 1) % shape["max_tasks"] + 1
+        (folder / f"{feature_id(i)}.md").write_text(tasks_text(feature_id(i), count, done))
+    (j2 / "state.md").write_text(f"last: /task-next\nnext: /task-next {feature_id(2)}\n")
+    # Backdate past the parse cache's racy window so runs are timed against a settled project.
+    settled = time.time() - 60
+    for path in j2.rglob("*"):
+        os.utime(path, (settled, settled))
+    return Path(root)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in SCALES:
+        sys.exit(f"usage: synth_project.py {{{'|'.join(SCALES)}}} <target-dir>")
+    print(make_project(sys.argv[2], sys.argv[1]))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic project generator and the benchmark harness."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import sys
+from pathlib import Path
+
+import runner
+from synth_project import make_project
+
+# Only this module exercises the benchmark harness; the rest of the suite never imports bench/.
+sys.path.insert(0, str(Path(__file__).parent.parent / "bench"))
+from run_bench import bench_project, compare  # noqa: E402
+
+
+def test_synthetic_project_has_expected_shape(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    status = runner.compute_status(root, settings)
+    assert "3 done / 4 in progress / 3 not started" in status
+    assert sorted(p.name for p in (root / ".j2" / "tasks" / "done").glob("*.md")) == [
+        "F03.md", "F06.md", "F09.md",
+    ]
+    assert (root / ".j2" / "tasks" / "F10.md").read_text().count("### T") == 10
+
+def test_bench_project_times_every_step(tmp_path):
+    root = make_project(tmp_path, "10")
+    results = bench_project(root, 1)
+    steps = [step["id"] for step in runner.load_workflow(root)]
+    assert "compute_status" in results
+    assert all(f"main:{step}" in results for step in steps)
+    assert "build_context:status" not in results
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {"scales": {"1k": {"fast": {"min_ms": 10.0}, "tiny": {"min_ms": 0.5}}}}
+    results = {"scales": {"1k": {
+        "fast": {"min_ms": 20.0},
+        "tiny": {"min_ms": 4.5},
+        "new": {"min_ms": 99.0},
+    }}}
+    assert compare(results, baseline, 0.25) == ["1k fast: 10.0 ms -> 20.0 ms"]
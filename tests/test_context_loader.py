@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Tests for run_loaders: concurrent placeholder loading with declared dependencies."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import threading
+
+import pytest
+from context_loader import run_loaders
+
+
+def test_independent_loaders_run_concurrently():
+    # Each loader waits for the other; sequential execution would break the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+    loaders = {
+        "spec": ((), lambda r: barrier.wait() is not None and "spec"),
+        "rules": ((), lambda r: barrier.wait() is not None and "rules"),
+    }
+    assert run_loaders(loaders, {}) == {"rules": "rules", "spec": "spec"}
+
+def test_shared_resource_is_computed_once():
+    calls = []
+    resources = {"project": lambda: calls.append(1) or "model"}
+    loaders = {
+        "features": (("project",), lambda r: r["project"] + ":features"),
+        "missing_tasks": (("project",), lambda r: r["project"] + ":missing"),
+    }
+    context = run_loaders(loaders, resources)
+    assert calls == [1]
+    assert context == {"features": "model:features", "missing_tasks": "model:missing"}
+
+def test_missing_file_becomes_placeholder_note(tmp_path):
+    loaders = {
+        "state": ((), lambda r: (tmp_path / "state.md").read_text()),
+        "request": ((), lambda r: "req"),
+    }
+    context = run_loaders(loaders, {})
+    assert context["state"] == f"(not yet available: {tmp_path / 'state.md'})"
+    assert context["request"] == "req"
+
+def test_other_errors_propagate():
+    def fail(r):
+        raise ValueError("Feature 'F99' not found in features file.")
+
+    with pytest.raises(ValueError, match="F99"):
+        run_loaders({"feature": ((), fail), "target": ((), lambda r: None)}, {})
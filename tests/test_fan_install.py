@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Tests for installing the scaffold into many targets at once: globs, shared sources, failures."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import fan_install
+import pytest
+from fan_install import expand_targets, install_many
+
+
+def test_globs_match_directories_and_plain_paths_may_be_new(tmp_path):
+    for name in ("svc-a", "svc-b"):
+        (tmp_path / "services" / name).mkdir(parents=True)
+    (tmp_path / "services" / "notes.txt").write_text("")
+    targets = expand_targets(["services/*", "fresh/one", "services/svc-a"], tmp_path)
+    assert targets == [tmp_path / "fresh" / "one", tmp_path / "services" / "svc-a",
+                       tmp_path / "services" / "svc-b"]
+
+def test_sources_are_read_once_for_all_targets(tmp_path, monkeypatch):
+    calls = []
+    real = fan_install.read_sources
+    monkeypatch.setattr(fan_install, "read_sources", lambda root: calls.append(root) or real(root))
+    table = install_many(["a", "b", "c"], tmp_path)
+    assert len(calls) == 1
+    assert table.splitlines()[-1].startswith("3 targets (0 failed)")
+    assert all((tmp_path / name / ".j2" / "runner.py").is_file() for name in "abc")
+
+def test_failed_target_does_not_stop_the_others(tmp_path, capsys):
+    (tmp_path / "blocked").write_text("a file, not a directory")
+    with pytest.raises(ValueError, match="1 of 2 install targets failed"):
+        install_many(["blocked", "ok"], tmp_path)
+    table = capsys.readouterr().out
+    assert "blocked  FAILED: " in table
+    assert (tmp_path / "ok" / ".j2" / "config" / "settings.yaml").is_file()
+
+def test_kept_files_are_listed_under_the_table(tmp_path):
+    install_many(["a"], tmp_path)
+    (tmp_path / "a" / ".j2" / "templates" / "refresh.md").write_text("my own refresh\n")
+    table = install_many(["a"], tmp_path)
+    assert "kept (your copy differs from master): a/.j2/templates/refresh.md" in table
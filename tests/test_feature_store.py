@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for the sharded features layout: migration both ways and transparent reads."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+from pathlib import Path
+
+import pytest
+import runner
+from feature_store import shard_features_file, unshard_features_file
+from project_db import sync_db
+from status_sync import sync_statuses
+from synth_project import make_project
+
+
+def project_view(root, settings):
+    # Everything the runner derives from the features store, for before/after comparison.
+    project = runner.load_project(root, settings)
+    return (
+        project.section("F05"),
+        project.filtered(),
+        project.default_feature(),
+        project.missing_tasks(),
+        runner.compute_status(root, settings),
+    )
+
+
+def test_round_trip_is_byte_exact(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    features = root / ".j2" / "features" / "features.md"
+    original = features.read_bytes()
+    shard_features_file(root, settings)
+    assert not features.exists()
+    assert (root / ".j2" / "features" / "F07.md").read_text().startswith("## F07 —")
+    unshard_features_file(root, settings)
+    assert features.read_bytes() == original
+    assert sorted(p.name for p in features.parent.iterdir()) == ["features.md"]
+
+def test_sharded_layout_reads_like_features_md(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    before = project_view(root, settings)
+    shard_features_file(root, settings)
+    assert project_view(root, settings) == before
+
+def test_status_follows_edits_to_one_shard(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    shard_features_file(root, settings)
+    runner.compute_status(root, settings)
+    shard = root / ".j2" / "features" / "F01.md"
+    shard.write_text(shard.read_text().replace("**Status**: in progress", "**Status**: done"))
+    assert "4 done / 3 in progress / 3 not started" in runner.compute_status(root, settings)
+
+def test_single_feature_lookup_reads_one_shard(tmp_path, monkeypatch):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    shard_features_file(root, settings)
+    reads = []
+    original = Path.read_bytes
+
+    def counting_read(self):
+        reads.append(self.name)
+        return original(self)
+
+    monkeypatch.setattr(Path, "read_bytes", counting_read)
+    assert "Synthetic Feature 4" in runner.load_project(root, settings).section("f04")
+    assert reads == ["F04.md"]
+
+def test_features_md_beside_shards_is_an_error(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    shard_features_file(root, settings)
+    (root / ".j2" / "features" / "features.md").write_text("## F01 — Fresh\n**Status**: done\n")
+    for read in (runner.load_project, runner.compute_status, sync_statuses, sync_db):
+        with pytest.raises(ValueError, match="Both features.md and the manifest.txt shards exist"):
+            read(root, settings)
+    shard_features_file(root, settings)
+    assert list(runner.load_project(root, settings).all_features()) == ["F01"]
+
+def test_reshard_removes_stale_shards(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    shard_features_file(root, settings)
+    unshard_features_file(root, settings)
+    features = root / ".j2" / "features" / "features.md"
+    features.write_text(features.read_text().split("## F09")[0])
+    (root / ".j2" / "features" / "F10.md").write_text("## F10 — left over\n")
+    shard_features_file(root, settings)
+    assert not (root / ".j2" / "features" / "F10.md").exists()
+    assert runner.load_project(root, settings).default_feature() == "F01"
+
+def test_non_feature_sections_get_their_own_shards(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    features = root / ".j2" / "features" / "features.md"
+    text = features.read_text()
+    head, tail = text.split("## F05")
+    features.write_text(f"{head}## Completed features\nKept below the open ones.\n\n## F05{tail}")
+    before = runner.load_project(root, settings).filtered()
+    original = features.read_bytes()
+    shard_features_file(root, settings)
+    shards = root / ".j2" / "features"
+    assert (shards / "section-1.md").read_text().startswith("## Completed features\n")
+    assert "Completed features" not in (shards / "F04.md").read_text()
+    project = runner.load_project(root, settings)
+    assert "section-1" not in project.all_features()
+    assert project.filtered() == before
+    unshard_features_file(root, settings)
+    assert features.read_bytes() == original
+
+def test_duplicate_ids_refuse_to_shard(tmp_path):
+    root = make_project(tmp_path, "10")
+    features = root / ".j2" / "features" / "features.md"
+    features.write_text(features.read_text() + "\n## F03 — Again\n")
+    with pytest.raises(ValueError, match="Duplicate feature IDs in features.md: F03"):
+        shard_features_file(root, runner.load_config(root))
+
+def test_features_store_placeholder_names_the_layout(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    assert runner.features_store(runner.load_project(root, settings), settings) == (
+        "`.j2/features/features.md`"
+    )
+    shard_features_file(root, settings)
+    assert "`.j2/features/manifest.txt`" in runner.features_store(
+        runner.load_project(root, settings), settings)
+
+def test_features_write_placeholder_never_names_features_md_for_shards(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    assert runner.features_write(runner.load_project(root, settings), settings) == (
+        "Write the complete feature list to `.j2/features/features.md`."
+    )
+    shard_features_file(root, settings)
+    text = runner.features_write(runner.load_project(root, settings), settings)
+    assert "`.j2/features/<ID>.md`" in text and "Never create `.j2/features/features.md`" in text
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the streaming render path: FileStream values and write_segments."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import io
+import tracemalloc
+
+import pytest
+import runner
+import yaml
+from conftest import SETTINGS_FOR_F23, TEMPLATES_ROOT
+from file_stream import FileStream
+from warm_cache import WarmCache
+
+SPEC_BYTES = 16 * 1024 * 1024
+
+
+class CountingSink:
+    """Text sink that only counts what it is given, so it adds no memory of its own."""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, text):
+        self.chars += len(text)
+
+
+def make_refresh_project(tmp_path):
+    config_dir = tmp_path / ".j2" / "config"
+    config_dir.mkdir(parents=True)
+    (config_dir / "settings.yaml").write_text(yaml.dump(SETTINGS_FOR_F23))
+    (config_dir / "workflow.yaml").write_text(yaml.dump(
+        {"steps": [{"id": "refresh", "template": "refresh.md"}]}
+    ))
+    specs_dir = tmp_path / ".j2" / "specs"
+    specs_dir.mkdir()
+    line = "The widget service stores widgets and serves them over HTTP.\n"
+    (specs_dir / "big.md").write_text(line * (SPEC_BYTES // len(line)))
+    (tmp_path / ".j2" / "rules.md").write_text("## Rules\n- Write tests.\n")
+    templates_dir = tmp_path / ".j2" / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "refresh.md").write_text((TEMPLATES_ROOT / "refresh.md").read_text())
+    return tmp_path
+
+
+def test_file_stream_joins_files_with_separator(tmp_path):
+    (tmp_path / "a.md").write_text("A")
+    (tmp_path / "b.md").write_text("B")
+    out = io.StringIO()
+    FileStream([tmp_path / "a.md", tmp_path / "b.md"], "\n---\n").write_to(out)
+    assert out.getvalue() == "A\n---\nB"
+
+def test_file_stream_reports_missing_file_when_built(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FileStream([tmp_path / "absent.md"], "")
+
+def test_write_segments_matches_render_segments(tmp_path):
+    (tmp_path / "spec.md").write_text("spec body")
+    segments = runner.compile_template("S: {{spec}} R: {{request}} U: {{unknown}}")
+    context = {"spec": FileStream([tmp_path / "spec.md"], ""), "request": "go"}
+    out = io.StringIO()
+    runner.write_segments(segments, context, out)
+    assert out.getvalue() == runner.render_segments(segments, context)
+
+def test_large_spec_renders_with_bounded_memory(tmp_path):
+    root = make_refresh_project(tmp_path)
+
+    class Args:
+        command = "refresh"
+        feature = task = request = target = None
+
+    sink = CountingSink()
+    tracemalloc.start()
+    runner.run_command(root, Args(), WarmCache(), sink)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert sink.chars > SPEC_BYTES
+    assert peak < SPEC_BYTES // 4
+
+def test_none_values_render_empty():
+    segments = runner.compile_template("target=[{{target}}]")
+    out = io.StringIO()
+    runner.write_segments(segments, {"target": None}, out)
+    assert out.getvalue() == "target=[]" == runner.render_segments(segments, {"target": None})
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the in-process installer: copy policies, upgrades, config checks, source scan."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import subprocess
+import sys
+
+import pytest
+from conftest import J2_ROOT, write_aged
+from installer import has_existing_source, install_target, read_sources
+
+
+def make_source(tmp_path):
+    # A minimal j2 source repo: one file under each install group.
+    src = tmp_path / "src"
+    files = {
+        "scaffold/.j2/rules.md": "rules\n",
+        ".j2/templates/refresh.md": "refresh v1\n",
+        ".j2/config/settings.yaml": "j2:\n  name: demo\n",
+        ".j2/runner.py": "# runner v1\n",
+        ".claude/commands/refresh.md": "command\n",
+        ".claude/CLAUDE.md": "instructions\n",
+    }
+    for rel, text in files.items():
+        (src / rel).parent.mkdir(parents=True, exist_ok=True)
+        (src / rel).write_text(text)
+    return src
+
+
+def run(src, target):
+    sources, warnings = read_sources(src)
+    assert warnings == []
+    return install_target(target, sources, set())[0]
+
+
+def test_fresh_install_then_rerun_copies_nothing(tmp_path):
+    src, target = make_source(tmp_path), tmp_path / "project"
+    assert run(src, target) == {"added": 6, "updated": 0, "unchanged": 0, "kept": 0}
+    assert (target / ".j2" / "rules.md").read_text() == "rules\n"
+    assert (target / ".claude" / "commands" / "refresh.md").is_file()
+    assert run(src, target) == {"added": 0, "updated": 0, "unchanged": 6, "kept": 0}
+
+def test_upgrade_replaces_only_untouched_master_files(tmp_path):
+    src, target = make_source(tmp_path), tmp_path / "project"
+    run(src, target)
+    (target / ".j2" / "config" / "settings.yaml").write_text("j2:\n  name: mine\n")
+    (target / ".j2" / "runner.py").write_text("# local hack\n")
+    (target / ".j2" / "rules.md").write_text("my rules\n")
+    (src / ".j2" / "templates" / "refresh.md").write_text("refresh v2\n")
+    (src / ".j2" / "config" / "settings.yaml").write_text("j2:\n  name: demo2\n")
+    (src / "scaffold" / ".j2" / "rules.md").write_text("new rules\n")
+    assert run(src, target) == {"added": 0, "updated": 2, "unchanged": 2, "kept": 2}
+    assert (target / ".j2" / "templates" / "refresh.md").read_text() == "refresh v2\n"
+    assert (target / ".j2" / "runner.py").read_text() == "# runner v1\n"
+    assert (target / ".j2" / "config" / "settings.yaml").read_text() == "j2:\n  name: mine\n"
+    assert (target / ".j2" / "rules.md").read_text() == "my rules\n"
+
+def test_existing_files_without_manifest_are_kept(tmp_path):
+    src, target = make_source(tmp_path), tmp_path / "project"
+    (target / ".j2" / "templates").mkdir(parents=True)
+    (target / ".j2" / "templates" / "refresh.md").write_text("older local copy\n")
+    assert run(src, target)["kept"] == 1
+    assert (target / ".j2" / "templates" / "refresh.md").read_text() == "older local copy\n"
+
+def test_older_copy_without_manifest_is_upgraded_like_rsync_update(tmp_path):
+    src, target = make_source(tmp_path), tmp_path / "project"
+    old = target / ".j2" / "templates" / "refresh.md"
+    write_aged(old, "refresh v0\n")
+    assert run(src, target)["updated"] == 1
+    assert old.read_text() == "refresh v1\n"
+
+def test_kept_paths_are_listed(tmp_path):
+    src, target = make_source(tmp_path), tmp_path / "project"
+    (target / ".j2" / "templates").mkdir(parents=True)
+    (target / ".j2" / "templates" / "refresh.md").write_text("older local copy\n")
+    sources, _ = read_sources(src)
+    assert install_target(target, sources, set())[1] == [".j2/templates/refresh.md"]
+
+def test_invalid_config_is_reported(tmp_path):
+    src, target = make_source(tmp_path), tmp_path / "project"
+    (target / ".j2" / "config").mkdir(parents=True)
+    (target / ".j2" / "config" / "broken.yaml").write_text("key: [unclosed\n")
+    with pytest.raises(ValueError, match="broken.yaml is invalid YAML"):
+        run(src, target)
+
+def test_existing_source_scan_skips_j2_and_scaffold(tmp_path):
+    (tmp_path / ".j2").mkdir()
+    (tmp_path / ".j2" / "runner.py").write_text("")
+    (tmp_path / "scaffold").mkdir()
+    (tmp_path / "scaffold" / "tool.go").write_text("")
+    assert not has_existing_source(tmp_path)
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "main.rs").write_text("")
+    assert has_existing_source(tmp_path)
+
+def test_cli_prints_adopt_hint_for_existing_code(tmp_path):
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    result = subprocess.run([sys.executable, str(J2_ROOT / "installer.py"), str(tmp_path)],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "Installation complete." in result.stdout
+    assert "Run /adopt in Claude Code to scan your existing codebase" in result.stdout
+    assert (tmp_path / ".j2" / "runner.py").is_file()
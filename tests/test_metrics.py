@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for the metrics.jsonl invocation log, its rotation, and the `metrics` rollup."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import threading
+
+import metrics
+import runner
+from metrics import append_record, metrics_report, read_records
+from synth_project import make_project
+
+
+def record(command, ms, size):
+    return {"command": command, "ms": ms, "bytes": size, "tokens": size // 4, "files": ["x.md"]}
+
+
+def test_every_invocation_appends_a_record(tmp_path, monkeypatch):
+    root = make_project(tmp_path, "10")
+    monkeypatch.setattr("sys.argv", ["runner.py", "task-start", "--root", str(root),
+                                     "--feature", "F02", "--task", "T01"])
+    runner.main()
+    (entry,) = read_records(root / ".j2" / "cache")
+    assert entry["command"] == "task-start"
+    assert (entry["feature"], entry["task"], entry["exit"]) == ("F02", "T01", 0)
+    assert entry["bytes"] > 0 and entry["ms"] > 0
+    assert ".j2/rules.md" in entry["files"]
+
+def test_concurrent_appends_never_interleave(tmp_path):
+    (tmp_path / ".j2").mkdir()
+
+    def writer(n):
+        for i in range(50):
+            append_record(tmp_path, record(f"step-{n}", i, 1000))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    lines = (tmp_path / ".j2" / "cache" / "metrics.jsonl").read_text().splitlines()
+    assert len(lines) == 400
+    assert all(json.loads(line)["bytes"] == 1000 for line in lines)
+
+def test_rotation_bounds_log_and_compacts_old_records(tmp_path, monkeypatch):
+    (tmp_path / ".j2").mkdir()
+    monkeypatch.setattr(metrics, "MAX_LOG_BYTES", 2000)
+    for i in range(100):
+        append_record(tmp_path, record("task-next", i, 100))
+    rotated = (tmp_path / ".j2" / "cache" / "metrics.1.jsonl").read_text().splitlines()
+    assert (tmp_path / ".j2" / "cache" / "metrics.jsonl").stat().st_size <= 2000
+    assert rotated and all("files" not in json.loads(line) for line in rotated)
+    assert [r["ms"] for r in read_records(tmp_path / ".j2" / "cache")][-1] == 99
+
+def test_report_gives_percentiles_per_step(tmp_path):
+    (tmp_path / ".j2").mkdir()
+    for ms in range(1, 21):
+        append_record(tmp_path, record("task-next", float(ms), 2048))
+    append_record(tmp_path, record("status", 3.0, 512))
+    lines = metrics_report(tmp_path).splitlines()
+    assert lines[1].split() == ["status", "1", "3.0", "3.0", "0.5", "0.5", "128", "n/a"]
+    assert lines[2].split()[:4] == ["task-next", "20", "10.0", "19.0"]
+
+def test_missing_j2_dir_is_not_an_error(tmp_path):
+    append_record(tmp_path, record("status", 1.0, 1))
+    assert not (tmp_path / ".j2").exists()
+
+def test_log_lives_in_a_self_ignoring_cache_dir(tmp_path):
+    (tmp_path / ".j2").mkdir()
+    append_record(tmp_path, record("status", 1.0, 1))
+    assert (tmp_path / ".j2" / "cache" / ".gitignore").read_text() == "*\n"
+    assert not (tmp_path / ".j2" / "metrics.jsonl").exists()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for --roots: project discovery, parallel per-project runs and the aggregate summary."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+
+from multi_root import discover_roots, run_roots, strip_roots
+from synth_project import make_project
+
+
+def monorepo(tmp_path):
+    for name in ("api", "web", "deep/worker"):
+        make_project(tmp_path / "services" / name, "10")
+    (tmp_path / "services" / "docs").mkdir()
+    return tmp_path
+
+
+def test_discovery_keeps_only_j2_projects(tmp_path):
+    root = monorepo(tmp_path)
+    found = [p.relative_to(root).as_posix() for p in discover_roots(["services/*"], root)]
+    assert found == ["services/api", "services/web"]
+    deep = discover_roots(["services/**", "services/api"], root)
+    names = [p.relative_to(root / "services").as_posix() for p in deep]
+    assert names == ["api", "deep/worker", "web"]
+
+def test_strip_roots_leaves_the_per_project_command():
+    argv = ["status", "--roots", "a/*", "--json", "--roots=b/*"]
+    assert strip_roots(argv) == ["status", "--json"]
+
+def test_status_json_streams_one_line_per_project_then_summary(tmp_path, capsys):
+    root = monorepo(tmp_path)
+    code = run_roots(["services/**"], ["status", "--json", "--roots", "services/**"], root)
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert sorted(line["root"].rsplit("/", 1)[1] for line in lines[:-1]) == ["api", "web", "worker"]
+    assert lines[-1] == {"summary": {
+        "projects": 3, "failed": 0, "features": {"done": 9, "in progress": 12, "not started": 9},
+        "missing_task_files": 0, "pending_tasks": 51,
+    }}
+
+def test_status_text_has_a_block_per_project(tmp_path, capsys):
+    root = monorepo(tmp_path)
+    assert run_roots(["services/*"], ["status", "--roots", "services/*"], root) == 0
+    out = capsys.readouterr().out
+    assert out.count("Project Status") == 2
+    assert "==> services/api <==" in out
+    assert out.rstrip().endswith(
+        "2 projects (0 failed): 6 done / 8 in progress / 6 not started features, "
+        "0 missing task files, 34 pending tasks")
+
+def test_failed_project_is_reported_and_sets_exit_code(tmp_path, capsys):
+    root = monorepo(tmp_path)
+    (root / "services" / "web" / ".j2" / "templates" / "next_task.md").unlink()
+    argv = ["task-next", "--json", "--roots", "services/*"]
+    assert run_roots(["services/*"], argv, root) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    failed = [line for line in lines if line.get("exit")]
+    assert [line["root"].rsplit("/", 1)[1] for line in failed] == ["web"]
+    assert "next_task.md" in failed[0]["error"]
+    assert lines[-1] == {"summary": {"projects": 2, "failed": 1}}
+
+def test_no_matching_projects_is_an_error(tmp_path, capsys):
+    assert run_roots(["nothing/*"], ["status"], tmp_path) == 1
+    assert "no j2 projects match nothing/*" in capsys.readouterr().err
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Tests for ParseCache: parsed features/task structure persisted in .j2/cache."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+from conftest import MIXED_PRIORITY_FEATURES, write_aged
+from parse_cache import ParseCache
+
+
+def count_calls(parser, calls):
+    def counted(raw):
+        calls.append(raw)
+        return parser(raw)
+    return counted
+
+
+def test_unchanged_file_is_not_reparsed(tmp_path):
+    path = tmp_path / ".j2" / "features" / "features.md"
+    write_aged(path, MIXED_PRIORITY_FEATURES)
+    calls = []
+    cache = ParseCache(tmp_path, "parse")
+    cache.get(path, count_calls(len, calls))
+    cache.save()
+    data, raw = ParseCache(tmp_path, "parse").get(path, count_calls(len, calls))
+    assert len(calls) == 1
+    assert data == len(MIXED_PRIORITY_FEATURES.encode())
+    assert raw is None
+
+def test_changed_file_is_reparsed(tmp_path):
+    path = tmp_path / ".j2" / "tasks" / "F01.md"
+    write_aged(path, "### T01 — a\n**Status**: not started\n")
+    cache = ParseCache(tmp_path, "parse")
+    cache.get(path, len)
+    cache.save()
+    write_aged(path, "### T01 — a\n**Status**: done\n")
+    data, _ = ParseCache(tmp_path, "parse").get(path, len)
+    assert data == len("### T01 — a\n**Status**: done\n".encode())
+
+def test_recently_modified_file_is_not_cached(tmp_path):
+    path = tmp_path / ".j2" / "state.md"
+    path.parent.mkdir(parents=True)
+    path.write_text("fresh")
+    cache = ParseCache(tmp_path, "parse")
+    cache.get(path, len)
+    cache.save()
+    assert not (tmp_path / ".j2" / "cache" / "parse.json").exists()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for --profile: phase timings, bytes read per file and placeholder sizes."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import builtins
+import json
+
+import runner
+from profiler import Profiler
+from synth_project import make_project
+
+
+def run_profiled(monkeypatch, argv):
+    monkeypatch.setattr("sys.argv", ["runner.py", *argv])
+    runner.main()
+
+
+def test_profile_report_written_to_file(tmp_path, monkeypatch, capsys):
+    root = make_project(tmp_path / "proj", "10")
+    report_path = tmp_path / "profile.json"
+    real_open = builtins.open
+    run_profiled(monkeypatch, ["refresh", "--root", str(root), "--profile", str(report_path)])
+    report = json.loads(report_path.read_text())
+    spec_size = (root / ".j2" / "specs" / "synthetic.md").stat().st_size
+    assert builtins.open is real_open
+    phases = {"config", "workflow", "template", "context", "output", "loader:spec"}
+    assert phases <= report["phases_ms"].keys()
+    assert report["bytes_read"][".j2/specs/synthetic.md"] == spec_size
+    assert report["placeholders"]["spec"] == {"bytes": spec_size, "tokens": spec_size // 4}
+    assert report["prompt_bytes"] == len(capsys.readouterr().out.encode()) - 1
+
+def test_profile_defaults_to_stderr(tmp_path, monkeypatch, capsys):
+    root = make_project(tmp_path, "10")
+    run_profiled(monkeypatch, ["status", "--root", str(root), "--profile"])
+    report = json.loads(capsys.readouterr().err)
+    assert "status" in report["phases_ms"]
+    assert report["placeholders"] == {}
+
+def test_disabled_profiler_returns_loader_unchanged():
+    def fn(r):
+        return r
+
+    assert Profiler.current().timed("loader:spec", fn) is fn
+
+def test_open_is_patched_only_when_counting_reads(tmp_path):
+    real_open = builtins.open
+    prof = Profiler(tmp_path)
+    prof.start(False)
+    assert builtins.open is real_open
+    prof.stop()
+    prof.start(True)
+    assert builtins.open is not real_open
+    prof.stop()
+    assert builtins.open is real_open
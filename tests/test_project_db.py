@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for the optional SQLite mirror in .j2/cache/j2.db: same answers as the markdown."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import os
+import time
+
+import pytest
+import runner
+from feature_store import shard_features_file
+from project_db import ProjectDB, run_query, sync_db
+from status_index import StatusIndex
+from synth_project import make_project
+from task_archive import pack_done
+
+
+def answers(source):
+    return (
+        source.status_counts(),
+        source.default_feature(),
+        source.missing_tasks(),
+        source.pending_count(),
+        source.task_section("F03", "t02"),
+        source.task_section("F04", "T01"),
+        source.next_task("F02"),
+        source.next_task("F03"),
+    )
+
+
+def markdown_answers(root, settings):
+    project = runner.load_project(root, settings)
+    index = StatusIndex(root, settings)
+    index.refresh()
+    return (project.status_counts(), project.default_feature(), project.missing_tasks(),
+            index.pending_count(), project.task_section("F03", "t02"),
+            project.task_section("F04", "T01"), project.next_task("F02"), project.next_task("F03"))
+
+
+def synced(root, settings):
+    db = ProjectDB.existing(root, settings)
+    db.refresh()
+    return db
+
+
+def rewrite_aged(path, old, new):
+    # Edit a file and backdate it so its stamp is settled and the next sync records it.
+    path.write_text(path.read_text().replace(old, new))
+    aged = time.time() - 30
+    os.utime(path, (aged, aged))
+
+
+def test_mirror_is_opt_in(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    assert ProjectDB.existing(root, settings) is None
+    assert isinstance(runner.project_queries(root, settings), runner.ProjectModel)
+    assert sync_db(root, settings) == "Synced .j2/cache/j2.db: 10 features, 55 tasks."
+    assert isinstance(runner.project_queries(root, settings), ProjectDB)
+    assert (root / ".j2" / "cache" / ".gitignore").read_text() == "*\n"
+
+def test_answers_match_the_markdown(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    expected = markdown_answers(root, settings)
+    sync_db(root, settings)
+    assert answers(synced(root, settings)) == expected
+
+def test_answers_match_with_shards_and_pack(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    shard_features_file(root, settings)
+    pack_done(root, settings)
+    expected = markdown_answers(root, settings)
+    sync_db(root, settings)
+    assert answers(synced(root, settings)) == expected
+
+def test_only_changed_files_are_resynced(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    sync_db(root, settings)
+    rewrite_aged(root / ".j2" / "tasks" / "F01.md", "**Status**: not started", "**Status**: done")
+    db = ProjectDB.existing(root, settings)
+    db.connect()
+    assert db.sync("task", db.task_sources(), db.load_task_file) == [".j2/tasks/F01.md"]
+    db.conn.commit()
+    assert db.pending_count() == markdown_answers(root, settings)[3]
+
+def test_feature_edits_and_removed_files_are_mirrored(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    sync_db(root, settings)
+    rewrite_aged(root / ".j2" / "features" / "features.md",
+                 "**Status**: in progress", "**Status**: done")
+    (root / ".j2" / "tasks" / "F02.md").unlink()
+    db = synced(root, settings)
+    assert db.status_counts() == runner.load_project(root, settings).status_counts()
+    assert db.missing_tasks() == runner.load_project(root, settings).missing_tasks()
+
+def test_status_and_default_feature_are_unchanged(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    before = (runner.compute_status(root, settings), runner.find_default_feature(root, settings))
+    sync_db(root, settings)
+    after = (runner.compute_status(root, settings), runner.find_default_feature(root, settings))
+    assert after == before
+
+def test_query_is_read_only(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    with pytest.raises(ValueError, match="run `runner.py db-sync` first"):
+        run_query(root, "SELECT 1")
+    sync_db(root, settings)
+    rows = run_query(root, "SELECT fid, status FROM features WHERE fid = 'F03'")
+    assert rows == "fid\tstatus\nF03\tdone"
+    with pytest.raises(ValueError, match="readonly"):
+        run_query(root, "DELETE FROM tasks")
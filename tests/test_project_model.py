@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Tests for ProjectModel: single-pass feature parsing shared by the placeholder loaders."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+from pathlib import Path
+
+import pytest
+import runner
+from conftest import FEATURES_TEXT, MIXED_PRIORITY_FEATURES, SETTINGS_FOR_F23
+from parse_cache import ParseCache
+from project_model import ProjectModel
+
+
+def write_features(tmp_path, text):
+    features_dir = tmp_path / ".j2" / "features"
+    features_dir.mkdir(parents=True)
+    (features_dir / "features.md").write_text(text)
+    (tmp_path / ".j2" / "tasks" / "done").mkdir(parents=True)
+
+
+def test_model_keys_features_by_id_with_priority_and_status():
+    model = ProjectModel.from_text(MIXED_PRIORITY_FEATURES)
+    assert list(model.features) == ["F01", "F02", "F03"]
+    assert model.features["F02"].priority == "High"
+    assert model.features["F02"].status == "not started"
+
+def test_model_offsets_cover_the_feature_section():
+    model = ProjectModel.from_text(FEATURES_TEXT)
+    feat = model.features["F02"]
+    assert FEATURES_TEXT.encode()[feat.start:feat.end].decode().startswith("## F02 — YAML Config")
+
+def test_model_sees_archived_task_files(tmp_path):
+    write_features(tmp_path, MIXED_PRIORITY_FEATURES)
+    (tmp_path / ".j2" / "tasks" / "done" / "F03.md").write_text("# Tasks for F03\n")
+    model = ProjectModel.load(tmp_path, SETTINGS_FOR_F23, ParseCache(tmp_path, "parse"))
+    assert model.missing_tasks() == "F02 (High), F01 (Low)"
+
+def test_missing_features_file_falls_back_to_defaults(tmp_path):
+    model = ProjectModel.load(tmp_path, SETTINGS_FOR_F23, ParseCache(tmp_path, "parse"))
+    assert model.missing_tasks() == "none"
+    assert model.default_feature() == "F01"
+    with pytest.raises(FileNotFoundError):
+        model.filtered()
+
+def test_build_context_reads_features_file_once(tmp_path, monkeypatch):
+    write_features(tmp_path, MIXED_PRIORITY_FEATURES)
+    reads = []
+    original = Path.read_bytes
+
+    def counting_read(self):
+        reads.append(self.name)
+        return original(self)
+
+    monkeypatch.setattr(Path, "read_bytes", counting_read)
+
+    class Args:
+        feature = "F02"
+        task = request = target = None
+
+    placeholders = {"features", "feature", "default_feature", "missing_tasks", "feature_id"}
+    context = runner.build_context(tmp_path, SETTINGS_FOR_F23, placeholders, Args())
+    assert reads.count("features.md") == 1
+    assert context["default_feature"] == "F01"
+    assert "High Feature" in context["feature"]
+
+def test_next_task_is_the_first_pending_section_with_remaining_titles(tmp_path):
+    write_features(tmp_path, MIXED_PRIORITY_FEATURES)
+    (tmp_path / ".j2" / "tasks" / "F02.md").write_text(
+        "# Tasks for F02\n\n### T01 — Parse\n**Status**: done\n\n"
+        "### T02 — Validate\n**Status**: not started\nCheck keys.\n\n"
+        "### T03 — Defaults\n**Status**: in progress\n\n### T04 — Docs\n**Status**: not started\n")
+    model = ProjectModel.load(tmp_path, SETTINGS_FOR_F23, ParseCache(tmp_path, "parse"))
+    assert model.next_task("F02") == (
+        "### T02 — Validate\n**Status**: not started\nCheck keys.\n\n"
+        "Still not started after it:\n- T04 — Docs")
+    assert model.next_task("F01") == "(no active task file for F01)"
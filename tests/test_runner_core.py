@@ -9,7 +9,7 @@ import pytest
 import runner
 import yaml
 
-from conftest import FEATURES_TEXT, TASKS_TEXT, TEMPLATES_ROOT
+from conftest import FEATURES_TEXT, TASKS_TEXT, TEMPLATES_ROOT, write_aged
 
 
 WORKFLOW = [
@@ -46,6 +46,33 @@ def test_fill_template_multiple_keys():
     assert result == "1 + 2"
 
 
+# --- compiled templates ---
+
+def test_compile_template_alternates_literals_and_names():
+    assert runner.compile_template("a {{x}} b {{y}}") == ["a ", "x", " b ", "y", ""]
+
+def test_render_segments_matches_fill_template():
+    template = "{{a}} and {{missing}} then {{a}}"
+    context = {"a": "{{b}}", "b": "no"}
+    assert runner.render_segments(runner.compile_template(template), context) == \
+        runner.fill_template(template, context)
+
+def test_render_segments_renders_none_as_empty():
+    segments = runner.compile_template("target=[{{target}}]")
+    assert runner.render_segments(segments, {"target": None}) == "target=[]"
+
+def test_footer_placeholders_are_precomputed():
+    assert runner.FOOTER_PLACEHOLDERS == runner.find_placeholders(runner.FOOTER)
+
+def test_load_segments_reuses_compiled_template_until_it_changes(tmp_path):
+    settings = {"j2": {"templates_dir": ".j2/templates"}}
+    path = tmp_path / ".j2" / "templates" / "t.md"
+    write_aged(path, "Hi {{name}}")
+    assert runner.load_segments(tmp_path, settings, "t.md") == ["Hi ", "name", ""]
+    path.write_text("Bye {{who}}!")
+    assert runner.load_segments(tmp_path, settings, "t.md") == ["Bye ", "who", "!"]
+
+
 # --- find_step ---
 
 def test_find_step_returns_correct_step():
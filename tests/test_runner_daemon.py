@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Tests for the `runner.py serve` daemon, its thin client, and the warm cache behind them."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import runner
+import runner_client
+import yaml
+from conftest import FEATURES_TEXT, J2_ROOT, SETTINGS_FOR_F23, TEMPLATES_ROOT
+from runner_daemon import FRAME_BYTES, RunnerDaemon
+from warm_cache import WarmCache
+
+
+def make_project(tmp_path):
+    config_dir = tmp_path / ".j2" / "config"
+    config_dir.mkdir(parents=True)
+    (config_dir / "settings.yaml").write_text(yaml.dump(SETTINGS_FOR_F23))
+    (config_dir / "workflow.yaml").write_text(yaml.dump(
+        {"steps": [{"id": "task-next", "template": "next_task.md"}]}
+    ))
+    (tmp_path / ".j2" / "features").mkdir()
+    (tmp_path / ".j2" / "features" / "features.md").write_text(FEATURES_TEXT)
+    (tmp_path / ".j2" / "tasks").mkdir()
+    (tmp_path / ".j2" / "rules.md").write_text("## Rules\n- Write tests.\n")
+    (tmp_path / ".j2" / "templates").mkdir()
+    (tmp_path / ".j2" / "templates" / "next_task.md").write_text(
+        (TEMPLATES_ROOT / "next_task.md").read_text()
+    )
+    return tmp_path
+
+
+def execute(daemon, argv):
+    # Run argv in the daemon and decode the framed reply: (exit code, stdout, stderr).
+    wire = io.BytesIO()
+    code, err = daemon.execute(argv, "/", wire)
+    wire.write(b"0\n" + b'{"code": 0, "err": ""}\n')
+    wire.seek(0)
+    out = io.BytesIO()
+    runner_client.read_reply(wire, out)
+    return code, out.getvalue().decode(), err
+
+
+def test_warm_cache_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("a")
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    warm = WarmCache()
+    assert warm.get("k", [path], path.read_text) == "a"
+    path.write_text("bb")
+    assert warm.get("k", [path], path.read_text) == "bb"
+
+def test_warm_cache_reuses_value_while_unchanged(tmp_path):
+    path = tmp_path / "workflow.yaml"
+    path.write_text("a")
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    warm = WarmCache()
+    warm.get("k", [path], path.read_text)
+    assert warm.get("k", [path], lambda: "reloaded") == "a"
+
+def test_daemon_renders_same_prompt_as_cli(tmp_path):
+    root = make_project(tmp_path).resolve()
+    with RunnerDaemon(root) as daemon:
+        code, out, err = execute(daemon, ["task-next", "--root", str(root)])
+
+    class Args:
+        command = "task-next"
+        feature = task = request = target = None
+
+    assert code == 0
+    expected = io.StringIO()
+    runner.run_command(root, Args(), WarmCache(), expected)
+    assert out == expected.getvalue() + "\n"
+
+def test_daemon_rejects_other_roots(tmp_path):
+    root = make_project(tmp_path).resolve()
+    with RunnerDaemon(root) as daemon:
+        code, _, err = execute(daemon, ["status", "--root", "/elsewhere"])
+    assert code == 1
+    assert "daemon serves" in err
+
+def test_client_forwards_over_socket_and_returns_exit_code(tmp_path, capfd):
+    root = make_project(tmp_path).resolve()
+    with RunnerDaemon(root) as daemon:
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        try:
+            code = runner_client.forward(root, ["status", "--root", str(root)])
+        finally:
+            daemon.shutdown()
+            thread.join()
+    assert code == 0
+    assert "Project Status" in capfd.readouterr().out
+    assert not runner_client.socket_path(root).exists()
+
+def test_runner_script_forwards_before_loading_the_runner(tmp_path):
+    root = make_project(tmp_path).resolve()
+    with RunnerDaemon(root) as daemon:
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        try:
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", str(J2_ROOT / "runner.py"), "status",
+                 "--root", str(root)],
+                capture_output=True, text=True, check=True,
+            )
+        finally:
+            daemon.shutdown()
+            thread.join()
+    assert "Project Status" in result.stdout
+    imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines()}
+    assert "runner_client" in imported
+    assert not imported & {"project_db", "project_model", "metrics", "context_loader"}
+
+def test_client_returns_none_without_daemon(tmp_path):
+    assert runner_client.forward(tmp_path.resolve(), ["status"]) is None
+
+
+def test_large_output_is_streamed_in_frames(tmp_path):
+    root = make_project(tmp_path).resolve()
+    (root / ".j2" / "rules.md").write_text("- Write tests.\n" * 20000)
+    wire = io.BytesIO()
+    with RunnerDaemon(root) as daemon:
+        code, _ = daemon.execute(["task-next", "--root", str(root)], "/", wire)
+    wire.write(b"0\n" + b'{"code": 0, "err": ""}\n')
+    wire.seek(0)
+    frames = []
+
+    class Frames:
+        def write(self, data):
+            frames.append(data)
+
+    runner_client.read_reply(wire, Frames())
+    sizes = [len(frame) for frame in frames]
+    assert code == 0
+    assert len(sizes) > 1 and max(sizes) <= 2 * FRAME_BYTES
+
+def test_client_refuses_a_socket_dir_other_users_can_enter(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    root = make_project(tmp_path / "proj").resolve()
+    with RunnerDaemon(root):
+        assert runner_client.private_dir(runner_client.socket_path(root).parent)
+        os.chmod(tmp_path / "j2", 0o755)
+        assert runner_client.forward(root, ["status", "--root", str(root)]) is None
+
+def test_command_is_found_after_leading_options():
+    command = runner_client.command_from_argv
+    assert command(["--root", ".", "install", "--targets", "x"]) == "install"
+    assert command(["--root=.", "--json", "export", "--target", "-"]) == "export"
+    assert runner_client.command_from_argv(["--feature", "F01"]) is None
+
+def test_flag_options_match_the_parser():
+    flags = {a.option_strings[-1] for a in runner.build_parser()._actions if a.nargs == 0}
+    assert flags | {"-h"} == runner_client.FLAG_OPTIONS
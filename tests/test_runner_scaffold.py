@@ -21,7 +21,7 @@ J2_ROOT = Path(__file__).parent.parent / ".j2"
 TEMPLATES_DIR = Path(__file__).parent.parent / ".j2" / "templates"
 TEMPLATES_REQUIRING_RULES = [
     "gen_features.md", "gen_tasks.md", "update_features.md", "update_tasks.md",
-    "next_task.md", "milestone.md", "refresh.md", "code_review.md",
+    "next_task.md", "milestone.md", "refresh.md", "refresh_delta.md", "code_review.md",
 ]
 
 def test_scaffold_rules_md_exists_and_nonempty():
@@ -285,30 +285,40 @@ def test_milestone_missing_feature_id_produces_error(tmp_path):
 PROJECT_ROOT = Path(__file__).parent.parent
 
 
+def export_source(tmp_path):
+    # A small project in tmp, so exports never leave manifests in this checkout's .j2/cache.
+    src = tmp_path / "src"
+    for rel in ("tests/test_app.py", "pyproject.toml", "README.md", "runner.py",
+                ".j2/state.md", "scaffold/.j2/rules.md", ".claude/commands/x.md"):
+        (src / rel).parent.mkdir(parents=True, exist_ok=True)
+        (src / rel).write_text("x\n")
+    return src
+
+
 def test_clean_export_copies_source_files(tmp_path):
-    runner.clean_export(PROJECT_ROOT, tmp_path)
-    assert (tmp_path / "tests").is_dir()
-    assert any(tmp_path.glob("*.toml")) or any(tmp_path.glob("*.md"))
+    out = runner.clean_export(export_source(tmp_path), tmp_path / "out")
+    assert (out / "tests").is_dir()
+    assert any(out.glob("*.toml")) or any(out.glob("*.md"))
 
 
 def test_clean_export_removes_j2_dir(tmp_path):
-    runner.clean_export(PROJECT_ROOT, tmp_path)
-    assert not (tmp_path / ".j2").exists()
+    out = runner.clean_export(export_source(tmp_path), tmp_path / "out")
+    assert not (out / ".j2").exists()
 
 
 def test_clean_export_removes_scaffold_dir(tmp_path):
-    runner.clean_export(PROJECT_ROOT, tmp_path)
-    assert not (tmp_path / "scaffold").exists()
+    out = runner.clean_export(export_source(tmp_path), tmp_path / "out")
+    assert not (out / "scaffold").exists()
 
 
 def test_clean_export_removes_claude_dir(tmp_path):
-    runner.clean_export(PROJECT_ROOT, tmp_path)
-    assert not (tmp_path / ".claude").exists()
+    out = runner.clean_export(export_source(tmp_path), tmp_path / "out")
+    assert not (out / ".claude").exists()
 
 
 def test_clean_export_removes_runner_py(tmp_path):
-    runner.clean_export(PROJECT_ROOT, tmp_path)
-    assert not (tmp_path / "runner.py").exists()
+    out = runner.clean_export(export_source(tmp_path), tmp_path / "out")
+    assert not (out / "runner.py").exists()
 
 
 def test_deploy_mode_dev_repo():
@@ -3,11 +3,14 @@
 # Author: Pito Salas and Claude Code
 # Open Source Under MIT license
 
+import io
 from pathlib import Path
 
 import pytest
 import runner
 import yaml
+from project_state import next_command
+from synth_project import make_project
 
 from conftest import FEATURES_TEXT, MILESTONE_TASKS_TEXT, MIXED_PRIORITY_FEATURES, SETTINGS_FOR_F23, TEMPLATES_ROOT
 
@@ -347,3 +350,61 @@ def test_state_loader_reads_state_md(tmp_path):
     context = runner.build_context(tmp_path, settings, {"state"}, Args())
     assert "did something" in context["state"]
     assert "/refresh" in context["state"]
+
+
+# --- runner-computed state.md ---
+
+def test_next_command_follows_footer_priority():
+    missing = [{"id": "F03", "priority": "High"}]
+    assert next_command(1, missing, 4) == "/refresh"
+    assert next_command(0, missing, 4) == "/tasks-gen F03"
+    assert next_command(0, [], 4) == "/task-next"
+    assert next_command(0, [], 0).startswith("/features-update")
+
+class StateArgs:
+    def __init__(self, completed, spec_gaps, sync):
+        self.completed, self.spec_gaps, self.sync = completed, spec_gaps, sync
+
+def test_state_sync_writes_counts_and_keeps_spec_gaps(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    (root / ".j2" / "state.md").write_text(
+        "completed: old\nstate: 2 spec gaps | 9 features need tasks | 9 tasks pending\n"
+        "next: /refresh\n")
+    printed = runner.state_report(root, settings, StateArgs("Built T01", None, True))
+    pending = runner.load_project(root, settings).pending_count()
+    assert printed == ("completed: Built T01\n"
+                       f"state: 2 spec gaps | 0 features need tasks | {pending} tasks pending\n"
+                       "next: /refresh")
+    assert (root / ".j2" / "state.md").read_text() == printed + "\n"
+    recount = runner.state_report(root, settings, StateArgs(None, 0, False))
+    assert recount.endswith("next: /task-next")
+    assert (root / ".j2" / "state.md").read_text() == printed + "\n"
+
+def test_footer_counts_are_precomputed(tmp_path):
+    features_dir = tmp_path / ".j2" / "features"
+    features_dir.mkdir(parents=True)
+    (features_dir / "features.md").write_text(MIXED_PRIORITY_FEATURES)
+    (tmp_path / ".j2" / "tasks").mkdir()
+    (tmp_path / ".j2" / "tasks" / "F02.md").write_text(
+        "# Tasks for F02\n\n### T01 — One\n**Status**: done\n\n"
+        "### T02 — Two\n**Status**: not started\n\n### T03 — Three\n**Status**: not started\n"
+    )
+
+    class Args:
+        feature = task = request = target = None
+
+    placeholders = {"missing_count", "pending_count"}
+    context = runner.build_context(tmp_path, SETTINGS_FOR_F23, placeholders, Args())
+    assert (context["missing_count"], context["pending_count"]) == ("2", "2")
+    footer = runner.render_segments(runner.FOOTER_SEGMENTS, {**context, "prev_spec_gaps": "0"})
+    assert "{{" not in footer
+
+def test_completed_text_is_read_from_stdin_verbatim(tmp_path, monkeypatch, capsys):
+    root = make_project(tmp_path, "10")
+    sentence = 'Ran `rm -rf /` and $(whoami) with "quotes"'
+    monkeypatch.setattr("sys.stdin", io.StringIO(sentence + "\n"))
+    argv = ["runner.py", "state", "--sync", "--root", str(root), "--completed", "-"]
+    monkeypatch.setattr("sys.argv", argv)
+    runner.main()
+    assert f"completed: {sentence}" in (root / ".j2" / "state.md").read_text()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for {{spec_delta}}: per-section change detection against the last acknowledged spec."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+import threading
+
+import pytest
+import runner
+from conftest import MIXED_PRIORITY_FEATURES, SETTINGS_FOR_F23
+from parse_cache import ParseCache
+from spec_delta import ack_spec_delta, record_delivery, section_records, spec_delta
+
+SPEC = "Intro text.\n\n## Goals\nShip widgets.\n\n## Non-goals\nNo gadgets.\n"
+
+
+def write_spec(root, text):
+    specs_dir = root / ".j2" / "specs"
+    specs_dir.mkdir(parents=True, exist_ok=True)
+    path = specs_dir / "spec.md"
+    path.write_text(text)
+    # Push the mtime out of the parse cache's racy window so edits are seen as new stamps.
+    stamp = path.stat().st_mtime - 10
+    os.utime(path, (stamp, stamp))
+
+
+def render(root):
+    # What build_context does: record the delivered hashes as pending, return the text.
+    return record_delivery(root, spec_delta(root, SETTINGS_FOR_F23))
+
+
+def delivered(root):
+    render(root)
+    ack_spec_delta(root)
+
+
+def test_section_records_split_on_headings():
+    records = section_records(SPEC.encode())
+    assert [r[0] for r in records] == ["(preamble)", "## Goals", "## Non-goals"]
+    assert SPEC.encode()[records[1][2]:records[1][3]] == b"## Goals\nShip widgets.\n\n"
+
+def test_first_run_delivers_every_section(tmp_path):
+    write_spec(tmp_path, SPEC)
+    delta = render(tmp_path)
+    assert "3 changed or added, 0 unchanged" in delta
+    assert "Ship widgets." in delta and "No gadgets." in delta
+
+def test_second_run_sends_only_changed_sections(tmp_path):
+    write_spec(tmp_path, SPEC)
+    delivered(tmp_path)
+    write_spec(tmp_path, SPEC.replace("Ship widgets.", "Ship widgets fast.") + "## Risks\nNone.\n")
+    delta = render(tmp_path)
+    assert "2 changed or added, 2 unchanged, 0 removed" in delta
+    assert "spec.md: ## Goals (changed)" in delta
+    assert "spec.md: ## Risks (added)" in delta
+    assert "No gadgets." not in delta
+    assert "- spec.md: ## Non-goals" in delta
+
+def test_removed_sections_are_listed(tmp_path):
+    write_spec(tmp_path, SPEC)
+    delivered(tmp_path)
+    write_spec(tmp_path, SPEC.split("## Non-goals")[0])
+    delta = render(tmp_path)
+    assert "0 changed or added, 2 unchanged, 1 removed" in delta
+    assert "### Removed sections\n\n- spec.md: ## Non-goals" in delta
+
+def test_no_spec_files(tmp_path):
+    (tmp_path / ".j2" / "specs").mkdir(parents=True)
+    assert render(tmp_path).startswith("(no spec files found")
+
+def test_rendering_without_ack_keeps_the_baseline(tmp_path):
+    write_spec(tmp_path, SPEC)
+    render(tmp_path)
+    assert "3 changed or added, 0 unchanged" in render(tmp_path)
+    ack_spec_delta(tmp_path)
+    assert "0 changed or added, 3 unchanged" in render(tmp_path)
+
+def test_ack_without_a_render_is_an_error(tmp_path):
+    with pytest.raises(ValueError, match="No rendered spec delta"):
+        ack_spec_delta(tmp_path)
+
+def test_build_context_records_delta_after_loaders(tmp_path):
+    write_spec(tmp_path, SPEC)
+
+    class Args:
+        feature = task = request = target = None
+
+    context = runner.build_context(tmp_path, SETTINGS_FOR_F23, {"spec_delta", "spec"}, Args())
+    assert "3 changed or added" in context["spec_delta"]
+    assert (tmp_path / ".j2" / "cache" / "spec_delta.pending.json").exists()
+    assert not (tmp_path / ".j2" / "cache" / "spec_delta.json").exists()
+
+def test_cold_cache_is_saved_once_after_all_loaders(tmp_path, monkeypatch):
+    for i in range(300):
+        write_spec(tmp_path, SPEC)
+        (tmp_path / ".j2" / "specs" / "spec.md").rename(tmp_path / ".j2" / "specs" / f"s{i:03d}.md")
+    (tmp_path / ".j2" / "features").mkdir()
+    (tmp_path / ".j2" / "features" / "features.md").write_text(MIXED_PRIORITY_FEATURES)
+    saves = []
+    real_save = ParseCache.save
+    monkeypatch.setattr(ParseCache, "save", lambda self: saves.append(threading.current_thread())
+                        or real_save(self))
+
+    class Args:
+        feature = task = request = target = None
+
+    placeholders = {"spec_delta", "features", "missing_count"}
+    context = runner.build_context(tmp_path, SETTINGS_FOR_F23, placeholders, Args())
+    assert "900 changed or added" in context["spec_delta"]
+    assert saves == [threading.main_thread()]
+    cached = json.loads((tmp_path / ".j2" / "cache" / "parse.json").read_text())["entries"]
+    assert len(cached) == 300
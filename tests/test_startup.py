@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Startup budget tests: runner import stays lean and unchanged config skips PyYAML."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import subprocess
+import sys
+
+import yaml
+from conftest import J2_ROOT, SETTINGS_FOR_F23, write_aged
+
+IMPORT_BUDGET_US = 100_000
+HEAVY_MODULES = ["yaml", "subprocess", "argparse", "socket", "dataclasses", "sqlite3"]
+
+
+def run_python(code):
+    prelude = f"import sys; sys.path.insert(0, {str(J2_ROOT)!r}); "
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", prelude + code],
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout, result.stderr
+
+
+def test_runner_import_does_not_load_heavy_modules():
+    out, _ = run_python(f"import runner; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    assert out.strip() == "[]"
+
+def test_runner_import_fits_time_budget():
+    _, err = run_python("import runner")
+    runner_line = [line for line in err.splitlines() if line.rstrip().endswith("| runner")][0]
+    cumulative_us = int(runner_line.split("|")[1])
+    assert cumulative_us < IMPORT_BUDGET_US
+
+def test_unchanged_config_is_loaded_without_yaml(tmp_path):
+    config_dir = tmp_path / ".j2" / "config"
+    write_aged(config_dir / "settings.yaml", yaml.dump(SETTINGS_FOR_F23))
+    steps = {"steps": [{"id": "status", "template": "status.md"}]}
+    write_aged(config_dir / "workflow.yaml", yaml.dump(steps))
+    load = (
+        "from pathlib import Path; import runner; root = Path({!r}); "
+        "s = runner.load_config(root); w = runner.load_workflow(root); "
+        "print(s['j2']['tasks_dir'], w[0]['id'], 'yaml' in sys.modules)"
+    ).format(str(tmp_path))
+    first, _ = run_python(load)
+    second, _ = run_python(load)
+    assert first.split() == [".j2/tasks", "status", "True"]
+    assert second.split() == [".j2/tasks", "status", "False"]
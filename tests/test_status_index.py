@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for StatusIndex: /status counts refreshed incrementally from file stamps."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import json
+import os
+
+import runner
+from conftest import MIXED_PRIORITY_FEATURES, SETTINGS_FOR_F23, write_aged
+from project_db import sync_db
+from project_state import format_status
+from status_index import StatusIndex
+from synth_project import make_project
+
+
+def model_status(root, settings):
+    # Reference counts straight from a full ProjectModel parse, as /status computed them before.
+    project = runner.load_project(root, settings)
+    return project.status_counts(), project.missing_tasks(), project.pending_count()
+
+
+def index_status(root, settings):
+    index = StatusIndex(root, settings)
+    index.refresh()
+    index.save()
+    return index.status_counts(), index.missing_tasks(), index.pending_count()
+
+
+def test_status_survives_index_round_trip(tmp_path):
+    write_aged(tmp_path / ".j2" / "features" / "features.md", MIXED_PRIORITY_FEATURES)
+    tasks = "### T01 — a\n**Status**: not started\n\n### T02 — b\n**Status**: not started\n"
+    write_aged(tmp_path / ".j2" / "tasks" / "F02.md", tasks)
+    first = runner.compute_status(tmp_path, SETTINGS_FOR_F23)
+    assert (tmp_path / ".j2" / "cache" / "status.json").exists()
+    assert runner.compute_status(tmp_path, SETTINGS_FOR_F23) == first
+    assert "Pending tasks: 2" in first
+    assert "Missing task files: F03 (Medium), F01 (Low)" in first
+
+def test_index_matches_full_parse_on_synthetic_project(tmp_path):
+    root = make_project(tmp_path, "1k")
+    settings = runner.load_config(root)
+    assert index_status(root, settings) == model_status(root, settings)
+
+def test_only_changed_task_files_are_reread(tmp_path, monkeypatch):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    index_status(root, settings)
+    write_aged(root / ".j2" / "tasks" / "F04.md", "### T01 — a\n**Status**: not started\n")
+    (root / ".j2" / "tasks" / "F05.md").unlink()
+    write_aged(root / ".j2" / "tasks" / "F11.md", "### T01 — a\n**Status**: not started\n")
+    reads = []
+    real_open = open
+
+    def tracking_open(path, *args):
+        reads.append(os.path.basename(path))
+        return real_open(path, *args)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    assert index_status(root, settings) == model_status(root, settings)
+    assert sorted(reads) == ["F04.md", "F11.md"]
+
+def test_features_edit_updates_counts_and_missing(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    index_status(root, settings)
+    features = root / ".j2" / "features" / "features.md"
+    text = features.read_text().replace("**Status**: not started", "**Status**: done")
+    write_aged(features, text)
+    (root / ".j2" / "tasks" / "F08.md").unlink()
+    assert index_status(root, settings) == model_status(root, settings)
+
+def test_status_json_carries_the_text_fields(tmp_path):
+    write_aged(tmp_path / ".j2" / "features" / "features.md", MIXED_PRIORITY_FEATURES)
+    write_aged(tmp_path / ".j2" / "tasks" / "F02.md", "### T01 — a\n**Status**: not started\n")
+    write_aged(tmp_path / ".j2" / "state.md", "completed: Built F02\nstate: x\nnext: /task-next\n")
+    data = json.loads(runner.status_json(tmp_path, SETTINGS_FOR_F23))
+    assert data["missing_task_files"] == [{"id": "F03", "priority": "Medium"},
+                                          {"id": "F01", "priority": "Low"}]
+    assert data["pending_tasks"] == 1
+    assert data["pending_by_feature"] == {"F02": 1}
+    assert (data["last_completed"], data["next"]) == ("Built F02", "/task-next")
+    assert "\n" not in runner.status_json(tmp_path, SETTINGS_FOR_F23)
+    assert format_status(data) == runner.compute_status(tmp_path, SETTINGS_FOR_F23)
+
+def test_status_json_is_the_same_from_the_sqlite_mirror(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    expected = runner.status_json(root, settings)
+    sync_db(root, settings)
+    assert runner.status_json(root, settings) == expected
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for sync-status: features whose tasks are all done are marked done, with a compact diff."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+from conftest import FEATURES_TEXT, SETTINGS_FOR_F23
+from feature_store import shard_features_file
+from status_sync import sync_statuses
+from task_archive import pack_done
+
+DONE_TASKS = "# Tasks\n\n### T01 — One\n**Status**: done\n\n### T02 — Two\n**Status**: done\n"
+OPEN_TASKS = ("# Tasks\n\n### T01 — One\n**Status**: done\n\n"
+              "### T02 — Two\n**Status**: not started\n")
+
+
+def make_project(tmp_path, f01_tasks, f02_tasks):
+    (tmp_path / ".j2" / "features").mkdir(parents=True)
+    (tmp_path / ".j2" / "features" / "features.md").write_text(FEATURES_TEXT)
+    (tmp_path / ".j2" / "tasks" / "done").mkdir(parents=True)
+    (tmp_path / ".j2" / "tasks" / "F01.md").write_text(f01_tasks)
+    (tmp_path / ".j2" / "tasks" / "done" / "F02.md").write_text(f02_tasks)
+    return tmp_path
+
+
+def test_finished_features_are_marked_done_and_nothing_else_changes(tmp_path):
+    root = make_project(tmp_path, DONE_TASKS, OPEN_TASKS)
+    diff = sync_statuses(root, SETTINGS_FOR_F23)
+    assert diff.splitlines() == [
+        "Status sync: 2 features marked done",
+        "F01 (.j2/features/features.md)",
+        "-**Status**: not started | Tests written: no | Tests passing: n/a",
+        "+**Status**: done | Tests written: no | Tests passing: n/a",
+        "F02 (.j2/features/features.md)",
+        "-**Status**: not started | Tests written: no | Tests passing: n/a",
+        "+**Status**: done | Tests written: no | Tests passing: n/a",
+    ]
+    expected = FEATURES_TEXT.replace("**Status**: not started", "**Status**: done")
+    assert (root / ".j2" / "features" / "features.md").read_text() == expected
+    assert sync_statuses(root, SETTINGS_FOR_F23) == "Status sync: no changes."
+
+def test_active_task_file_with_pending_tasks_is_left_alone(tmp_path):
+    root = make_project(tmp_path, OPEN_TASKS, DONE_TASKS)
+    report = sync_statuses(root, SETTINGS_FOR_F23)
+    assert report.startswith("Status sync: 1 features marked done\nF02 ")
+    assert "## F01 — Directory Scaffold\n**Priority**: High\n**Status**: not started" in (
+        root / ".j2" / "features" / "features.md").read_text()
+
+def test_shards_and_packed_archive_are_synced(tmp_path):
+    root = make_project(tmp_path, OPEN_TASKS, OPEN_TASKS)
+    shard_features_file(root, SETTINGS_FOR_F23)
+    pack_done(root, SETTINGS_FOR_F23)
+    diff = sync_statuses(root, SETTINGS_FOR_F23)
+    assert diff.splitlines()[:2] == ["Status sync: 1 features marked done",
+                                     "F02 (.j2/features/F02.md)"]
+    assert "**Status**: done" in (root / ".j2" / "features" / "F02.md").read_text()
+    assert "**Status**: not started" in (root / ".j2" / "features" / "F01.md").read_text()
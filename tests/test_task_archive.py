@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for the packed tasks/done archive: pack/unpack, seek reads and archiving."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import pytest
+import runner
+from synth_project import make_project
+from task_archive import TaskArchive, archive_tasks, pack_done, unpack_done
+
+
+def packed_project(tmp_path):
+    root = make_project(tmp_path, "10")
+    settings = runner.load_config(root)
+    return root, settings, root / ".j2" / "tasks"
+
+
+def test_round_trip_is_byte_exact(tmp_path):
+    root, settings, tasks = packed_project(tmp_path)
+    done = {p.name: p.read_bytes() for p in (tasks / "done").iterdir()}
+    assert pack_done(root, settings) == "Packed 3 archived task files into .j2/tasks/done.pack."
+    assert list((tasks / "done").iterdir()) == []
+    unpack_done(root, settings)
+    assert {p.name: p.read_bytes() for p in (tasks / "done").iterdir()} == done
+    assert not (tasks / "done.pack").exists()
+    assert not (tasks / "done.idx").exists()
+
+def test_read_returns_one_entry(tmp_path):
+    root, settings, tasks = packed_project(tmp_path)
+    f06 = (tasks / "done" / "F06.md").read_bytes()
+    pack_done(root, settings)
+    archive = TaskArchive(tasks)
+    assert archive.read("F06") == f06
+    assert archive.read("F01") is None
+
+def test_reads_fall_through_to_the_pack(tmp_path):
+    root, settings, tasks = packed_project(tmp_path)
+    project = runner.load_project(root, settings)
+    before = (str(runner.load_tasks(root, settings, "F03")), project.task_section("F03", "t02"),
+              project.missing_tasks(), runner.compute_status(root, settings))
+    pack_done(root, settings)
+    project = runner.load_project(root, settings)
+    after = (runner.load_tasks(root, settings, "F03"), project.task_section("F03", "t02"),
+             project.missing_tasks(), runner.compute_status(root, settings))
+    assert after == before
+
+def test_archive_appends_when_packed(tmp_path):
+    root, settings, tasks = packed_project(tmp_path)
+    f01 = (tasks / "F01.md").read_bytes()
+    pack_done(root, settings)
+    assert archive_tasks(root, settings, "F01") == "Archived F01 into .j2/tasks/done.pack."
+    assert not (tasks / "F01.md").exists()
+    assert TaskArchive(tasks).read("F01") == f01
+    assert runner.archive_command(root, settings, "F02") == (
+        "python3 .j2/runner.py tasks-archive --feature F02 --root ."
+    )
+
+def test_archive_moves_when_loose(tmp_path):
+    root, settings, tasks = packed_project(tmp_path)
+    assert archive_tasks(root, settings, "F01") == "Archived F01 to .j2/tasks/done/."
+    assert (tasks / "done" / "F01.md").exists()
+    assert "nothing to archive" in archive_tasks(root, settings, "F01")
+    assert runner.archive_command(root, settings, "F02") == (
+        "mv .j2/tasks/F02.md .j2/tasks/done/F02.md"
+    )
+
+def test_later_entry_supersedes_earlier(tmp_path):
+    root, settings, tasks = packed_project(tmp_path)
+    pack_done(root, settings)
+    TaskArchive(tasks).append("F03", b"# Tasks for F03\n\nrewritten\n")
+    assert TaskArchive(tasks).read("F03") == b"# Tasks for F03\n\nrewritten\n"
+
+def test_unpack_without_pack_is_an_error(tmp_path):
+    root, settings, _ = packed_project(tmp_path)
+    with pytest.raises(ValueError, match="No packed archive"):
+        unpack_done(root, settings)
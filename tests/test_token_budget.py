@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for per-step token budgets and placeholder trim policies."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import pytest
+import runner
+import token_budget
+from conftest import MIXED_PRIORITY_FEATURES
+from file_stream import FileStream
+
+FEATURES_WITH_DONE = """\
+# Features
+
+## F01 — Shipped
+**Priority**: High
+**Status**: done
+**Description**: Already built.
+
+## F02 — Pending
+**Priority**: Low
+**Status**: not started
+**Description**: Still to do.
+"""
+
+
+def test_estimate_tokens_sizes_file_streams_without_reading(tmp_path):
+    (tmp_path / "spec.md").write_text("x" * 400)
+    assert token_budget.estimate_tokens(FileStream([tmp_path / "spec.md"], "")) == 100
+    assert token_budget.estimate_tokens("y" * 40) == 10
+
+def test_keep_head_keeps_the_beginning():
+    result = token_budget.keep_head("a" * 40 + "b" * 40, 10)
+    assert result.startswith("a" * 40)
+    assert "b" not in result.split("[")[0]
+    assert "tokens trimmed" in result
+
+def test_keep_tail_keeps_the_end():
+    result = token_budget.keep_tail("a" * 40 + "b" * 40, 10)
+    assert result.endswith("b" * 40)
+    assert "a" not in result.split("]")[-1]
+
+def test_section_priority_keeps_high_priority_sections_first():
+    result = token_budget.section_priority(MIXED_PRIORITY_FEATURES, 40)
+    assert "High Feature" in result
+    assert "Low Feature" not in result
+    assert "sections" in result
+
+def test_drop_done_removes_done_sections():
+    result = token_budget.drop_done(FEATURES_WITH_DONE, 0)
+    assert "Shipped" not in result
+    assert "Pending" in result
+    assert "1 done sections" in result
+
+def test_apply_budget_leaves_context_alone_when_it_fits():
+    step = {"id": "refresh", "max_tokens": 1000, "trim": {"spec": "keep-head"}}
+    segments = runner.compile_template("Spec: {{spec}}")
+    context = {"spec": "short"}
+    assert token_budget.apply_budget(step, [segments], context) == (context, [])
+
+def test_apply_budget_trims_in_order_and_reports():
+    trim = {"features": "drop-done", "spec": "keep-head"}
+    step = {"id": "tasks-gen", "max_tokens": 60, "trim": trim}
+    segments = runner.compile_template("{{features}}\n{{spec}}")
+    context = {"features": FEATURES_WITH_DONE, "spec": "s" * 400}
+    trimmed, report = token_budget.apply_budget(step, [segments], context)
+    assert "Shipped" not in trimmed["features"]
+    assert trimmed["spec"].startswith("s")
+    assert len(trimmed["spec"]) < 400
+    assert report[0].startswith("Token budget for tasks-gen")
+    assert any("features" in line and "drop-done" in line for line in report)
+    assert any("spec" in line and "keep-head" in line for line in report)
+
+def test_apply_budget_rejects_unknown_policy():
+    step = {"id": "refresh", "max_tokens": 1, "trim": {"spec": "shuffle"}}
+    segments = runner.compile_template("{{spec}}")
+    with pytest.raises(ValueError, match="Unknown trim policy"):
+        token_budget.apply_budget(step, [segments], {"spec": "x" * 100})
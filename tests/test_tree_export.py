@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Tests for the in-process clean export: excludes, incremental copies, links and tar archives."""
+# Author: Pito Salas and Claude Code
+# Open Source Under MIT license
+
+import gzip
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import time
+
+import pytest
+from conftest import J2_ROOT, write_aged
+from synth_project import make_project
+from tree_export import (
+    MAX_MANIFESTS,
+    PARALLEL_MIN,
+    archive_mode,
+    export_archive_file,
+    export_tree,
+    manifest_file,
+)
+
+
+def make_source(tmp_path):
+    src = tmp_path / "src"
+    write_aged(src / "app" / "main.py", "print('hi')\n")
+    write_aged(src / "app" / "runner.py", "# nested runner.py is project code\n")
+    write_aged(src / "runner.py", "# residual j2 runner\n")
+    write_aged(src / "README.md", "# App\n")
+    write_aged(src / ".j2" / "state.md", "state\n")
+    write_aged(src / "pkg" / "scaffold" / "x.txt", "excluded at any depth\n")
+    write_aged(src / ".coverage", "data\n")
+    return src
+
+
+def listing(path):
+    return sorted(p.relative_to(path).as_posix() for p in path.rglob("*") if not p.is_dir())
+
+
+def test_export_applies_excludes_and_drops_residual_runner(tmp_path):
+    src = make_source(tmp_path)
+    target, copied, unchanged = export_tree(src, tmp_path / "out", False)
+    assert listing(target) == ["README.md", "app/main.py", "app/runner.py"]
+    assert (copied, unchanged) == (3, 0)
+    mtime_ns = (src / "app" / "main.py").stat().st_mtime_ns
+    assert (target / "app" / "main.py").stat().st_mtime_ns == mtime_ns
+
+def test_second_export_copies_only_changed_files(tmp_path):
+    src = make_source(tmp_path)
+    export_tree(src, tmp_path / "out", False)
+    assert export_tree(src, tmp_path / "out", False)[1:] == (0, 3)
+    write_aged(src / "app" / "main.py", "print('changed')\n")
+    write_aged(src / "app" / "new.py", "x = 1\n")
+    assert export_tree(src, tmp_path / "out", False)[1:] == (2, 2)
+    assert (tmp_path / "out" / "app" / "main.py").read_text() == "print('changed')\n"
+
+def test_touched_file_with_same_content_is_not_rewritten(tmp_path):
+    src = make_source(tmp_path)
+    export_tree(src, tmp_path / "out", False)
+    inode = (tmp_path / "out" / "README.md").stat().st_ino
+    os.utime(src / "README.md", (time.time() - 30, time.time() - 30))
+    assert export_tree(src, tmp_path / "out", False)[1:] == (0, 3)
+    out = (tmp_path / "out" / "README.md").stat()
+    assert out.st_ino == inode
+    assert out.st_mtime_ns == (src / "README.md").stat().st_mtime_ns
+
+def test_file_deleted_or_edited_in_the_target_is_restored(tmp_path):
+    src = make_source(tmp_path)
+    target = export_tree(src, tmp_path / "out", False)[0]
+    (target / "app" / "main.py").unlink()
+    (target / "README.md").write_text("# edited in the export\n")
+    assert export_tree(src, target, False)[1:] == (2, 1)
+    assert (target / "app" / "main.py").read_text() == (src / "app" / "main.py").read_text()
+    assert (target / "README.md").read_text() == (src / "README.md").read_text()
+
+def test_touched_source_does_not_hide_an_edited_target(tmp_path):
+    src = make_source(tmp_path)
+    target = export_tree(src, tmp_path / "out", False)[0]
+    (target / "README.md").write_text("# edited in the export\n")
+    os.utime(src / "README.md", (time.time() - 30, time.time() - 30))
+    export_tree(src, target, False)
+    assert (target / "README.md").read_text() == (src / "README.md").read_text()
+
+def test_without_manifest_matching_target_files_are_skipped(tmp_path):
+    src = make_source(tmp_path)
+    target = export_tree(src, tmp_path / "out", False)[0]
+    manifest_file(src, target).unlink()
+    assert export_tree(src, target, False)[1:] == (0, 3)
+
+def test_only_the_newest_manifests_are_kept(tmp_path):
+    src = make_source(tmp_path)
+    for n in range(MAX_MANIFESTS + 4):
+        last = export_tree(src, tmp_path / f"out{n}", False)[0]
+        os.utime(manifest_file(src, last), ns=(n, n))
+    kept = sorted((src / ".j2" / "cache").glob("export-*.json"))
+    assert len(kept) == MAX_MANIFESTS
+    assert manifest_file(src, last) in kept
+    assert not manifest_file(src, tmp_path / "out0").exists()
+
+def test_link_mode_hardlinks_and_never_writes_through(tmp_path):
+    src = make_source(tmp_path)
+    target = export_tree(src, tmp_path / "out", True)[0]
+    assert (target / "README.md").stat().st_ino == (src / "README.md").stat().st_ino
+    export_tree(src, tmp_path / "copy", False)
+    write_aged(src / "README.md", "# App v2\n")
+    export_tree(src, target, False)
+    assert (target / "README.md").read_text() == "# App v2\n"
+    assert (target / "README.md").stat().st_ino != (src / "README.md").stat().st_ino
+
+def test_symlinks_are_recreated_as_links(tmp_path):
+    src = make_source(tmp_path)
+    (src / "latest").symlink_to("app/main.py")
+    target = export_tree(src, tmp_path / "out", False)[0]
+    assert os.readlink(target / "latest") == "app/main.py"
+    os.utime(src / "latest", (time.time() - 30, time.time() - 30), follow_symlinks=False)
+    export_tree(src, target, False)
+    assert export_tree(src, target, False)[1:] == (0, 4)
+
+def test_large_tree_is_copied_in_parallel(tmp_path):
+    src = make_source(tmp_path)
+    for i in range(PARALLEL_MIN * 2):
+        write_aged(src / "data" / f"{i:03d}.txt", f"row {i}\n" * i)
+    target, copied, _ = export_tree(src, tmp_path / "out", False)
+    assert copied == PARALLEL_MIN * 2 + 3
+    assert (target / "data" / "099.txt").read_text() == "row 99\n" * 99
+
+def test_archive_streams_the_same_entries_as_a_directory_export(tmp_path):
+    src = make_source(tmp_path)
+    for suffix in ("tar", "tar.gz", "tar.xz"):
+        name = f"app.{suffix}"
+        path, count = export_archive_file(src, tmp_path / name, archive_mode(name, None))
+        with tarfile.open(path) as tar:
+            files = sorted(m.name for m in tar.getmembers() if m.isfile())
+            assert files == ["README.md", "app/main.py", "app/runner.py"]
+            assert tar.extractfile("app/main.py").read() == b"print('hi')\n"
+        assert count == 5  # plus app/ and the emptied pkg/ directories
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ["app.tar", "app.tar.gz", "app.tar.xz", "src"]
+
+def test_archive_inside_the_project_skips_itself(tmp_path):
+    src = make_source(tmp_path)
+    path, _ = export_archive_file(src, src / "release.tar.gz", "w|gz")
+    with tarfile.open(path) as tar:
+        assert "release.tar.gz" not in tar.getnames()
+
+def test_export_to_stdout_is_a_clean_archive(tmp_path):
+    root = make_project(tmp_path / "proj", "10")
+    write_aged(root / "src" / "app.py", "x = 1\n")
+    result = subprocess.run(
+        [sys.executable, str(J2_ROOT / "runner.py"), "export", "--target", "-",
+         "--archive", "tar.gz", "--root", str(root)],
+        capture_output=True, check=True,
+    )
+    with tarfile.open(fileobj=io.BytesIO(result.stdout), mode="r:gz") as tar:
+        assert "src/app.py" in tar.getnames()
+        assert not any(name.startswith(".j2") for name in tar.getnames())
+    assert gzip.decompress(result.stdout)[-1024:] == bytes(1024)
+    assert b"entries to stdout" in result.stderr
+
+def test_stdout_export_needs_a_format():
+    with pytest.raises(ValueError, match="needs --archive"):
+        archive_mode("-", None)
+    assert archive_mode("out/release", None) is None